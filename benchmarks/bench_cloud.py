@@ -0,0 +1,142 @@
+"""Refresh cycles of the real client and coordinator against the local fake cloud.
+
+The fake cloud runs on its own thread and event loop, so the blocking figures
+only cover the integration's work. For each scenario it reports calls per
+cycle, refresh wall time, how long the event loop was blocked and the peak
+memory allocated during a refresh.
+
+    python benchmarks/bench_cloud.py [--cycles N] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+import aiohttp
+
+from common import FireBoardRateLimiter
+from custom_components.fireboard.api import FireBoardApiClient
+from custom_components.fireboard.const import POLLING_MODE_DEVICES, POLLING_MODE_FULL
+from custom_components.fireboard.coordinator import FireBoardCoordinator
+from fake_cloud import FakeCloud
+
+# (name, synthetic devices or None for the json/ samples, channels, polling mode, latency)
+SCENARIOS = [
+    ("samples/devices", None, 0, POLLING_MODE_DEVICES, 0.02),
+    ("samples/full", None, 0, POLLING_MODE_FULL, 0.02),
+    ("10x6/devices", 10, 6, POLLING_MODE_DEVICES, 0.02),
+    ("10x6/full", 10, 6, POLLING_MODE_FULL, 0.02),
+    ("50x6/devices", 50, 6, POLLING_MODE_DEVICES, 0.02),
+    ("50x6/full", 50, 6, POLLING_MODE_FULL, 0.02),
+]
+
+class CloudThread:
+    """Runs a FakeCloud on a background event loop."""
+
+    def __init__(self, cloud):
+        self.cloud = cloud
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.cloud.start(), self._loop).result()
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.cloud.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def call(self, func, *args):
+        """Run ``func`` on the cloud's loop, so it never races a request handler."""
+        async def run():
+            return func(*args)
+        return asyncio.run_coroutine_threadsafe(run(), self._loop).result()
+
+class LoopMonitor:
+    """Measures event-loop blocking as the lateness of a 1 ms ticker."""
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.blocked = 0.0
+        self.longest = 0.0
+        self._task = None
+
+    async def _tick(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            late = time.perf_counter() - started - self.interval
+            # Timer resolution alone makes ticks a fraction of a millisecond late
+            if late > 0.001:
+                self.blocked += late
+                self.longest = max(self.longest, late)
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._tick())
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+async def run_scenario(cloud_thread, polling_mode, cycles):
+    cloud = cloud_thread.cloud
+    async with aiohttp.ClientSession() as session:
+        api = FireBoardApiClient("bench", "bench", cloud.session(session))
+        api.limiter = FireBoardRateLimiter(10**9)  # the hourly budget is not under test
+        coordinator = FireBoardCoordinator(MagicMock(), api, 18, polling_mode)
+        await api.async_login()
+        await coordinator._async_update_data()
+        requests_before = cloud_thread.call(lambda: cloud.total_requests)
+        monitor = LoopMonitor()
+        monitor.start()
+        durations = []
+        for _ in range(cycles):
+            cloud_thread.call(cloud.advance)
+            started = time.perf_counter()
+            await coordinator._async_update_data()
+            durations.append(time.perf_counter() - started)
+        await monitor.stop()
+        requests = cloud_thread.call(lambda: cloud.total_requests) - requests_before
+        cloud_thread.call(cloud.advance)
+        tracemalloc.start()
+        await coordinator._async_update_data()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    durations.sort()
+    return {
+        "calls_per_cycle": requests / cycles,
+        "refresh_ms_mean": statistics.mean(durations) * 1000,
+        "refresh_ms_p95": durations[min(int(0.95 * cycles), cycles - 1)] * 1000,
+        "blocked_ms_per_cycle": monitor.blocked * 1000 / cycles,
+        "blocked_ms_max": monitor.longest * 1000,
+        "peak_kb": peak / 1024,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    results = {}
+    print(f"{'scenario':>16} {'calls':>6} {'mean ms':>8} {'p95 ms':>7} {'blocked ms':>10} {'max ms':>7} {'peak KB':>8}")
+    for name, devices, channels, polling_mode, latency in SCENARIOS:
+        with CloudThread(FakeCloud(devices=devices, channels=channels or 6, latency=latency)) as cloud_thread:
+            result = results[name] = asyncio.run(run_scenario(cloud_thread, polling_mode, args.cycles))
+        print(
+            f"{name:>16} {result['calls_per_cycle']:>6.1f} {result['refresh_ms_mean']:>8.1f} "
+            f"{result['refresh_ms_p95']:>7.1f} {result['blocked_ms_per_cycle']:>10.2f} "
+            f"{result['blocked_ms_max']:>7.2f} {result['peak_kb']:>8.0f}"
+        )
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Parse time, retained and peak memory of device payloads: raw dicts versus snapshots.
+
+Decodes the json/*.jsonc samples with the stdlib decoder and with orjson (when
+installed), then compares the memory held by the decoded devices.json list with
+the DeviceSnapshot list the coordinator keeps instead, both retained and at
+the peak while parsing.
+"""
+import gc
+import json
+import timeit
+import tracemalloc
+
+from common import JSON_DIR, load_jsonc
+from custom_components.fireboard import models
+from custom_components.fireboard.models import parse_devices
+
+ROUNDS = 2000
+
+def measure_memory(build):
+    """(retained, peak) bytes of ``build()``: still allocated while its result is alive, and the most held during it."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size, peak
+
+def main():
+    for path in sorted(JSON_DIR.glob("*.jsonc")):
+        body = json.dumps(load_jsonc(path.name)).encode()
+        stdlib = timeit.timeit(lambda: json.loads(body), number=ROUNDS) / ROUNDS
+        line = f"{path.name:>42}: {len(body):>6} bytes, json {stdlib * 1e6:7.1f} us"
+        if models.orjson is not None:
+            fast = timeit.timeit(lambda: models.orjson.loads(body), number=ROUNDS) / ROUNDS
+            line += f", orjson {fast * 1e6:6.1f} us"
+        print(line)
+
+    body = json.dumps(load_jsonc("list-all-devices.jsonc")).encode()
+    snapshot_time = timeit.timeit(lambda: parse_devices(models.loads(body)), number=ROUNDS) / ROUNDS
+    raw, raw_peak = measure_memory(lambda: json.loads(body))
+    snapshots, snapshots_peak = measure_memory(lambda: parse_devices(models.loads(body)))
+    print(f"{'devices.json to snapshots':>42}: {snapshot_time * 1e6:.1f} us")
+    print(f"{'raw dicts':>42}: {raw} bytes retained, {raw_peak} bytes peak")
+    print(f"{'snapshots':>42}: {snapshots} bytes retained, {snapshots_peak} bytes peak")
+
+if __name__ == "__main__":
+    main()
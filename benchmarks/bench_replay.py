@@ -0,0 +1,119 @@
+"""Replay a recorded FireBoard session through the client, coordinator and sensors.
+
+Recordings come from the "Record API traffic" option (fireboard_<entry_id>.jsonl.gz
+in the Home Assistant config directory), or are synthesized from the local fake
+cloud on a virtual timeline:
+
+    python benchmarks/bench_replay.py --synthesize cook.jsonl.gz [--hours 12]
+    python benchmarks/bench_replay.py cook.jsonl.gz [--speed 720]
+
+Without --speed the recording is served as fast as the coordinator consumes it.
+Every refresh runs the real FireBoardApiClient and FireBoardCoordinator, and
+the sensors and switches handle each update, so the figures cover parsing,
+history, ETA estimates and state writes without touching fireboard.io or the
+hourly budget.
+
+Replay serves the recorded responses but not the recorded time: the rate
+limiter, allocator, scheduler and ETA estimates run on the wall clock. Both
+modes therefore use an unlimited limiter, so every refresh makes the requests
+that were recorded for it. The figures measure the work per refresh; the ETA
+values and the scheduled intervals are not those of the recorded cook.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+import statistics
+import time
+from unittest.mock import MagicMock
+
+import aiohttp
+
+from common import FireBoardRateLimiter
+from custom_components.fireboard import sensor, switch
+from custom_components.fireboard.api import FireBoardApiClient
+from custom_components.fireboard.const import API_BASE, DOMAIN, POLLING_MODE_FULL
+from custom_components.fireboard.coordinator import FireBoardCoordinator
+from custom_components.fireboard.entity import FireBoardEntity
+from custom_components.fireboard.transport import RecordingSession, ReplaySession
+from fake_cloud import FakeCloud
+
+INTERVAL = 18  # seconds between refreshes on the synthetic timeline
+DEVICES_URL = f"{API_BASE}/devices.json"
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+async def synthesize(path, hours, devices, channels):
+    """Record a cook of ``hours`` against the fake cloud, one refresh every INTERVAL virtual seconds."""
+    clock = VirtualClock()
+    origin = datetime.now(timezone.utc) - timedelta(hours=hours)
+    cycles = int(hours * 3600 / INTERVAL)
+    async with FakeCloud(devices=devices, channels=channels) as cloud, aiohttp.ClientSession() as session:
+        recorder = RecordingSession(cloud.session(session), path, clock)
+        api = FireBoardApiClient("bench", "bench", recorder)
+        api.limiter = FireBoardRateLimiter(10**9)
+        coordinator = FireBoardCoordinator(MagicMock(), api, INTERVAL, POLLING_MODE_FULL)
+        for cycle in range(cycles):
+            clock.now = cycle * INTERVAL
+            cloud.advance(0.05, origin + timedelta(seconds=clock.now))
+            await coordinator._async_update_data()
+        recorder.close()
+    print(f"recorded {cycles} refreshes ({hours} h), {recorder.records} requests, to {path}")
+
+async def replay(path, speed):
+    session = ReplaySession.from_file(path, speed)
+    api = FireBoardApiClient("replay", "replay", session)
+    api.limiter = FireBoardRateLimiter(10**9)
+    hass = MagicMock()
+    coordinator = FireBoardCoordinator(hass, api, INTERVAL, POLLING_MODE_FULL)
+    await coordinator._async_update_data()
+    hass.data = {DOMAIN: {"coordinator_replay": coordinator}}
+    entry = MagicMock(entry_id="replay", options={})
+    entities = []
+    await sensor.async_setup_entry(hass, entry, entities.extend)
+    await switch.async_setup_entry(hass, entry, entities.extend)
+    for device in coordinator.devices:
+        coordinator.set_polling(device.hardware_id, True)
+    writes = 0
+
+    def count_write(self):
+        nonlocal writes
+        writes += 1
+
+    FireBoardEntity.async_write_ha_state = count_write
+    durations = []
+    started = time.perf_counter()
+    while session.remaining(DEVICES_URL):
+        refresh_started = time.perf_counter()
+        await coordinator._async_update_data()
+        for entity in entities:
+            entity._handle_coordinator_update()
+        durations.append(time.perf_counter() - refresh_started)
+    elapsed = time.perf_counter() - started
+    durations.sort()
+    print(f"{'refreshes':>20}: {len(durations)} in {elapsed:.2f} s")
+    print(f"{'refresh ms':>20}: mean {statistics.mean(durations) * 1000:.2f}, "
+          f"p95 {durations[int(0.95 * (len(durations) - 1))] * 1000:.2f}")
+    print(f"{'entities':>20}: {len(entities)}, {writes} state writes")
+    print(f"{'ETA estimates':>20}: {len(coordinator.etas)} channels")
+    print(f"{'unserved responses':>20}: {session.remaining()}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="gzip JSONL recording")
+    parser.add_argument("--synthesize", action="store_true", help="record a synthetic cook to PATH first")
+    parser.add_argument("--hours", type=float, default=12)
+    parser.add_argument("--devices", type=int, default=2)
+    parser.add_argument("--channels", type=int, default=6)
+    parser.add_argument("--speed", type=float, help="replay speed, 1 for real time; default as fast as possible")
+    args = parser.parse_args()
+    if args.synthesize:
+        asyncio.run(synthesize(args.path, args.hours, args.devices, args.channels))
+    asyncio.run(replay(args.path, args.speed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Integration startup: import time and time until entities are registered.
+
+Import times are measured in fresh interpreters that have already loaded the
+Home Assistant modules a running instance always has, so they only cover this
+integration and what it pulls in. Entity registration runs async_setup_entry
+against the local fake cloud, cold (no cache) and warm (cache from the cold
+run), with latency on every response so any wait on the network shows.
+
+    python benchmarks/bench_startup.py [--runs N] [--latency S] [--json results.json]
+"""
+import argparse
+import asyncio
+import copy
+import json
+import statistics
+import subprocess
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+
+from common import ROOT
+from custom_components import fireboard
+from custom_components.fireboard import sensor, switch
+from custom_components.fireboard.const import DOMAIN
+from custom_components.fireboard.limiter import _LIMITERS
+from fake_cloud import FakeCloud
+
+# Loaded by Home Assistant before any custom integration
+PRELOADED = (
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.sensor",
+    "homeassistant.components.switch",
+)
+# (stage, modules imported in it), in the order Home Assistant loads them
+IMPORT_STAGES = (
+    ("integration", ("custom_components.fireboard",)),
+    ("platforms", ("custom_components.fireboard.sensor", "custom_components.fireboard.switch")),
+    ("entry setup", ("custom_components.fireboard.api", "custom_components.fireboard.coordinator")),
+)
+IMPORT_SCRIPT = """
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+for name in {preloaded!r}:
+    importlib.import_module(name)
+times = {{}}
+for stage, modules in {stages!r}:
+    started = time.perf_counter()
+    for name in modules:
+        importlib.import_module(name)
+    times[stage] = (time.perf_counter() - started) * 1000
+print(json.dumps(times))
+"""
+
+def measure_imports(runs):
+    script = IMPORT_SCRIPT.format(root=str(ROOT), preloaded=PRELOADED, stages=IMPORT_STAGES)
+    samples = [
+        json.loads(subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout)
+        for _ in range(runs)
+    ]
+    return {stage: statistics.median(sample[stage] for sample in samples) for stage, _ in IMPORT_STAGES}
+
+class MemoryStore:
+    def __init__(self, saved, key):
+        self._saved = saved
+        self.key = key
+
+    async def async_load(self):
+        return copy.deepcopy(self._saved.get(self.key))
+
+    def async_delay_save(self, data_func, delay=0):
+        self._saved[self.key] = copy.deepcopy(data_func())
+
+async def measure_setup(cloud, saved):
+    """Milliseconds from async_setup_entry until setup returns and until every entity is registered."""
+    _LIMITERS.clear()
+    hass = MagicMock()
+    hass.data = {DOMAIN: {}}
+    hass.async_create_task = asyncio.ensure_future
+    entry = MagicMock(entry_id="bench", data={"username": "bench", "password": "bench"}, options={})
+    background = []
+    entry.async_create_background_task = lambda hass, coro, name: background.append(asyncio.ensure_future(coro))
+    registered = []
+    last_added = None
+
+    def add_entities(entities):
+        nonlocal last_added
+        registered.extend(entities)
+        last_added = time.perf_counter()
+
+    async def forward(entry, platforms):
+        await sensor.async_setup_entry(hass, entry, add_entities)
+        await switch.async_setup_entry(hass, entry, add_entities)
+    hass.config_entries.async_forward_entry_setups = forward
+    async with aiohttp.ClientSession() as session:
+        with patch.object(fireboard, "async_get_clientsession", return_value=cloud.session(session)), \
+                patch.object(fireboard, "Store", lambda hass, version, key: MemoryStore(saved, key)):
+            started = time.perf_counter()
+            await fireboard.async_setup_entry(hass, entry)
+            setup = time.perf_counter() - started
+            # The first refresh may still add devices that were not cached
+            await asyncio.gather(*background)
+    return {"setup_ms": setup * 1000, "entities_ms": (last_added - started) * 1000, "entities": len(registered)}
+
+async def measure_starts(devices, latency):
+    saved = {}
+    async with FakeCloud(devices=devices, latency=latency) as cloud:
+        cold = await measure_setup(cloud, saved)
+        warm = await measure_setup(cloud, saved)
+    return {"cold": cold, "warm": warm}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters for the import times")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds added to every fake cloud response")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    results = {"imports_ms": measure_imports(args.runs)}
+    for stage, ms in results["imports_ms"].items():
+        print(f"{'import ' + stage:>20}: {ms:.1f} ms")
+    for name, devices in (("samples", None), ("10x6", 10)):
+        result = results[name] = asyncio.run(measure_starts(devices, args.latency))
+        for start in ("cold", "warm"):
+            row = result[start]
+            print(f"{name + ' ' + start:>20}: setup {row['setup_ms']:.0f} ms, "
+                  f"{row['entities']} entities registered in {row['entities_ms']:.0f} ms")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Entity state writes per hour of polling, with and without change detection.
+
+Simulates one hour at the minimum 18 s interval (200 refreshes) of a slow cook:
+one probe moves 0.1 degree every third refresh, everything else is steady.
+"""
+import asyncio
+from unittest.mock import MagicMock
+
+from common import FixtureApi
+from custom_components.fireboard import sensor, switch
+from custom_components.fireboard.const import DOMAIN, POLLING_MODE_DEVICES
+from custom_components.fireboard.coordinator import FireBoardCoordinator
+from custom_components.fireboard.entity import FireBoardEntity
+
+CYCLES = 200
+
+async def run(change_detection):
+    api = FixtureApi()
+    hass = MagicMock()
+    coordinator = FireBoardCoordinator(hass, api, 18, POLLING_MODE_DEVICES)
+    coordinator.change_detection = change_detection
+    await coordinator._async_update_data()
+    hass.data = {DOMAIN: {"coordinator_bench": coordinator}}
+    entry = MagicMock(entry_id="bench", options={})
+    entities = []
+    await sensor.async_setup_entry(hass, entry, entities.extend)
+    await switch.async_setup_entry(hass, entry, entities.extend)
+    for hardware_id in ("GHKK33R97", "G9K49836D"):
+        coordinator.set_polling(hardware_id, True)
+    writes = 0
+
+    def count_write(self):
+        nonlocal writes
+        writes += 1
+
+    FireBoardEntity.async_write_ha_state = count_write
+    first = api.devices[0]["latest_temps"][0]
+    for cycle in range(CYCLES):
+        if cycle % 3 == 0:
+            first["temp"] = round(first["temp"] + 0.1, 1)
+        await coordinator._async_update_data()
+        for entity in entities:
+            entity._handle_coordinator_update()
+    return len(entities), writes
+
+def main():
+    for change_detection in (False, True):
+        entities, writes = asyncio.run(run(change_detection))
+        label = "with change detection" if change_detection else "without change detection"
+        print(f"{label:>26}: {entities} entities, {writes} state writes/hour")
+
+if __name__ == "__main__":
+    main()
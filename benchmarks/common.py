@@ -0,0 +1,42 @@
+"""Shared helpers for the offline benchmarks.
+
+Run benchmarks from the repository root, e.g. ``python benchmarks/bench_state_writes.py``.
+"""
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+TESTS = ROOT / "custom_components" / "fireboard" / "tests"
+for path in (ROOT, TESTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from custom_components.fireboard.limiter import FireBoardRateLimiter  # noqa: E402
+from custom_components.fireboard.models import parse_devices, parse_drive  # noqa: E402
+from fake_cloud import JSON_DIR, load_jsonc  # noqa: E402,F401
+
+class FixtureApi:
+    """In-process stand-in for FireBoardApiClient serving the json/ samples."""
+
+    def __init__(self):
+        self.devices = load_jsonc("list-all-devices.jsonc")
+        self.temps = load_jsonc("device-real-time-temperature-data.jsonc")
+        self.drive = load_jsonc("device-real-time-drive-data.jsonc")
+        self.limiter = FireBoardRateLimiter(10**9)
+        self.temps_created = {}
+        self.calls = 0
+
+    async def async_get_devices(self):
+        self.calls += 1
+        self.limiter.acquire()
+        return parse_devices(self.devices)
+
+    async def async_get_channel_temps(self, device_uuid):
+        self.calls += 1
+        self.limiter.acquire()
+        return {ch["channel"]: ch.get("temp") for ch in self.temps}
+
+    async def async_get_drive_data(self, device_uuid):
+        self.calls += 1
+        self.limiter.acquire()
+        return parse_drive(self.drive)
@@ -1,37 +1,158 @@
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from .const import DOMAIN, CONF_USERNAME, CONF_PASSWORD
-from .api import FireBoardApiClient
+from homeassistant.helpers.storage import Store
+from .const import (
+    DOMAIN,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_UPDATE_INTERVAL,
+    CONF_POLLING_MODE,
+    CONF_MAX_CONCURRENCY,
+    CONF_REFRESH_DEADLINE,
+    CONF_HISTORY_WINDOW,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_RECORD_TRAFFIC,
+    POLLING_MODE_DEVICES,
+    DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_REFRESH_DEADLINE,
+    DEFAULT_HISTORY_WINDOW,
+    STORAGE_VERSION,
+    STORAGE_KEY,
+    RECORDING_FILE,
+)
+from .services import async_setup_services
+
+PLATFORMS = ["sensor", "switch"]
+
+@callback
+def _keep_polling():
+    """Coordinator listener held by the config entry itself."""
+
+def _polling_options(entry):
+    """Polling settings from the entry's options, falling back to those entered at setup."""
+    def option(key, default):
+        return entry.options.get(key, entry.data.get(key, default))
+
+    return {
+        CONF_UPDATE_INTERVAL: option(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+        CONF_POLLING_MODE: option(CONF_POLLING_MODE, POLLING_MODE_DEVICES),
+        CONF_MAX_CONCURRENCY: option(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+        CONF_REFRESH_DEADLINE: option(CONF_REFRESH_DEADLINE, DEFAULT_REFRESH_DEADLINE),
+        CONF_HISTORY_WINDOW: option(CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW),
+    }
+
+def _is_device_of(device_entry, uuids):
+    """True if the registry device is one of the FireBoard devices in ``uuids``."""
+    return any(identifier[0] == DOMAIN and identifier[1] in uuids for identifier in device_entry.identifiers)
+
+def _reload_options(entry):
+    """Options that only take effect through a reload."""
+    return (
+        entry.options.get(CONF_DIAGNOSTIC_SENSORS, False),
+        entry.options.get(CONF_RECORD_TRAFFIC, False),
+    )
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the FireBoard component from configuration.yaml."""
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up FireBoard from a config entry."""
+    # Imported here so loading the integration (config flow, services) stays cheap
+    from .api import FireBoardApiClient
+    from .coordinator import FireBoardCoordinator
+
     session = async_get_clientsession(hass)
+    options = _polling_options(entry)
+    reload_options = _reload_options(entry)
+    if entry.options.get(CONF_RECORD_TRAFFIC):
+        from .transport import RecordingSession
+        path = hass.config.path(RECORDING_FILE.format(entry.entry_id))
+        session = await hass.async_add_executor_job(RecordingSession, session, path)
+
+        async def close_recording():
+            await hass.async_add_executor_job(session.close)
+
+        entry.async_on_unload(close_recording)
+
+    def save_token(token):
+        # Persist with the entry so restarts reuse it instead of spending a login
+        if entry.data.get(CONF_TOKEN) != token:
+            hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_TOKEN: token})
+
     api = FireBoardApiClient(
         entry.data[CONF_USERNAME],
         entry.data[CONF_PASSWORD],
         session,
+        options[CONF_UPDATE_INTERVAL],
+        token=entry.data.get(CONF_TOKEN),
+        on_token=save_token,
     )
     hass.data[DOMAIN][entry.entry_id] = api
     # Set up coordinator and store for switch platform
-    from .coordinator import FireBoardCoordinator
-    update_interval = getattr(api, 'update_interval', 18)
-    coordinator = FireBoardCoordinator(hass, api, update_interval)
+    coordinator = FireBoardCoordinator(
+        hass,
+        api,
+        api.update_interval,
+        options[CONF_POLLING_MODE],
+        options[CONF_MAX_CONCURRENCY],
+        options[CONF_REFRESH_DEADLINE],
+        options[CONF_HISTORY_WINDOW],
+        Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id)),
+    )
     hass.data[DOMAIN][f"coordinator_{entry.entry_id}"] = coordinator
-    await coordinator.async_config_entry_first_refresh()
-    # Forward setup to sensor and switch platforms (plural)
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "switch"])
+
+    async def options_updated(hass, entry):
+        # Also called for the token saves above, which change neither set of options
+        if _reload_options(entry) != reload_options:
+            # The entity set or the transport changed; those are built at setup
+            hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+            return
+        coordinator.apply_options(**_polling_options(entry))
+
+    entry.async_on_unload(entry.add_update_listener(options_updated))
+
+    @callback
+    def remove_devices(added, removed):
+        # Devices that left the account; their remaining entities go with them
+        uuids = {key[1] for key in removed if key[0] == "device"}
+        if not uuids:
+            return
+        registry = dr.async_get(hass)
+        for device_entry in dr.async_entries_for_config_entry(registry, entry.entry_id):
+            if _is_device_of(device_entry, uuids):
+                registry.async_update_device(device_entry.id, remove_config_entry_id=entry.entry_id)
+
+    entry.async_on_unload(coordinator.register_discovery(remove_devices))
+    # Cached devices give the platforms their entities straight away; without a
+    # cache they start empty and the first refresh adds devices through discovery
+    await coordinator.async_load_cache()
+    # Keeps the coordinator polling while no entity listens yet, so a failed
+    # first refresh is retried instead of leaving the entry without devices
+    entry.async_on_unload(coordinator.async_add_listener(_keep_polling))
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # The live refresh must not block startup
+    entry.async_create_background_task(hass, coordinator.async_refresh(), "fireboard first refresh")
     return True
 
+async def async_remove_config_entry_device(hass: HomeAssistant, entry: ConfigEntry, device_entry):
+    """Allow deleting a device from the UI once it is no longer on the account."""
+    coordinator = hass.data[DOMAIN].get(f"coordinator_{entry.entry_id}")
+    if coordinator is None:
+        return True
+    current = {device.uuid for device in coordinator.devices} | {entry.entry_id}
+    return not _is_device_of(device_entry, current)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
-    await hass.config_entries.async_forward_entry_unload(entry, "sensor")
-    await hass.config_entries.async_forward_entry_unload(entry, "switch")
+    for platform in PLATFORMS:
+        await hass.config_entries.async_forward_entry_unload(entry, platform)
     hass.data[DOMAIN].pop(entry.entry_id)
     hass.data[DOMAIN].pop(f"coordinator_{entry.entry_id}", None)
     return True
@@ -0,0 +1,112 @@
+from bisect import bisect_left
+from .const import DOMAIN, ALERT_HYSTERESIS
+
+ALERT_EVENT = f"{DOMAIN}_alert"
+
+STATE_LOW = "low"
+STATE_OK = "ok"
+STATE_HIGH = "high"
+
+def _alert_state(alert, value):
+    temp_min, temp_max = alert
+    if temp_min is not None and value < temp_min:
+        return STATE_LOW
+    if temp_max is not None and value > temp_max:
+        return STATE_HIGH
+    return STATE_OK
+
+class ChannelAlerts:
+    """Interval index over one channel's alert boundaries.
+
+    The sorted boundaries split the temperature axis into regions, and every
+    alert's state is precomputed per region, so checking a reading is one
+    bisect however many alerts the channel has. A reading equal to a boundary
+    belongs to the region below it.
+    """
+
+    __slots__ = ("alerts", "bounds", "states", "region")
+
+    def __init__(self, alerts):
+        self.alerts = alerts  # ((temp_min, temp_max), ...)
+        self.bounds = sorted({bound for alert in alerts for bound in alert if bound is not None})
+        bounds = self.bounds
+        # A value strictly inside each region stands for all of it
+        probes = [(low + high) / 2 for low, high in zip(bounds, bounds[1:])]
+        probes = [bounds[0] - 1] + probes + [bounds[-1] + 1] if bounds else [0]
+        self.states = [tuple(_alert_state(alert, probe) for alert in alerts) for probe in probes]
+        self.region = None  # region of the last accepted reading
+
+    def evaluate(self, value, hysteresis):
+        """Move to the reading's region; returns (alert index, previous state, state) per crossing.
+
+        A move only counts once the reading is ``hysteresis`` degrees past the
+        crossed boundary, so a probe hovering on it does not flap. The first
+        reading sets the baseline without reporting anything.
+        """
+        region = bisect_left(self.bounds, value)
+        last = self.region
+        if last is None:
+            self.region = region
+            return []
+        if region > last:
+            region = max(last, bisect_left(self.bounds, value - hysteresis))
+        elif region < last:
+            region = min(last, bisect_left(self.bounds, value + hysteresis))
+        if region == last:
+            return []
+        self.region = region
+        return [
+            (index, previous, state)
+            for index, (previous, state) in enumerate(zip(self.states[last], self.states[region]))
+            if previous != state
+        ]
+
+class AlertEngine:
+    """Cloud-configured channel alerts checked locally against every new reading."""
+
+    def __init__(self):
+        self.channels = {}  # (uuid, channel): ChannelAlerts
+        self.fired = 0
+
+    def compile(self, devices):
+        """Index the enabled alerts of every channel, keeping state where the alerts are unchanged."""
+        channels = {}
+        for device in devices:
+            for channel in device.channels:
+                if not channel.alerts:
+                    continue
+                key = (device.uuid, channel.channel)
+                index = self.channels.get(key)
+                if index is None or index.alerts != channel.alerts:
+                    index = ChannelAlerts(channel.alerts)
+                channels[key] = index
+        self.channels = channels
+
+    def evaluate(self, device, temps):
+        """Check a device's new readings; returns the event data of each alert crossing."""
+        events = []
+        hysteresis = ALERT_HYSTERESIS.get(device.degreetype, 0)
+        for channel, temp in (temps or {}).items():
+            index = self.channels.get((device.uuid, channel))
+            if index is None or not isinstance(temp, (int, float)):
+                continue
+            for alert, previous, state in index.evaluate(temp, hysteresis):
+                temp_min, temp_max = index.alerts[alert]
+                reading = device.channel(channel)
+                events.append({
+                    "device_uuid": device.uuid,
+                    "hardware_id": device.hardware_id,
+                    "device_name": device.title,
+                    "channel": channel,
+                    "channel_label": reading.label if reading else None,
+                    "temp": temp,
+                    "temp_min": temp_min,
+                    "temp_max": temp_max,
+                    "previous_state": previous,
+                    "state": state,
+                })
+        self.fired += len(events)
+        return events
+
+    def as_dict(self):
+        return {"indexed_channels": len(self.channels), "fired": self.fired}
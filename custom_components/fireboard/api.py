@@ -1,42 +1,109 @@
 import aiohttp
+import asyncio
 import async_timeout
-from .const import LOGIN_URL, API_BASE, USER_AGENT
+from .const import LOGIN_URL, API_BASE, USER_AGENT, BUDGET_RESERVE, SESSION_BATCH_SIZE
+from .breaker import CircuitBreaker, FireBoardCircuitOpen, LatencyTracker
+from .instrumentation import EndpointStats
+from .limiter import FireBoardRateLimitError, get_rate_limiter
+from .models import loads, parse_chart, parse_devices, parse_drive
 import logging
-from datetime import datetime, timedelta
+import time
 
 _LOGGER = logging.getLogger(__name__)
 
 API_RATE_LIMIT = 200  # max calls per hour
 MIN_UPDATE_INTERVAL = int(3600 / API_RATE_LIMIT)  # seconds
 
+AUTH_ERRORS = (401, 403)
+
+class FireBoardAuthError(Exception):
+    """Raised when FireBoard rejects the token."""
+
+# Errors the getters pass on instead of logging and returning an empty result
+PROPAGATED_ERRORS = (FireBoardAuthError, FireBoardCircuitOpen, FireBoardRateLimitError)
+
+def is_outage(err):
+    """True for errors that mean the cloud is unreachable or overloaded."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status >= 500 or err.status == 429
+    return isinstance(err, (asyncio.TimeoutError, aiohttp.ClientError))
+
+def _parse_temps(data):
+    """temps.json as ({channel: temp}, newest created string)."""
+    created = max((ch.get("created") or "" for ch in data), default=None)
+    return {ch["channel"]: ch.get("temp") for ch in data}, created
+
+class CachedResponse:
+    """Last response for a URL: validators, raw body and the parsed result."""
+
+    __slots__ = ("etag", "last_modified", "body", "data")
+
+    def __init__(self, etag, last_modified, body, data):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.data = data
+
 class FireBoardApiClient:
-    def __init__(self, username, password, session, update_interval=None):
+    def __init__(self, username, password, session, update_interval=None, token=None, on_token=None):
         self._username = username
         self._password = password
         self._session = session
-        self._token = None
-        self._call_times = []  # track API call timestamps
-        # Enforce minimum update interval
+        self._token = token
+        self._on_token = on_token  # called with each new token so it can be persisted
+        self._login_task = None  # in-flight login shared by concurrent requests
+        self.breakers = {}  # endpoint: CircuitBreaker
+        self.latency = {}  # endpoint: LatencyTracker
+        self.endpoint_stats = {}  # endpoint: EndpointStats
+        # Shared with every other client for this account
+        self.limiter = get_rate_limiter(username, API_RATE_LIMIT)
+        self.temps_created = {}  # device_uuid: newest "created" string from temps.json
+        self.response_cache = {}  # url: CachedResponse
+        self.cache_stats = {}  # endpoint: {"hits", "misses", "not_modified"}
+        self.update_interval = MIN_UPDATE_INTERVAL
+        self.set_update_interval(update_interval)
+
+    def set_update_interval(self, update_interval):
+        """Set the configured poll interval, never below MIN_UPDATE_INTERVAL; returns the value used."""
         if update_interval is None or update_interval < MIN_UPDATE_INTERVAL:
             self.update_interval = MIN_UPDATE_INTERVAL
         else:
             self.update_interval = update_interval
-        self._blocked_until = None
-
-    async def _rate_limit_check(self):
-        now = datetime.utcnow()
-        # Remove calls older than 1 hour
-        self._call_times = [t for t in self._call_times if (now - t).total_seconds() < 3600]
-        if self._blocked_until and now < self._blocked_until:
-            raise RuntimeError(f"API rate limit exceeded. Blocked until {self._blocked_until}.")
-        if len(self._call_times) >= API_RATE_LIMIT:
-            self._blocked_until = now + timedelta(minutes=30)
-            _LOGGER.error("FireBoard API rate limit exceeded. Blocking calls for 30 minutes.")
-            raise RuntimeError(f"API rate limit exceeded. Blocked until {self._blocked_until}.")
-        self._call_times.append(now)
+        return self.update_interval
+
+    def _admit(self, endpoint):
+        """Check the endpoint's circuit, then spend budget; returns (breaker, latency tracker, stats)."""
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(endpoint)
+            self.latency[endpoint] = LatencyTracker()
+            self.endpoint_stats[endpoint] = EndpointStats()
+        if not breaker.allow():
+            raise FireBoardCircuitOpen(f"FireBoard {endpoint} endpoint unavailable, retrying later")
+        try:
+            self.limiter.acquire()
+        except BaseException:
+            # A probe the budget turned away never went out; let the next call probe
+            breaker.release()
+            raise
+        return breaker, self.latency[endpoint], self.endpoint_stats[endpoint]
+
+    @staticmethod
+    def _record(breaker, latency, stats, started, err=None):
+        elapsed = time.monotonic() - started
+        stats.record_request(elapsed, err is not None)
+        if err is None:
+            latency.record(elapsed)
+            breaker.record_success()
+        elif is_outage(err) or isinstance(err, asyncio.CancelledError):
+            # A cancelled request ran into the refresh deadline, as slow as a timeout
+            breaker.record_failure()
+        elif isinstance(err, aiohttp.ClientResponseError):
+            # The endpoint answered; a 4xx is the request's fault, not an outage
+            breaker.record_success()
 
     async def async_login(self):
-        await self._rate_limit_check()
+        breaker, latency, stats = self._admit("login")
         headers = {
             "Content-Type": "application/json",
             "User-Agent": USER_AGENT,
@@ -45,15 +112,113 @@ class FireBoardApiClient:
             "username": self._username,
             "password": self._password,
         }
+        started = time.monotonic()
         try:
-            async with async_timeout.timeout(10):
+            async with async_timeout.timeout(latency.timeout()):
                 async with self._session.post(LOGIN_URL, json=payload, headers=headers) as resp:
                     resp.raise_for_status()
                     data = await resp.json()
                     self._token = data["key"]
+        except asyncio.CancelledError as e:
+            self._record(breaker, latency, stats, started, e)
+            raise
         except Exception as e:
+            self._record(breaker, latency, stats, started, e)
             _LOGGER.error("FireBoard login failed: %s", e)
             raise
+        else:
+            self._record(breaker, latency, stats, started)
+        finally:
+            breaker.release()
+        if self._on_token:
+            self._on_token(self._token)
+
+    async def _async_relogin(self, stale_token):
+        """Log in again unless another request already replaced ``stale_token``."""
+        if self._token and self._token != stale_token:
+            return
+        if self._login_task is None:
+            self._login_task = asyncio.ensure_future(self.async_login())
+            self._login_task.add_done_callback(self._clear_login_task)
+        try:
+            await asyncio.shield(self._login_task)
+        except Exception as err:
+            raise FireBoardAuthError(f"FireBoard login failed: {err}") from err
+
+    def _clear_login_task(self, task):
+        self._login_task = None
+        if not task.cancelled():
+            task.exception()  # retrieved by the awaiting requests
+
+    def _conditional_headers(self, cached):
+        headers = self.get_auth_headers()
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    async def _async_get_json(self, url, endpoint, parse=None, cache=True):
+        """GET an endpoint, re-logging in and retrying once if the token was rejected.
+
+        Responses are cached per URL unless ``cache`` is False. A 304, or a body
+        identical to the cached one, returns the previously parsed object itself
+        without decoding, so callers can tell nothing changed with an identity check.
+        """
+        breaker, latency, stats = self._admit(endpoint)
+        try:
+            if not self._token:
+                await self._async_relogin(None)
+            cache_stats = self.cache_stats.setdefault(endpoint, {"hits": 0, "misses": 0, "not_modified": 0})
+            cached = self.response_cache.get(url) if cache else None
+            for attempt in range(2):
+                token = self._token
+                started = time.monotonic()
+                try:
+                    async with async_timeout.timeout(latency.timeout()):
+                        async with self._session.get(url, headers=self._conditional_headers(cached)) as resp:
+                            status = resp.status
+                            if status not in AUTH_ERRORS and status != 304:
+                                resp.raise_for_status()
+                                body = await resp.read()
+                                etag = resp.headers.get("ETag")
+                                last_modified = resp.headers.get("Last-Modified")
+                except (Exception, asyncio.CancelledError) as err:
+                    self._record(breaker, latency, stats, started, err)
+                    raise
+                self._record(breaker, latency, stats, started)
+                if status == 304:
+                    if cached is None:
+                        # No validators were sent, so there is nothing to reuse and no body
+                        raise aiohttp.ClientPayloadError(f"FireBoard answered 304 Not Modified for {url} with nothing cached")
+                    cache_stats["hits"] += 1
+                    cache_stats["not_modified"] += 1
+                    return cached.data
+                if status not in AUTH_ERRORS:
+                    break
+                if attempt:
+                    raise FireBoardAuthError(f"FireBoard rejected the token for {url}")
+                _LOGGER.info("FireBoard token rejected, logging in again")
+                await self._async_relogin(token)
+                self.limiter.acquire()
+            stats.record_body(len(body))
+            if cached is not None and cached.body == body:
+                cache_stats["hits"] += 1
+                cached.etag, cached.last_modified = etag, last_modified
+                return cached.data
+            cache_stats["misses"] += 1
+            decode_started = time.perf_counter()
+            data = loads(body)
+            if parse is not None:
+                data = parse(data)
+            stats.record_decode(time.perf_counter() - decode_started)
+            if cache:
+                self.response_cache[url] = CachedResponse(etag, last_modified, body, data)
+            return data
+        finally:
+            # A probe that ended without an answer either way must not hold the circuit half-open
+            breaker.release()
 
     def get_auth_headers(self):
         if not self._token:
@@ -64,19 +229,15 @@ class FireBoardApiClient:
         }
 
     async def async_get_devices(self):
-        await self._rate_limit_check()
-        if not self._token:
-            await self.async_login()
-        headers = self.get_auth_headers()
-        url = "https://fireboard.io/api/v1/devices.json"
+        url = f"{API_BASE}/devices.json"
         try:
-            async with async_timeout.timeout(10):
-                async with self._session.get(url, headers=headers) as resp:
-                    resp.raise_for_status()
-                    return await resp.json()
+            return await self._async_get_json(url, "devices", parse_devices)
+        except PROPAGATED_ERRORS:
+            raise
         except Exception as e:
+            # Raised so the coordinator keeps the last-known devices instead of dropping them
             _LOGGER.error("FireBoard get_devices failed: %s", e)
-            return []
+            raise
 
     async def async_discover_entities(self):
         try:
@@ -87,53 +248,83 @@ class FireBoardApiClient:
         entities = []
         for device in devices:
             device_info = {
-                "uuid": device.get("uuid"),
-                "id": device.get("id"),
-                "title": device.get("title"),
-                "model": device.get("model_name", device.get("model")),
-                "hardware_id": device.get("hardware_id"),
-                "degreetype": device.get("degreetype"),
+                "uuid": device.uuid,
+                "id": device.id,
+                "title": device.title,
+                "model": device.model_name,
+                "hardware_id": device.hardware_id,
+                "degreetype": device.degreetype,
             }
-            for channel in device.get("channels", []):
+            for channel in device.channels:
                 entity = {
                     "device": device_info,
-                    "channel_id": channel.get("id"),
-                    "channel_label": channel.get("channel_label"),
-                    "channel_number": channel.get("channel"),
-                    "enabled": channel.get("enabled", True),
-                    "color_hex": channel.get("color_hex"),
+                    "channel_id": channel.id,
+                    "channel_label": channel.label,
+                    "channel_number": channel.channel,
+                    "enabled": channel.enabled if channel.enabled is not None else True,
+                    "color_hex": channel.color_hex,
                 }
                 entities.append(entity)
         return entities
 
     async def async_get_channel_temps(self, device_uuid):
-        await self._rate_limit_check()
-        if not self._token:
-            await self.async_login()
-        headers = self.get_auth_headers()
-        url = f"https://fireboard.io/api/v1/devices/{device_uuid}/temps.json"
+        url = f"{API_BASE}/devices/{device_uuid}/temps.json"
         try:
-            async with async_timeout.timeout(10):
-                async with self._session.get(url, headers=headers) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    return {ch["channel"]: ch.get("temp") for ch in data}
+            temps, created = await self._async_get_json(url, "temps", _parse_temps)
+            self.temps_created[device_uuid] = created
+            return temps
+        except PROPAGATED_ERRORS:
+            raise
         except Exception as e:
+            if is_outage(e):
+                # Raised so the coordinator keeps this device's last-known values
+                raise
             _LOGGER.error("FireBoard get_channel_temps failed for %s: %s", device_uuid, e)
             return {}
 
     async def async_get_drive_data(self, device_uuid):
-        await self._rate_limit_check()
-        if not self._token:
-            await self.async_login()
-        headers = self.get_auth_headers()
-        url = f"https://fireboard.io/api/v1/devices/{device_uuid}/drivelog.json"
+        url = f"{API_BASE}/devices/{device_uuid}/drivelog.json"
         try:
-            async with async_timeout.timeout(10):
-                async with self._session.get(url, headers=headers) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    return data if data else None
+            return await self._async_get_json(url, "drivelog", parse_drive)
+        except PROPAGATED_ERRORS:
+            raise
         except Exception as e:
+            if is_outage(e):
+                # Raised so the coordinator keeps this device's last-known values
+                raise
             _LOGGER.error("FireBoard get_drive_data failed for %s: %s", device_uuid, e)
             return None
+
+    async def _async_wait_for_budget(self):
+        """Wait until a call would leave the reserve kept for polling untouched."""
+        while self.limiter.remaining() <= BUDGET_RESERVE:
+            delay = self.limiter.next_token_in(BUDGET_RESERVE + 1)
+            _LOGGER.debug("FireBoard session download waiting %.0f s for API budget", delay)
+            await asyncio.sleep(delay + 1)
+
+    async def async_iter_session_log(self, session_id, batch_size=SESSION_BATCH_SIZE):
+        """Yield a session's temperature log as lists of (created, channel, temp).
+
+        Each page is requested only when the caller asks for more, bypasses the
+        response cache and waits for budget instead of spending the polling
+        reserve. Paginated responses ({"results", "next"}) are followed page by
+        page, so memory stays at one page. A chart.json that is a single
+        document is read and decoded whole, so then memory grows with the
+        length of the session.
+        """
+        url = f"{API_BASE}/sessions/{session_id}/chart.json"
+        batch = []
+        while url:
+            await self._async_wait_for_budget()
+            data = await self._async_get_json(url, "sessions", cache=False)
+            if isinstance(data, dict):
+                series, url = data.get("results") or [], data.get("next")
+            else:
+                series, url = data, None
+            for sample in parse_chart(series):
+                batch.append(sample)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
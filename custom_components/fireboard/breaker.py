@@ -0,0 +1,103 @@
+from collections import deque
+import logging
+import random
+import time
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_BASE_BACKOFF,
+    BREAKER_MAX_BACKOFF,
+    REQUEST_TIMEOUT,
+    MIN_REQUEST_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+class FireBoardCircuitOpen(Exception):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker with jittered exponential backoff between probes."""
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                 base_backoff=BREAKER_BASE_BACKOFF, max_backoff=BREAKER_MAX_BACKOFF):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = STATE_CLOSED
+        self.failures = 0  # consecutive failures
+        self.opens = 0  # consecutive openings, drives the backoff
+        self.retry_at = None
+        self.rejected = 0  # calls short-circuited while open
+
+    def allow(self, now=None):
+        """True if a request may go out; when open, lets a single probe through once due."""
+        if self.state == STATE_CLOSED:
+            return True
+        now = time.monotonic() if now is None else now
+        if self.state == STATE_OPEN and now >= self.retry_at:
+            self.state = STATE_HALF_OPEN
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("FireBoard %s endpoint recovered", self.name)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opens = 0
+        self.retry_at = None
+
+    def release(self):
+        """Free the probe slot when a probe ended without an answer either way."""
+        if self.state == STATE_HALF_OPEN:
+            self.state = STATE_OPEN
+            self.retry_at = time.monotonic()
+
+    def record_failure(self, now=None):
+        now = time.monotonic() if now is None else now
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opens += 1
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.opens - 1))
+            # Jitter between half and the full backoff so clients do not probe in lockstep
+            self.retry_at = now + random.uniform(backoff / 2, backoff)
+            if self.state != STATE_OPEN:
+                _LOGGER.warning(
+                    "FireBoard %s endpoint failing, pausing requests for %.0f s",
+                    self.name, self.retry_at - now,
+                )
+            self.state = STATE_OPEN
+
+    def as_dict(self):
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "retry_in": round(max(self.retry_at - time.monotonic(), 0), 1) if self.retry_at else None,
+        }
+
+class LatencyTracker:
+    """Recent request latencies; the timeout adapts to their 95th percentile."""
+
+    def __init__(self, size=50):
+        self._samples = deque(maxlen=size)
+
+    def record(self, seconds):
+        self._samples.append(seconds)
+
+    def percentile(self, q):
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def timeout(self):
+        if len(self._samples) < 5:
+            return REQUEST_TIMEOUT
+        return min(REQUEST_TIMEOUT, max(MIN_REQUEST_TIMEOUT, 3 * self.percentile(0.95)))
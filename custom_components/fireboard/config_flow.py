@@ -2,12 +2,29 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_TOKEN,
+    CONF_UPDATE_INTERVAL,
+    CONF_POLLING_MODE,
+    CONF_MAX_CONCURRENCY,
+    CONF_REFRESH_DEADLINE,
+    CONF_HISTORY_WINDOW,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_RECORD_TRAFFIC,
+    POLLING_MODE_DEVICES,
+    POLLING_MODES,
+    DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_REFRESH_DEADLINE,
+    DEFAULT_HISTORY_WINDOW,
+)
 
 DATA_SCHEMA = vol.Schema({
     vol.Required(CONF_USERNAME): str,
     vol.Required(CONF_PASSWORD): str,
-    vol.Optional("update_interval", default=18): vol.All(vol.Coerce(int), vol.Range(min=18)),
+    vol.Optional(CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): vol.All(vol.Coerce(int), vol.Range(min=18)),
+    vol.Optional(CONF_POLLING_MODE, default=POLLING_MODE_DEVICES): vol.In(POLLING_MODES),
 })
 
 class FireBoardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -22,11 +39,14 @@ class FireBoardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 user_input[CONF_USERNAME],
                 user_input[CONF_PASSWORD],
                 session,
-                user_input.get("update_interval", 18),
+                user_input.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
             )
             try:
                 await api.async_login()
-                return self.async_create_entry(title=user_input[CONF_USERNAME], data=user_input)
+                return self.async_create_entry(
+                    title=user_input[CONF_USERNAME],
+                    data={**user_input, CONF_TOKEN: api._token},
+                )
             except Exception:
                 errors["base"] = "auth"
         return self.async_show_form(step_id="user", data_schema=DATA_SCHEMA, errors=errors)
@@ -45,6 +65,12 @@ class FireBoardOptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
         options_schema = vol.Schema({
-            vol.Optional("update_interval", default=self.config_entry.options.get("update_interval", 18)): vol.All(vol.Coerce(int), vol.Range(min=18)),
+            vol.Optional(CONF_UPDATE_INTERVAL, default=self.config_entry.options.get(CONF_UPDATE_INTERVAL, self.config_entry.data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL))): vol.All(vol.Coerce(int), vol.Range(min=18)),
+            vol.Optional(CONF_POLLING_MODE, default=self.config_entry.options.get(CONF_POLLING_MODE, self.config_entry.data.get(CONF_POLLING_MODE, POLLING_MODE_DEVICES))): vol.In(POLLING_MODES),
+            vol.Optional(CONF_MAX_CONCURRENCY, default=self.config_entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+            vol.Optional(CONF_REFRESH_DEADLINE, default=self.config_entry.options.get(CONF_REFRESH_DEADLINE, DEFAULT_REFRESH_DEADLINE)): vol.All(vol.Coerce(int), vol.Range(min=5, max=120)),
+            vol.Optional(CONF_HISTORY_WINDOW, default=self.config_entry.options.get(CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW)): vol.All(vol.Coerce(int), vol.Range(min=5, max=240)),
+            vol.Optional(CONF_DIAGNOSTIC_SENSORS, default=self.config_entry.options.get(CONF_DIAGNOSTIC_SENSORS, False)): bool,
+            vol.Optional(CONF_RECORD_TRAFFIC, default=self.config_entry.options.get(CONF_RECORD_TRAFFIC, False)): bool,
         })
         return self.async_show_form(step_id="init", data_schema=options_schema, errors=errors)
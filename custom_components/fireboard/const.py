@@ -1,6 +1,54 @@
 DOMAIN = "fireboard"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
+CONF_TOKEN = "token"
 API_BASE = "https://fireboard.io/api/v1"
 LOGIN_URL = "https://fireboard.io/api/rest-auth/login/"
 USER_AGENT = "HomeAssistant FireBoard Integration"
+CONF_UPDATE_INTERVAL = "update_interval"
+DEFAULT_UPDATE_INTERVAL = 18  # seconds, the fastest the hourly API limit allows
+CONF_POLLING_MODE = "polling_mode"
+# devices: build state from the devices.json payload, per-device endpoints only as fallback
+# full: always fetch temps.json and drivelog.json for every polling device
+POLLING_MODE_DEVICES = "devices"
+POLLING_MODE_FULL = "full"
+POLLING_MODES = [POLLING_MODE_DEVICES, POLLING_MODE_FULL]
+# Embedded readings older than the device's last_templog by more than this are stale
+EMBEDDED_STALE_SECONDS = 60
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_REFRESH_DEADLINE = "refresh_deadline"
+DEFAULT_MAX_CONCURRENCY = 4  # per-device requests in flight at once
+DEFAULT_REFRESH_DEADLINE = 15  # seconds a refresh cycle may spend on per-device requests
+REFRESH_COALESCE_WINDOW = 1.0  # seconds refresh requests are collected before one fetch runs
+BUDGET_RESERVE = 5  # calls kept back from per-device requests for devices.json and logins
+MAX_UPDATE_INTERVAL = 300  # slowest adaptive poll interval in seconds
+ACTIVITY_FAST_RATE = 2.0  # degrees per minute considered a fast-moving probe
+ACTIVITY_FLAT_RATE = 0.2  # degrees per minute considered flat
+MIN_DEVICE_BUDGET_SHARE = 0.25  # fraction of the hourly budget always left for per-device requests
+DEVICE_CREDIT_CAP = 2  # per-device requests a device can save up, one full temps + drive fetch
+UPLOAD_LAG = 3  # seconds after an expected device upload before fetching
+CONF_HISTORY_WINDOW = "history_window"
+DEFAULT_HISTORY_WINDOW = 30  # minutes of per-channel history kept in memory
+HISTORY_CAPACITY = 512  # samples per channel, bounds history memory
+STALL_RATE = 0.1  # degrees per minute below which a probe in the stall band is stalled
+STALL_BAND = {1: (65, 80), 2: (150, 175)}  # by degreetype: 1 = C, 2 = F
+ALERT_HYSTERESIS = {1: 1, 2: 2}  # degrees past an alert boundary before a crossing counts, by degreetype
+STORAGE_VERSION = 1
+STORAGE_KEY = "fireboard.{}"  # per config entry warm-start cache
+CACHE_SAVE_DELAY = 30  # seconds between cache writes
+DEVICE_REMOVAL_REFRESHES = 3  # consecutive devices.json listings without a device before it is removed
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures that open an endpoint's circuit
+BREAKER_BASE_BACKOFF = 30  # seconds before the first probe after opening
+BREAKER_MAX_BACKOFF = 900  # cap on the probe backoff
+REQUEST_TIMEOUT = 10  # seconds, used until enough latencies are observed
+MIN_REQUEST_TIMEOUT = 3
+CONF_DIAGNOSTIC_SENSORS = "diagnostic_sensors"  # account-level API budget and refresh timing sensors
+CONF_RECORD_TRAFFIC = "record_traffic"  # append API exchanges to fireboard_<entry_id>.jsonl.gz for replay
+RECORDING_FILE = "fireboard_{}.jsonl.gz"
+RECORDING_FLUSH_INTERVAL = 30  # seconds between flushes of the recording to disk
+RECORDING_MAX_BYTES = 50 * 1024 * 1024  # recording size at which it is rotated to <file>.1
+SESSION_BATCH_SIZE = 500  # session log samples handed to the importer or exporter at a time
+TARGET_STATISTICS = "statistics"
+EXPORT_FORMATS = ("csv", "jsonl")
+BACKFILL_TARGETS = (TARGET_STATISTICS,) + EXPORT_FORMATS
+EXPORT_DIR = "www/fireboard"  # default export directory, relative to the config directory
@@ -1,11 +1,55 @@
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 from datetime import timedelta
+import asyncio
 import logging
+import time
+from .const import (
+    POLLING_MODE_DEVICES,
+    POLLING_MODE_FULL,
+    EMBEDDED_STALE_SECONDS,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_REFRESH_DEADLINE,
+    REFRESH_COALESCE_WINDOW,
+    BUDGET_RESERVE,
+    DEFAULT_HISTORY_WINDOW,
+    HISTORY_CAPACITY,
+    CACHE_SAVE_DELAY,
+    DEVICE_REMOVAL_REFRESHES,
+)
+from .alerts import ALERT_EVENT, AlertEngine
+from .history import ChannelHistory
+from .instrumentation import RefreshProfile
+from .models import parse_created, parse_device, parse_drive
+from .estimator import channel_target, estimate_etas
+from .standby import StandbyMonitor
+from .scheduler import (
+    FairShareAllocator,
+    FireBoardPollScheduler,
+    UploadCadence,
+    classify_activity,
+    device_priority,
+    drive_active,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Drive fields rendered by the drive sensors
+DRIVE_FIELDS = ("driveper", "setpoint", "lidpaused", "tiedchannel")
+_MISSING = object()
+
 class FireBoardCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, api_client, update_interval):
+    def __init__(
+        self,
+        hass,
+        api_client,
+        update_interval,
+        polling_mode=POLLING_MODE_DEVICES,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        refresh_deadline=DEFAULT_REFRESH_DEADLINE,
+        history_window=DEFAULT_HISTORY_WINDOW,
+        store=None,
+    ):
         super().__init__(
             hass,
             _LOGGER,
@@ -13,15 +57,49 @@ class FireBoardCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=update_interval),
         )
         self.api = api_client
-        self.devices = []
+        self.polling_mode = polling_mode
+        self.max_concurrency = max(1, max_concurrency)
+        self.refresh_deadline = refresh_deadline
+        self.scheduler = FireBoardPollScheduler(update_interval, api_client.limiter)
+        self.allocator = FairShareAllocator(api_client.limiter)
+        self._pinned = set()  # hardware ids the user gave top priority
+        self._deferred = set()  # devices whose per-device requests waited for budget this refresh
+        self._last_sample = None  # (monotonic time, channel_temps) of the previous refresh
+        self.cadence = {}  # uuid: UploadCadence
+        self.change_detection = True
+        self.changed_keys = set()  # value keys that changed in the last refresh
+        self._values = {}  # value key: value rendered by an entity
+        self.history_window = history_window
+        self.history = {}  # (uuid, channel): ChannelHistory
+        self.etas = {}  # (uuid, channel): CookEta
+        self.alerts = AlertEngine()
+        self._store = store  # warm-start cache, see async_load_cache
+        self.stale_since = None  # set while devices.json fails and last-known data is served
+        self._device_stale_since = {}  # uuid: first failed per-device refresh
+        self._missing_refreshes = {}  # uuid: consecutive devices.json listings without the device
+        self.devices = []  # DeviceSnapshot list
+        self._devices_by_uuid = {}
+        self._uuid_by_hardware_id = {}
+        self._channel_ids = {}  # uuid: ((channel id, channel number), ...) of the last listing
+        self._channel_numbers = {}  # (uuid, channel id): channel number
+        self._drive_uuids = set()  # devices that have reported a drive
+        self._discovery_callbacks = []
         self.channel_temps = {}
         self.drive_data = {}
         self._polling_state = {}  # hardware_id: bool
         self._empty_temp_count = {}  # hardware_id: int
+        self.standby = StandbyMonitor()  # devices auto-disabled by empty reads
+        self._device_calls = {}  # uuid: per-device calls spent in the current refresh
         self._switch_entities = {}  # hardware_id: switch entity
+        self._pending_refresh = None  # future shared by coalesced refresh requests
+        self._in_flight = None  # future resolved when the running update finishes
+        self.refresh_stats = {"requested": 0, "coalesced": 0, "executed": 0}
+        self.unchanged_refreshes = 0  # devices.json and per-device data identical to the last refresh
+        self.profile = RefreshProfile()
 
     def set_polling(self, hardware_id, enabled):
         self._polling_state[hardware_id] = enabled
+        self.standby.leave(hardware_id)
         if enabled:
             self._empty_temp_count[hardware_id] = 0
 
@@ -29,39 +107,583 @@ class FireBoardCoordinator(DataUpdateCoordinator):
         # Default to True if not set
         return self._polling_state.get(hardware_id, True)
 
+    def set_pinned(self, hardware_id, pinned):
+        if pinned:
+            self._pinned.add(hardware_id)
+        else:
+            self._pinned.discard(hardware_id)
+
+    def is_pinned(self, hardware_id):
+        return hardware_id in self._pinned
+
+    def apply_options(self, update_interval, polling_mode, max_concurrency, refresh_deadline, history_window):
+        """Apply changed polling options in place; returns the names of the options that changed.
+
+        Devices, history, cadences and the token are kept, so nothing is fetched
+        again. A new update interval reschedules the pending refresh from now.
+        """
+        update_interval = self.api.set_update_interval(update_interval)
+        max_concurrency = max(1, max_concurrency)
+        changed = [
+            name for name, old, new in (
+                ("update_interval", self.scheduler.base_interval, update_interval),
+                ("polling_mode", self.polling_mode, polling_mode),
+                ("max_concurrency", self.max_concurrency, max_concurrency),
+                ("refresh_deadline", self.refresh_deadline, refresh_deadline),
+                ("history_window", self.history_window, history_window),
+            )
+            if old != new
+        ]
+        self.polling_mode = polling_mode
+        self.max_concurrency = max_concurrency
+        self.refresh_deadline = refresh_deadline
+        if "history_window" in changed:
+            self.history_window = history_window
+            # Samples past a shorter window leave with the next reading
+            for history in self.history.values():
+                history.window = history_window * 60
+        if "update_interval" in changed:
+            self.scheduler.base_interval = update_interval
+            self.scheduler.interval = float(update_interval)
+            self.update_interval = timedelta(seconds=update_interval)
+            if self._listeners:
+                self._schedule_refresh()
+        if changed:
+            _LOGGER.debug("FireBoard options applied: %s", ", ".join(changed))
+        return changed
+
     def register_switch_entity(self, hardware_id, switch_entity):
         self._switch_entities[hardware_id] = switch_entity
 
+    def device(self, uuid):
+        """Latest DeviceSnapshot for a device, or None if it is no longer listed."""
+        return self._devices_by_uuid.get(uuid)
+
+    def device_by_hardware_id(self, hardware_id):
+        return self._devices_by_uuid.get(self._uuid_by_hardware_id.get(hardware_id))
+
+    def channel(self, uuid, channel_id):
+        """Latest ChannelReading for a channel by its FireBoard id."""
+        device = self._devices_by_uuid.get(uuid)
+        number = self._channel_numbers.get((uuid, channel_id))
+        if device is None or number is None:
+            return None
+        return device.channel(number)
+
+    def entity_keys(self):
+        """Keys of the entity groups the current devices need, in device order.
+
+        ("device", uuid) covers per-device entities, ("channel", uuid, channel id)
+        the per-channel ones and ("drive", uuid) the drive sensors.
+        """
+        keys = []
+        for device in self.devices:
+            keys.append(("device", device.uuid))
+            keys.extend(("channel", device.uuid, channel_id) for channel_id, _ in self._channel_ids[device.uuid])
+            if device.uuid in self._drive_uuids:
+                keys.append(("drive", device.uuid))
+        return keys
+
+    def register_discovery(self, callback):
+        """Call ``callback(added, removed)`` with entity keys as devices and channels come and go.
+
+        Returns a function that unregisters the callback.
+        """
+        self._discovery_callbacks.append(callback)
+        return lambda: self._discovery_callbacks.remove(callback)
+
+    def drive_value(self, uuid, field):
+        return getattr(self.drive_data.get(uuid), field, None)
+
+    def _set_devices(self, devices):
+        """Replace the device list; returns the (added, removed) entity keys.
+
+        Only devices whose channel listing changed are re-indexed, so the work
+        beyond the uuid lookup is proportional to what was added or removed.
+        """
+        by_uuid = {device.uuid: device for device in devices}
+        added, removed, kept = [], [], []
+        for uuid in self._devices_by_uuid.keys() - by_uuid.keys():
+            # A device missing from one listing may be a cloud glitch; keep it, marked
+            # stale, until it has been missing for DEVICE_REMOVAL_REFRESHES listings
+            missing = self._missing_refreshes[uuid] = self._missing_refreshes.get(uuid, 0) + 1
+            if missing < DEVICE_REMOVAL_REFRESHES:
+                kept.append(self._devices_by_uuid[uuid])
+                self._device_stale_since.setdefault(uuid, dt_util.utcnow())
+            else:
+                removed.extend(self._forget_device(uuid))
+        for uuid in by_uuid.keys() & self._missing_refreshes.keys():
+            del self._missing_refreshes[uuid]
+            self._device_stale_since.pop(uuid, None)
+        for device in devices:
+            uuid = device.uuid
+            channels = tuple((channel.id, channel.channel) for channel in device.channels)
+            previous = self._channel_ids.get(uuid)
+            if previous == channels:
+                continue
+            if previous is None:
+                previous = ()
+                added.append(("device", uuid))
+                self._uuid_by_hardware_id[device.hardware_id] = uuid
+            old_ids = {channel_id for channel_id, _ in previous}
+            new_ids = {channel_id for channel_id, _ in channels}
+            for channel_id in old_ids - new_ids:
+                del self._channel_numbers[(uuid, channel_id)]
+                removed.append(("channel", uuid, channel_id))
+            for channel_id, number in channels:
+                self._channel_numbers[(uuid, channel_id)] = number
+                if channel_id not in old_ids:
+                    added.append(("channel", uuid, channel_id))
+            self._channel_ids[uuid] = channels
+        # The response itself when nothing is kept, so an unchanged body stays an identity check
+        self.devices = devices + kept if kept else devices
+        self._devices_by_uuid = {**by_uuid, **{device.uuid: device for device in kept}}
+        return added, removed
+
+    def _forget_device(self, uuid):
+        """Drop everything kept for a device that left the account; returns its entity keys."""
+        keys = [("device", uuid)]
+        for channel_id, _ in self._channel_ids.pop(uuid, ()):
+            self._channel_numbers.pop((uuid, channel_id), None)
+            keys.append(("channel", uuid, channel_id))
+        if uuid in self._drive_uuids:
+            self._drive_uuids.discard(uuid)
+            keys.append(("drive", uuid))
+        hardware_id = self._devices_by_uuid[uuid].hardware_id
+        self._uuid_by_hardware_id.pop(hardware_id, None)
+        self._switch_entities.pop(hardware_id, None)
+        self._pinned.discard(hardware_id)
+        self.standby.leave(hardware_id)
+        self.cadence.pop(uuid, None)
+        self._device_stale_since.pop(uuid, None)
+        self._missing_refreshes.pop(uuid, None)
+        self.channel_temps.pop(uuid, None)
+        self.drive_data.pop(uuid, None)
+        for key in [key for key in self.history if key[0] == uuid]:
+            del self.history[key]
+            self.etas.pop(key, None)
+        return keys
+
+    def _discover_drives(self):
+        """Entity keys for drives reporting for the first time; drive sensors stay once created."""
+        added = []
+        for uuid, drive in self.drive_data.items():
+            if drive is not None and uuid not in self._drive_uuids:
+                self._drive_uuids.add(uuid)
+                added.append(("drive", uuid))
+        return added
+
+    def _notify_discovery(self, added, removed):
+        if not added and not removed:
+            return
+        _LOGGER.debug("FireBoard entities added: %s, removed: %s", added, removed)
+        for callback in list(self._discovery_callbacks):
+            callback(added, removed)
+
+    def _cache_data(self):
+        return {
+            "devices": [device.as_dict() for device in self.devices],
+            "channel_temps": {
+                uuid: {str(channel): temp for channel, temp in (temps or {}).items()}
+                for uuid, temps in self.channel_temps.items()
+            },
+            "drive_data": {uuid: drive.as_dict() if drive else None for uuid, drive in self.drive_data.items()},
+            "rate_limit": self.api.limiter.as_dict(),
+        }
+
+    async def async_load_cache(self):
+        """Restore devices, last readings and limiter state saved by a previous run.
+
+        Returns True when devices were restored, so entities can be created before
+        the first live refresh.
+        """
+        if self._store is None:
+            return False
+        try:
+            cache = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning("FireBoard cache could not be loaded: %s", err)
+            return False
+        if not cache:
+            return False
+        self.api.limiter.restore(cache.get("rate_limit") or {})
+        self._set_devices([parse_device(device) for device in cache.get("devices") or []])
+        self.alerts.compile(self.devices)
+        self.channel_temps = {
+            uuid: {int(channel): temp for channel, temp in temps.items()}
+            for uuid, temps in (cache.get("channel_temps") or {}).items()
+        }
+        self.drive_data = {uuid: parse_drive(drive) for uuid, drive in (cache.get("drive_data") or {}).items()}
+        self._discover_drives()
+        self._diff_values()
+        self.data = {
+            "devices": self.devices,
+            "channel_temps": self.channel_temps,
+            "drive_data": self.drive_data
+        }
+        return bool(self.devices)
+
+    def stale_since_for(self, uuid):
+        """When the values served for a device stopped updating, or None if they are current."""
+        return self.stale_since or self._device_stale_since.get(uuid)
+
+    def has_changed(self, keys):
+        """True if any of the entity value keys changed in the last refresh."""
+        return not self.change_detection or not self.changed_keys.isdisjoint(keys)
+
+    def _state_values(self):
+        """Flatten the values entities render into {(uuid, kind, ...): value}."""
+        values = {}
+        allocations = self._allocation_values()
+        for device in self.devices:
+            uuid = device.uuid
+            values[(uuid, "battery")] = device.battery
+            values[(uuid, "stale")] = self.stale_since_for(uuid)
+            if uuid in allocations:
+                values[(uuid, "allocation")] = allocations[uuid]
+            for channel in device.channels:
+                eta = self.etas.get((uuid, channel.channel))
+                if eta is not None:
+                    # Whole minutes, so a jittering estimate does not write state every refresh
+                    minutes = round(eta.minutes) if eta.minutes is not None else None
+                    values[(uuid, "eta", channel.channel)] = (eta.target, minutes, eta.stalled)
+            for channel, temp in (self.channel_temps.get(uuid) or {}).items():
+                values[(uuid, "channel", channel)] = temp
+            drive = self.drive_data.get(uuid)
+            for field in DRIVE_FIELDS:
+                values[(uuid, "drive", field)] = getattr(drive, field, None)
+        return values
+
+    def _allocation_values(self):
+        # Whole calls per hour, so the polling switches only write when the split moves
+        return {uuid: (a.priority, round(a.share)) for uuid, a in self.allocator.allocations.items()}
+
+    def _diff_values(self):
+        values = self._state_values()
+        previous = self._values
+        self.changed_keys = {key for key, value in values.items() if previous.get(key, _MISSING) != value}
+        self.changed_keys.update(key for key in previous if key not in values)
+        self._values = values
+
+    async def async_request_coalesced_refresh(self):
+        """Request a refresh, sharing one upstream fetch with every request in the window."""
+        self.refresh_stats["requested"] += 1
+        shared = self._pending_refresh or self._in_flight
+        if shared is not None:
+            self.refresh_stats["coalesced"] += 1
+            await asyncio.shield(shared)
+            return
+        future = self._pending_refresh = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.sleep(REFRESH_COALESCE_WINDOW)
+            if self._in_flight is not None:
+                # A scheduled refresh started during the window and fetches after the request
+                self.refresh_stats["coalesced"] += 1
+                await asyncio.shield(self._in_flight)
+                return
+            self.refresh_stats["executed"] += 1
+            await self.async_refresh()
+        finally:
+            self._pending_refresh = None
+            future.set_result(None)
+
+    def _temps_from_device(self, device):
+        """Embedded (temps, created) for a device, or None when missing or stale."""
+        if self.polling_mode == POLLING_MODE_FULL:
+            return None
+        if device.temps is None:
+            return None
+        created = device.temps_created
+        last_templog = device.last_templog
+        if created is None or (
+            last_templog and (last_templog - created).total_seconds() > EMBEDDED_STALE_SECONDS
+        ):
+            return None
+        return device.temps, created
+
+    def _drive_from_device(self, device):
+        """Embedded drive data as (found, drive); found is False when drivelog.json is needed."""
+        if self.polling_mode == POLLING_MODE_FULL or not device.has_drivelog:
+            return False, None
+        drive = device.drive
+        if drive is None:
+            # last_drivelog is null: the device has no drive attached
+            return True, None
+        created = drive.created
+        last_templog = device.last_templog
+        if drive.modetype and (created is None or (
+            last_templog and (last_templog - created).total_seconds() > EMBEDDED_STALE_SECONDS
+        )):
+            # Drive is running but its embedded log lags behind the device
+            return False, None
+        return True, drive
+
+    async def _async_fetch_device(self, device, semaphore):
+        """Fetch temps and drive data for one device, each request bounded by the semaphore."""
+        uuid = device.uuid
+
+        async def limited(fetch):
+            async with semaphore:
+                # Keep the last-known values rather than tripping the limiter's block
+                if self.api.limiter.remaining() <= BUDGET_RESERVE:
+                    raise RuntimeError("API budget reserved, skipping per-device request")
+                self._device_calls[uuid] = self._device_calls.get(uuid, 0) + 1
+                return await fetch(uuid)
+
+        cadence = self.cadence.setdefault(uuid, UploadCadence())
+        temps = created = None
+        embedded = self._temps_from_device(device)
+        pending = []
+        if embedded is not None:
+            temps, created = embedded
+        elif not cadence.expects_new_data(dt_util.utcnow()) and uuid in self.channel_temps:
+            # The device has not uploaded since the last fetch; temps.json would repeat it
+            cadence.skipped += 1
+            temps = self.channel_temps[uuid]
+            cadence = None
+        else:
+            pending.append(("temps", self.api.async_get_channel_temps))
+        found, drive = self._drive_from_device(device)
+        if not found:
+            pending.append(("drive", self.api.async_get_drive_data))
+        # A device without readings yet is fetched even when over its share
+        if not self.allocator.admit(uuid, len(pending)) and uuid in self.channel_temps:
+            # The device has spent its share of the budget; keep its last-known values
+            self._deferred.add(uuid)
+            if pending[0][0] == "temps":
+                temps = self.channel_temps[uuid]
+                cadence = None
+            if pending[-1][0] == "drive":
+                drive = self.drive_data.get(uuid)
+            pending = []
+        if pending:
+            results = dict(zip(
+                (key for key, _ in pending),
+                await asyncio.gather(*(limited(fetch) for _, fetch in pending)),
+            ))
+            if "temps" in results:
+                temps = results["temps"]
+                created = parse_created(self.api.temps_created.get(uuid))
+            drive = results.get("drive", drive)
+        if cadence is not None and not cadence.observe(created):
+            created = None  # no new reading to add to the history
+        return temps, drive, created
+
+    def channel_history(self, uuid, channel):
+        return self.history.get((uuid, channel))
+
+    def channel_eta(self, uuid, channel):
+        return self.etas.get((uuid, channel))
+
+    def _update_etas(self):
+        """Re-estimate cook ETAs for every channel of every device in one batch."""
+        rows = []
+        for device in self.devices:
+            uuid = device.uuid
+            temps = self.channel_temps.get(uuid) or {}
+            drive = self.drive_data.get(uuid)
+            for channel in device.channels:
+                history = self.history.get((uuid, channel.channel))
+                if not history:
+                    continue
+                target = channel_target(channel, temps.get(channel.channel), drive, history.rate)
+                rows.append(((uuid, channel.channel), history, target, device.degreetype))
+        self.etas = estimate_etas(rows, dt_util.utcnow())
+
+    def _record_history(self, uuid, temps, timestamp):
+        for channel, temp in (temps or {}).items():
+            if not isinstance(temp, (int, float)):
+                continue
+            history = self.history.get((uuid, channel))
+            if history is None:
+                history = self.history[(uuid, channel)] = ChannelHistory(self.history_window * 60, HISTORY_CAPACITY)
+            history.append(timestamp, temp)
+
+    def _device_priority(self, device):
+        rates = []
+        for channel in device.channels:
+            history = self.history.get((device.uuid, channel.channel))
+            rate = history.rate if history is not None else None
+            if rate is not None:
+                rates.append(abs(rate))
+        return device_priority(
+            device.hardware_id in self._pinned,
+            self.drive_data.get(device.uuid),
+            max(rates, default=None),
+        )
+
+    def _check_empty_temps(self, device, temps):
+        hardware_id = device.hardware_id
+        if not temps:
+            self.standby.idle_calls += self._device_calls.get(device.uuid, 0)
+            self._empty_temp_count[hardware_id] = self._empty_temp_count.get(hardware_id, 0) + 1
+            if self._empty_temp_count[hardware_id] >= 3:
+                self.set_polling(hardware_id, False)
+                # Watch it through devices.json until it uploads again
+                self.standby.enter(device, dt_util.utcnow())
+                # Notify switch entity to turn off
+                switch = self._switch_entities.get(hardware_id)
+                if switch:
+                    switch.auto_turn_off()
+        else:
+            self._empty_temp_count[hardware_id] = 0
+
+    def _wake_standby_devices(self):
+        """Resume polling for standby devices whose devices.json entry shows a new upload."""
+        for hardware_id in self.standby.check(self.devices, dt_util.utcnow()):
+            _LOGGER.info("FireBoard %s is uploading again, resuming polling", hardware_id)
+            self.set_polling(hardware_id, True)
+            switch = self._switch_entities.get(hardware_id)
+            if switch:
+                switch.auto_turn_on()
+
     async def _async_update_data(self):
+        in_flight = self._in_flight = asyncio.get_running_loop().create_future()
+        self.changed_keys = set()
+        self.profile.start()
+        try:
+            return await self._async_fetch_all()
+        finally:
+            self.profile.finish()
+            in_flight.set_result(None)
+            # An overlapping update may have replaced it meanwhile
+            if self._in_flight is in_flight:
+                self._in_flight = None
+
+    def _max_temp_rate(self, now):
+        """Fastest probe change in degrees per minute since the previous refresh."""
+        if self._last_sample is None:
+            return None
+        then, previous = self._last_sample
+        minutes = (now - then) / 60
+        if minutes <= 0:
+            return None
+        rates = [
+            abs(temp - previous[uuid][channel]) / minutes
+            for uuid, temps in self.channel_temps.items() if uuid in previous
+            for channel, temp in temps.items()
+            if isinstance(temp, (int, float)) and isinstance(previous[uuid].get(channel), (int, float))
+        ]
+        return max(rates, default=None)
+
+    def _schedule_next(self, calls_before, polled):
+        """Set update_interval for the next refresh from budget and cook activity."""
+        now = time.monotonic()
+        drives = [self.drive_data.get(d.uuid) for d in polled]
+        activity = classify_activity(
+            self._max_temp_rate(now),
+            any(drive_active(drive) for drive in drives),
+            any(drive and drive.lidpaused for drive in drives),
+        )
+        self._last_sample = (now, self.channel_temps)
+        expected = 1 + (2 * len(polled) if self.polling_mode == POLLING_MODE_FULL else 0)
+        calls = self.scheduler.record_cycle(self.api.limiter.total_calls - calls_before, expected)
+        cadences = [self.cadence[d.uuid] for d in polled if d.uuid in self.cadence]
+        interval = self.scheduler.next_interval(calls, activity, cadences, dt_util.utcnow())
+        self.update_interval = timedelta(seconds=interval)
+
+    async def _async_fetch_all(self):
+        started = time.monotonic()
+        calls_before = self.api.limiter.total_calls
+        previous = (self.devices, self.stale_since, dict(self._device_stale_since))
         try:
-            self.devices = await self.api.async_get_devices()
-            # Fetch temps and drive data for all devices
-            self.channel_temps = {}
-            self.drive_data = {}
-            for device in self.devices:
-                uuid = device.get("uuid")
-                hardware_id = device.get("hardware_id")
-                if not self.is_polling(hardware_id):
-                    continue  # Skip polling for this device
-                temps = await self.api.async_get_channel_temps(uuid)
-                self.channel_temps[uuid] = temps
-                drive = await self.api.async_get_drive_data(uuid)
-                self.drive_data[uuid] = drive
-                # Check for empty temp data
-                if not temps:
-                    self._empty_temp_count[hardware_id] = self._empty_temp_count.get(hardware_id, 0) + 1
-                    if self._empty_temp_count[hardware_id] >= 3:
-                        self.set_polling(hardware_id, False)
-                        # Notify switch entity to turn off
-                        switch = self._switch_entities.get(hardware_id)
-                        if switch:
-                            switch.auto_turn_off()
-                else:
-                    self._empty_temp_count[hardware_id] = 0
-            return {
-                "devices": self.devices,
-                "channel_temps": self.channel_temps,
-                "drive_data": self.drive_data
-            }
+            devices = await self.api.async_get_devices()
+            if not devices and self.devices:
+                # Every device leaving at once is a cloud glitch, not a change to the account
+                raise UpdateFailed("devices.json listed no devices")
         except Exception as err:
-            raise UpdateFailed(f"Error updating FireBoard data: {err}")
+            self.profile.phase("devices")
+            # Still back off so a rate-limited account is not retried early
+            self._schedule_next(calls_before, [])
+            if self.data is None or not self.devices:
+                raise UpdateFailed(f"Error updating FireBoard data: {err}")
+            # Serve the last-known values, marked stale, instead of going unavailable
+            _LOGGER.debug("FireBoard serving last-known data: %s", err)
+            if self.stale_since is None:
+                self.stale_since = dt_util.utcnow()
+            self._diff_values()
+            return self.data
+        self.profile.phase("devices")
+        added, removed = [], []
+        if devices is not self.devices:
+            added, removed = self._set_devices(devices)
+            self.alerts.compile(self.devices)
+        self.stale_since = None
+        self._wake_standby_devices()
+        # Fetch temps and drive data for all polling devices concurrently
+        polled = [
+            d for d in self.devices
+            if self.is_polling(d.hardware_id) and d.uuid not in self._missing_refreshes
+        ]
+        allocations = self._allocation_values()
+        self.allocator.update(
+            {d.uuid: self._device_priority(d) for d in polled},
+            3600 / self.update_interval.total_seconds(),
+        )
+        self._deferred = set()
+        self._device_calls = {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [asyncio.ensure_future(self._async_fetch_device(d, semaphore)) for d in polled]
+        if tasks:
+            deadline = max(self.refresh_deadline - (time.monotonic() - started), 0)
+            _, not_done = await asyncio.wait(tasks, timeout=deadline)
+            for task in not_done:
+                task.cancel()
+            if not_done:
+                await asyncio.wait(not_done)
+        self.profile.phase("per_device")
+        # Devices missing from devices.json keep their last-known values until removed
+        channel_temps = {uuid: self.channel_temps[uuid] for uuid in self._missing_refreshes if uuid in self.channel_temps}
+        drive_data = {uuid: self.drive_data[uuid] for uuid in self._missing_refreshes if uuid in self.drive_data}
+        alert_events = []
+        for device, task in zip(polled, tasks):
+            uuid = device.uuid
+            if task.cancelled() or task.exception() is not None:
+                # Keep the last-known values for this device only
+                reason = "deadline exceeded" if task.cancelled() else task.exception()
+                _LOGGER.warning("FireBoard refresh failed for %s: %s", uuid, reason)
+                self._device_stale_since.setdefault(uuid, dt_util.utcnow())
+                if uuid in self.channel_temps:
+                    channel_temps[uuid] = self.channel_temps[uuid]
+                if uuid in self.drive_data:
+                    drive_data[uuid] = self.drive_data[uuid]
+                continue
+            temps, drive, created = task.result()
+            self._device_stale_since.pop(uuid, None)
+            channel_temps[uuid] = temps
+            drive_data[uuid] = drive
+            if created is not None:
+                # New readings: record them and check alerts in the same pass
+                self._record_history(uuid, temps, created.timestamp())
+                alert_events.extend(self.alerts.evaluate(device, temps))
+            if uuid not in self._deferred:
+                self._check_empty_temps(device, temps)
+        # The api returns the cached object for an unchanged devices.json body
+        unchanged = (
+            previous[0] is self.devices
+            and previous[1:] == (self.stale_since, self._device_stale_since)
+            and channel_temps == self.channel_temps
+            and drive_data == self.drive_data
+            and allocations == self._allocation_values()
+        )
+        self.channel_temps = channel_temps
+        self.drive_data = drive_data
+        for event in alert_events:
+            # Fired before entities write state, so automations see the crossing first
+            self.hass.bus.async_fire(ALERT_EVENT, event)
+        self._notify_discovery(added + self._discover_drives(), removed)
+        self._schedule_next(calls_before, polled)
+        if unchanged:
+            # Nothing entities render can differ, so skip the estimates, diff and cache write
+            self.unchanged_refreshes += 1
+        else:
+            self._update_etas()
+            self._diff_values()
+            if self._store is not None:
+                self._store.async_delay_save(self._cache_data, CACHE_SAVE_DELAY)
+        self.profile.phase("process")
+        return {
+            "devices": self.devices,
+            "channel_temps": self.channel_temps,
+            "drive_data": self.drive_data
+        }
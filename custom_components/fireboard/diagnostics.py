@@ -1,7 +1,59 @@
-def async_get_diagnostics(hass, config_entry):
-    api = hass.data["fireboard"][config_entry.entry_id]
+from .const import DOMAIN
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+async def async_get_config_entry_diagnostics(hass, config_entry):
+    coordinator = hass.data[DOMAIN][f"coordinator_{config_entry.entry_id}"]
+    api = coordinator.api
+    limiter = api.limiter
+    blocked_until = limiter.blocked_until
+    rate = limiter.consumption_rate()
+    exhaustion_in = limiter.exhaustion_in(rate)
     return {
         "update_interval": api.update_interval,
-        "last_api_calls": [str(t) for t in getattr(api, '_call_times', [])],
-        "blocked_until": str(getattr(api, '_blocked_until', None)),
+        "current_interval": coordinator.update_interval.total_seconds(),
+        "rate_limit": {
+            "limit": limiter.limit,
+            "remaining": limiter.remaining(),
+            "next_token_in": round(limiter.next_token_in(), 1),
+            "total_calls": limiter.total_calls,
+            "calls_per_hour": round(rate, 1),
+            "exhausted_in": round(exhaustion_in) if exhaustion_in is not None else None,
+        },
+        "blocked_until": str(blocked_until) if blocked_until else None,
+        "refresh_requests": dict(coordinator.refresh_stats),
+        "unchanged_refreshes": coordinator.unchanged_refreshes,
+        "response_cache": {endpoint: dict(stats) for endpoint, stats in api.cache_stats.items()},
+        "refresh_profile": coordinator.profile.as_dict(),
+        "scheduler": {
+            "activity": coordinator.scheduler.activity,
+            "next_interval": round(coordinator.scheduler.interval, 1),
+            "calls_per_cycle": round(coordinator.scheduler.calls_per_cycle, 2),
+        },
+        "budget_allocation": coordinator.allocator.as_dict(),
+        "alerts": coordinator.alerts.as_dict(),
+        "standby": coordinator.standby.as_dict(),
+        "stale_since": str(coordinator.stale_since) if coordinator.stale_since else None,
+        "endpoints": {
+            endpoint: {
+                **breaker.as_dict(),
+                **api.endpoint_stats[endpoint].as_dict(),
+                "latency_p50": _round(api.latency[endpoint].percentile(0.5)),
+                "latency_p95": _round(api.latency[endpoint].percentile(0.95)),
+                "timeout": _round(api.latency[endpoint].timeout()),
+            }
+            for endpoint, breaker in api.breakers.items()
+        },
+        "upload_cadence": {
+            uuid: {
+                "cadence": round(cadence.cadence, 1) if cadence.cadence else None,
+                "last_created": str(cadence.last_created) if cadence.last_created else None,
+                "fetches": cadence.fetches,
+                "new_data": cadence.new_data,
+                "skipped": cadence.skipped,
+                "hit_rate": cadence.hit_rate,
+            }
+            for uuid, cadence in coordinator.cadence.items()
+        },
     }
@@ -0,0 +1,72 @@
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .const import DOMAIN
+
+@callback
+def async_remove_entities(hass, entities):
+    """Remove entities whose device or channel left the account, registry entries included.
+
+    Dropping the registry entry also removes the entity from Home Assistant;
+    entities that never got one are removed directly.
+    """
+    for entity in entities:
+        if entity.registry_entry is not None:
+            er.async_get(hass).async_remove(entity.entity_id)
+        else:
+            hass.async_create_task(entity.async_remove(force_remove=True))
+
+class FireBoardEntity(CoordinatorEntity):
+    """Coordinator entity that only writes state when its values changed.
+
+    Subclasses set ``_change_keys`` to the coordinator value keys they render.
+    Entities keep only the device uuid and read the latest DeviceSnapshot from
+    the coordinator, so device fields never go stale.
+    """
+
+    _change_keys = ()
+
+    def __init__(self, coordinator, device):
+        super().__init__(coordinator)
+        self._uuid = device.uuid
+        self._snapshot = device  # used once the device drops out of devices.json
+        self._last_available = None
+
+    @property
+    def _device(self):
+        return self.coordinator.device(self._uuid) or self._snapshot
+
+    @property
+    def device_info(self):
+        device = self._device
+        return {
+            "identifiers": {(DOMAIN, device.uuid, device.hardware_id)},
+            "name": device.title,
+            "model": device.model,
+            "manufacturer": "FireBoard",
+        }
+
+    @property
+    def _stale_key(self):
+        return (self._uuid, "stale")
+
+    def _staleness_attributes(self):
+        """Attributes marking values that are last-known rather than current."""
+        since = self.coordinator.stale_since_for(self._uuid)
+        if since is None:
+            return {}
+        return {"stale": True, "stale_since": since.isoformat()}
+
+    @property
+    def extra_state_attributes(self):
+        return self._staleness_attributes()
+
+    @callback
+    def _handle_coordinator_update(self):
+        available = self.available
+        keys = self._change_keys + (self._stale_key,)
+        if available == self._last_available and not self.coordinator.has_changed(keys):
+            return
+        self._last_available = available
+        self.coordinator.profile.entity_writes += 1
+        self.async_write_ha_state()
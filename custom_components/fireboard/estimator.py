@@ -0,0 +1,59 @@
+from collections import namedtuple
+from datetime import timedelta
+from .const import STALL_RATE, STALL_BAND
+
+CookEta = namedtuple("CookEta", "target minutes done_at stalled rate")
+
+def alert_target(channel, value, rate=None):
+    """Alert boundary a reading is heading for.
+
+    Outside the range that is the boundary it comes back through: temp_min from
+    below, temp_max from above. Below temp_max and rising (``rate`` in degrees
+    per minute), it is temp_max, the "done" temperature of a cook.
+    """
+    if value is None:
+        return None
+    for temp_min, temp_max in channel.alerts:
+        if temp_min is not None and value < temp_min:
+            return temp_min
+        if temp_max is not None and value > temp_max:
+            return temp_max
+        if temp_max is not None and value < temp_max and rate is not None and rate > 0:
+            return temp_max
+    return None
+
+def channel_target(channel, value, drive, rate=None):
+    """Target for a channel: its alert boundary, else the drive setpoint if it controls the drive."""
+    target = alert_target(channel, value, rate)
+    if target is None and drive and drive.tiedchannel == channel.channel:
+        setpoint = drive.setpoint
+        if setpoint and value is not None and value < setpoint:
+            target = setpoint
+    return target
+
+def estimate_etas(rows, now):
+    """Estimate time-to-target for every channel in one pass.
+
+    ``rows`` is a list of (key, history, target, degreetype). The least-squares
+    sums are already maintained by each ChannelHistory, so the whole batch is
+    solved column-wise in O(channels) once per refresh instead of per entity
+    state read. A probe whose trend is flat inside the stall band is reported
+    as stalled rather than given a meaningless ETA.
+    """
+    rows = [row for row in rows if row[2] is not None]
+    fits = [history.fit() for _, history, _, _ in rows]
+    etas = {}
+    for (key, _, target, degreetype), fitted in zip(rows, fits):
+        if fitted is None:
+            etas[key] = CookEta(target, None, None, False, None)
+            continue
+        slope, current = fitted
+        rate = slope * 60
+        low, high = STALL_BAND.get(degreetype, STALL_BAND[2])
+        stalled = abs(rate) < STALL_RATE and low <= current <= high and target > current
+        minutes = None
+        if not stalled and slope and (target - current) / slope >= 0:
+            minutes = (target - current) / slope / 60
+        done_at = now + timedelta(minutes=minutes) if minutes is not None else None
+        etas[key] = CookEta(target, minutes, done_at, stalled, rate)
+    return etas
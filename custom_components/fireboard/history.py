@@ -0,0 +1,115 @@
+from array import array
+from collections import deque
+
+class ChannelHistory:
+    """Ring buffer of (timestamp, temp) samples for one channel.
+
+    Samples live in two preallocated ``array('d')`` buffers, so memory is fixed
+    by ``capacity``. Rolling average and least-squares slope come from running
+    sums and min/max from monotonic deques, all updated as samples arrive or
+    leave the window instead of by rescanning the buffer.
+    """
+
+    __slots__ = (
+        "window", "capacity", "_times", "_values", "_head", "_count", "_seq", "_origin",
+        "_sum_t", "_sum_v", "_sum_tt", "_sum_tv", "_min", "_max",
+    )
+
+    def __init__(self, window, capacity):
+        self.window = window
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._head = 0  # index of the oldest sample
+        self._count = 0
+        self._seq = 0  # sequence number of the next sample
+        self._origin = None  # timestamps are stored relative to this for precision
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        self._min = deque()  # (seq, value), values increasing
+        self._max = deque()  # (seq, value), values decreasing
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def latest(self):
+        """Newest (timestamp, value), or None when empty."""
+        if not self._count:
+            return None
+        i = (self._head + self._count - 1) % self.capacity
+        return self._times[i] + self._origin, self._values[i]
+
+    def append(self, timestamp, value):
+        """Add a sample; returns False if it is not newer than the latest one."""
+        if self._origin is None:
+            self._origin = timestamp
+        t = timestamp - self._origin
+        if self._count and t <= self._times[(self._head + self._count - 1) % self.capacity]:
+            return False
+        while self._count and (self._count == self.capacity or t - self._times[self._head] > self.window):
+            self._evict()
+        i = (self._head + self._count) % self.capacity
+        self._times[i] = t
+        self._values[i] = value
+        self._count += 1
+        self._sum_t += t
+        self._sum_v += value
+        self._sum_tt += t * t
+        self._sum_tv += t * value
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((self._seq, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((self._seq, value))
+        self._seq += 1
+        return True
+
+    def _evict(self):
+        t = self._times[self._head]
+        value = self._values[self._head]
+        oldest_seq = self._seq - self._count
+        self._head = (self._head + 1) % self.capacity
+        self._count -= 1
+        self._sum_t -= t
+        self._sum_v -= value
+        self._sum_tt -= t * t
+        self._sum_tv -= t * value
+        if self._min[0][0] == oldest_seq:
+            self._min.popleft()
+        if self._max[0][0] == oldest_seq:
+            self._max.popleft()
+        if not self._count:
+            # Reset the sums so float error does not accumulate across cooks
+            self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+
+    @property
+    def minimum(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maximum(self):
+        return self._max[0][1] if self._max else None
+
+    @property
+    def average(self):
+        return self._sum_v / self._count if self._count else None
+
+    def fit(self):
+        """Least-squares (slope per second, intercept at the newest sample), or None."""
+        n = self._count
+        if n < 2:
+            return None
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        slope = (n * self._sum_tv - self._sum_t * self._sum_v) / denominator
+        intercept = (self._sum_v - slope * self._sum_t) / n
+        newest = self._times[(self._head + n - 1) % self.capacity]
+        return slope, intercept + slope * newest
+
+    @property
+    def rate(self):
+        """Rate of change in degrees per minute over the window."""
+        fitted = self.fit()
+        return fitted[0] * 60 if fitted else None
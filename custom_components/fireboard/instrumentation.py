@@ -0,0 +1,90 @@
+import time
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REFRESH_PHASES = ("devices", "per_device", "process", "total")
+
+class EndpointStats:
+    """Request counts, latency histogram, bytes received and JSON decode time for one endpoint."""
+
+    __slots__ = ("requests", "errors", "bytes", "decodes", "decode_seconds", "buckets")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.decodes = 0
+        self.decode_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # the last one is for slower requests
+
+    def record_request(self, seconds, error=False):
+        self.requests += 1
+        if error:
+            self.errors += 1
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                break
+        else:
+            index = len(LATENCY_BUCKETS)
+        self.buckets[index] += 1
+
+    def record_body(self, size):
+        self.bytes += size
+
+    def record_decode(self, seconds):
+        self.decodes += 1
+        self.decode_seconds += seconds
+
+    def as_dict(self):
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes_received": self.bytes,
+            "decodes": self.decodes,
+            "decode_ms_avg": round(self.decode_seconds * 1000 / self.decodes, 3) if self.decodes else None,
+            "latency_histogram": dict(zip(labels, self.buckets)),
+        }
+
+class RefreshProfile:
+    """Refresh duration by phase and entity state writes per refresh."""
+
+    def __init__(self):
+        self.refreshes = 0
+        self.last = {}  # phase: seconds in the latest refresh
+        self.totals = dict.fromkeys(REFRESH_PHASES, 0.0)
+        self.entity_writes = 0  # writes since the latest refresh started
+        self.last_entity_writes = None  # writes that followed the previous refresh
+        self._started = None
+        self._mark = None
+
+    def start(self):
+        if self._started is not None:
+            self.last_entity_writes = self.entity_writes
+        self.entity_writes = 0
+        self._started = self._mark = time.perf_counter()
+        self.last = {}
+
+    def phase(self, name):
+        """Close the phase running since the previous mark."""
+        now = time.perf_counter()
+        self.last[name] = now - self._mark
+        self.totals[name] += now - self._mark
+        self._mark = now
+
+    def finish(self):
+        self.last["total"] = time.perf_counter() - self._started
+        self.totals["total"] += self.last["total"]
+        self.refreshes += 1
+
+    def as_dict(self):
+        return {
+            "refreshes": self.refreshes,
+            "last_ms": {phase: round(seconds * 1000, 2) for phase, seconds in self.last.items()},
+            "avg_ms": {
+                phase: round(total * 1000 / self.refreshes, 2) if self.refreshes else None
+                for phase, total in self.totals.items()
+            },
+            "entity_writes_last_refresh": self.last_entity_writes,
+        }
@@ -0,0 +1,118 @@
+from collections import deque
+from datetime import datetime, timezone
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Limiters live for the lifetime of the process so every client for an account
+# (config entries, config-flow validation, reloads) draws on the same budget.
+_LIMITERS = {}
+
+class FireBoardRateLimitError(RuntimeError):
+    """Raised when a call would exceed the hourly budget."""
+
+class FireBoardRateLimiter:
+    """Sliding one-hour window of API calls with constant-time admission.
+
+    Only the last ``limit`` call times are kept: the window is full exactly when
+    the oldest of them is still inside it, so admission checks a single entry.
+    """
+
+    def __init__(self, limit, window=3600, block_seconds=1800):
+        self.limit = limit
+        self.window = window
+        self.block_seconds = block_seconds
+        self._calls = deque(maxlen=limit)
+        self._blocked_until = None
+        self.total_calls = 0
+
+    @property
+    def blocked_until(self):
+        if self._blocked_until is None:
+            return None
+        return datetime.fromtimestamp(self._blocked_until, timezone.utc)
+
+    def acquire(self, now=None):
+        """Admit one call or raise RuntimeError when the budget is exhausted."""
+        now = time.time() if now is None else now
+        if self._blocked_until is not None:
+            if now < self._blocked_until:
+                raise FireBoardRateLimitError(f"API rate limit exceeded. Blocked until {self.blocked_until}.")
+            self._blocked_until = None
+        if len(self._calls) == self.limit and now - self._calls[0] < self.window:
+            self._blocked_until = now + self.block_seconds
+            _LOGGER.error("FireBoard API rate limit exceeded. Blocking calls for %d minutes.", self.block_seconds // 60)
+            raise FireBoardRateLimitError(f"API rate limit exceeded. Blocked until {self.blocked_until}.")
+        self._calls.append(now)
+        self.total_calls += 1
+
+    def _prune(self, now):
+        while self._calls and now - self._calls[0] >= self.window:
+            self._calls.popleft()
+
+    def remaining(self, now=None):
+        """Calls that can still be made in the current window."""
+        now = time.time() if now is None else now
+        if self._blocked_until is not None and now < self._blocked_until:
+            return 0
+        self._prune(now)
+        return self.limit - len(self._calls)
+
+    def next_token_in(self, count=1, now=None):
+        """Seconds until ``count`` calls would be admitted (0 if they are available now)."""
+        now = time.time() if now is None else now
+        if self._blocked_until is not None and now < self._blocked_until:
+            return self._blocked_until - now
+        self._prune(now)
+        missing = count - (self.limit - len(self._calls))
+        if missing <= 0:
+            return 0
+        # The missing calls come back as the oldest ones leave the window
+        return self._calls[min(missing, len(self._calls)) - 1] + self.window - now
+
+    def consumption_rate(self, period=600, now=None):
+        """Calls per hour over the last ``period`` seconds."""
+        now = time.time() if now is None else now
+        recent = 0
+        for called in reversed(self._calls):
+            if now - called > period:
+                break
+            recent += 1
+        return recent * 3600 / period
+
+    def exhaustion_in(self, rate, now=None):
+        """Seconds until the window fills at ``rate`` calls per hour, or None if that rate is sustainable."""
+        now = time.time() if now is None else now
+        if self._blocked_until is not None and now < self._blocked_until:
+            return 0
+        if rate * self.window / 3600 < self.limit:
+            return None
+        self._prune(now)
+        per_second = rate / 3600
+        # Calls leaving the window free budget while the new ones spend it
+        dropped = 0
+        seconds = (self.limit - len(self._calls)) / per_second
+        while dropped < len(self._calls) and self._calls[dropped] + self.window - now <= seconds:
+            dropped += 1
+            seconds = (self.limit - len(self._calls) + dropped) / per_second
+        return seconds
+
+    def as_dict(self):
+        return {"calls": list(self._calls), "blocked_until": self._blocked_until}
+
+    def restore(self, data):
+        """Merge call times saved by a previous run into the window."""
+        calls = sorted(set(self._calls).union(data.get("calls") or []))
+        self._calls = deque(calls[-self.limit:], maxlen=self.limit)
+        blocked_until = data.get("blocked_until")
+        if blocked_until and (self._blocked_until is None or blocked_until > self._blocked_until):
+            self._blocked_until = blocked_until
+
+def get_rate_limiter(account, limit):
+    """Return the process-wide limiter for a FireBoard account."""
+    key = (account or "").strip().lower()
+    limiter = _LIMITERS.get(key)
+    if limiter is None:
+        limiter = _LIMITERS[key] = FireBoardRateLimiter(limit)
+    return limiter
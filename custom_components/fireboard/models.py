@@ -0,0 +1,222 @@
+import json
+from homeassistant.util import dt as dt_util
+
+try:
+    import orjson
+except ImportError:  # orjson ships with Home Assistant, but is not required
+    orjson = None
+
+def loads(body):
+    """Decode a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def parse_created(value):
+    if not value:
+        return None
+    return dt_util.parse_datetime(value)
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+class ChannelReading:
+    """One probe channel: its configuration and the latest embedded reading."""
+
+    __slots__ = ("channel", "id", "label", "color_hex", "enabled", "alerts", "temp", "created")
+
+    def __init__(self, channel, id, label, color_hex, enabled, alerts, temp=None, created=None):
+        self.channel = channel
+        self.id = id
+        self.label = label
+        self.color_hex = color_hex
+        self.enabled = enabled
+        self.alerts = alerts  # ((temp_min, temp_max), ...) of the enabled alerts
+        self.temp = temp
+        self.created = created
+
+    def as_dict(self):
+        return {
+            "channel": self.channel,
+            "id": self.id,
+            "channel_label": self.label,
+            "color_hex": self.color_hex,
+            "enabled": self.enabled,
+            "alerts": [{"temp_min": low, "temp_max": high} for low, high in self.alerts],
+        }
+
+class DriveState:
+    """The drive fields the integration renders or schedules on."""
+
+    __slots__ = ("driveper", "setpoint", "lidpaused", "tiedchannel", "modetype", "created")
+
+    def __init__(self, driveper, setpoint, lidpaused, tiedchannel, modetype, created):
+        self.driveper = driveper
+        self.setpoint = setpoint
+        self.lidpaused = lidpaused
+        self.tiedchannel = tiedchannel
+        self.modetype = modetype
+        self.created = created
+
+    def __eq__(self, other):
+        if not isinstance(other, DriveState):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def as_dict(self):
+        return {
+            "driveper": self.driveper,
+            "setpoint": self.setpoint,
+            "lidpaused": self.lidpaused,
+            "tiedchannel": self.tiedchannel,
+            "modetype": self.modetype,
+            "created": _isoformat(self.created),
+        }
+
+class DeviceSnapshot:
+    """Compact view of a devices.json entry; device_log, probe config and versions are dropped."""
+
+    __slots__ = (
+        "uuid", "id", "title", "model", "model_name", "hardware_id", "degreetype", "battery",
+        "last_templog", "channels", "temps", "temps_created", "has_drivelog", "drive", "session_id",
+    )
+
+    def __init__(self, uuid, id, title, model, model_name, hardware_id, degreetype, battery,
+                 last_templog, channels, temps, temps_created, has_drivelog, drive, session_id=None):
+        self.uuid = uuid
+        self.id = id
+        self.title = title
+        self.model = model
+        self.model_name = model_name
+        self.hardware_id = hardware_id
+        self.degreetype = degreetype
+        self.battery = battery
+        self.last_templog = last_templog
+        self.channels = channels  # tuple of ChannelReading
+        self.temps = temps  # {channel: temp} of the embedded readings, None if there are none
+        self.temps_created = temps_created
+        self.has_drivelog = has_drivelog  # False when devices.json omits last_drivelog entirely
+        self.drive = drive  # DriveState, or None when the device has no drive
+        self.session_id = session_id  # cook session the channels are logging to
+
+    def channel(self, number):
+        for channel in self.channels:
+            if channel.channel == number:
+                return channel
+        return None
+
+    def as_dict(self):
+        """devices.json-shaped dict holding only the kept fields; parse_device reads it back."""
+        data = {
+            "uuid": self.uuid,
+            "id": self.id,
+            "title": self.title,
+            "model": self.model,
+            "model_name": self.model_name,
+            "hardware_id": self.hardware_id,
+            "degreetype": self.degreetype,
+            "last_battery_reading": self.battery,
+            "last_templog": _isoformat(self.last_templog),
+            "sessionid": self.session_id,
+            "channels": [channel.as_dict() for channel in self.channels],
+            "latest_temps": [
+                {"channel": channel.channel, "temp": channel.temp, "created": _isoformat(channel.created)}
+                for channel in self.channels if self.temps and channel.channel in self.temps
+            ],
+        }
+        if self.has_drivelog:
+            data["last_drivelog"] = self.drive.as_dict() if self.drive else None
+        return data
+
+def parse_drive(data):
+    """DriveState from drivelog.json or an embedded last_drivelog; None when there is no drive."""
+    if not data:
+        return None
+    lidpaused = data.get("lidpaused")
+    if "lidpaused" not in data:
+        # Lid state is only present inside the raw drive payload
+        try:
+            lidpaused = json.loads(data.get("jsonraw") or "{}").get("lidPaused")
+        except ValueError:
+            lidpaused = None
+    return DriveState(
+        data.get("driveper"),
+        data.get("setpoint"),
+        lidpaused,
+        data.get("tiedchannel"),
+        data.get("modetype"),
+        parse_created(data.get("created")),
+    )
+
+def _chart_time(value):
+    if isinstance(value, (int, float)):
+        # Chart points carry epoch seconds or milliseconds
+        return dt_util.utc_from_timestamp(value / 1000 if value > 1e11 else value)
+    return parse_created(value)
+
+def parse_chart(series):
+    """Yield (created, channel, temp) from session chart series, one channel at a time.
+
+    A series holds either parallel ``x``/``y`` lists or ``data`` as [{"x", "y"}].
+    """
+    for line in series:
+        channel = line.get("channel")
+        if "data" in line:
+            points = ((point.get("x"), point.get("y")) for point in line["data"])
+        else:
+            points = zip(line.get("x") or (), line.get("y") or ())
+        for x, y in points:
+            created = _chart_time(x)
+            if created is not None and isinstance(y, (int, float)):
+                yield created, channel, y
+
+def _parse_alerts(alerts):
+    return tuple(
+        (alert.get("temp_min"), alert.get("temp_max"))
+        for alert in alerts or [] if alert.get("enabled", True)
+    )
+
+def parse_device(data):
+    readings = data.get("latest_temps")
+    if not readings:
+        # Fall back to per-channel last_templog records
+        readings = [
+            ch["last_templog"] for ch in data.get("channels", [])
+            if isinstance(ch.get("last_templog"), dict)
+        ]
+    latest = {r["channel"]: r for r in readings or [] if "channel" in r}
+    channels = []
+    for ch in data.get("channels", []):
+        reading = latest.get(ch.get("channel")) or {}
+        channels.append(ChannelReading(
+            ch.get("channel"),
+            ch.get("id"),
+            ch.get("channel_label"),
+            ch.get("color_hex"),
+            ch.get("enabled"),
+            _parse_alerts(ch.get("alerts")),
+            reading.get("temp"),
+            parse_created(reading.get("created")),
+        ))
+    created = [parse_created(r.get("created")) for r in latest.values()]
+    session_ids = [ch["sessionid"] for ch in data.get("channels", []) if ch.get("sessionid")]
+    return DeviceSnapshot(
+        data.get("uuid"),
+        data.get("id"),
+        data.get("title"),
+        data.get("model"),
+        data.get("model_name", data.get("model")),
+        data.get("hardware_id"),
+        data.get("degreetype", 2),
+        data.get("last_battery_reading"),
+        parse_created(data.get("last_templog")),
+        tuple(channels),
+        {channel: r.get("temp") for channel, r in latest.items()} if latest else None,
+        max((c for c in created if c), default=None),
+        "last_drivelog" in data,
+        parse_drive(data.get("last_drivelog")),
+        data.get("sessionid") or max(session_ids, default=None),
+    )
+
+def parse_devices(data):
+    return [parse_device(device) for device in data]
@@ -0,0 +1,235 @@
+from datetime import timedelta
+import logging
+import math
+import time
+from .const import (
+    MAX_UPDATE_INTERVAL,
+    ACTIVITY_FAST_RATE,
+    ACTIVITY_FLAT_RATE,
+    BUDGET_RESERVE,
+    UPLOAD_LAG,
+    MIN_DEVICE_BUDGET_SHARE,
+    DEVICE_CREDIT_CAP,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ACTIVITY_ACTIVE = "active"
+ACTIVITY_NORMAL = "normal"
+ACTIVITY_IDLE = "idle"
+# Multiplier applied to the configured interval for each activity level
+ACTIVITY_FACTORS = {ACTIVITY_ACTIVE: 0.5, ACTIVITY_NORMAL: 1.0, ACTIVITY_IDLE: 2.0}
+
+PRIORITY_PINNED = "pinned"
+PRIORITY_DRIVE = "drive"
+PRIORITY_FAST = "fast"
+PRIORITY_NORMAL = "normal"
+PRIORITY_IDLE = "idle"
+# Relative share of the per-device budget for each device priority
+PRIORITY_WEIGHTS = {
+    PRIORITY_PINNED: 8.0,
+    PRIORITY_DRIVE: 4.0,
+    PRIORITY_FAST: 2.0,
+    PRIORITY_NORMAL: 1.0,
+    PRIORITY_IDLE: 0.25,
+}
+
+def drive_active(drive):
+    """True when a drive is running (modetype not Off) or its fan is moving."""
+    if not drive:
+        return False
+    modetype = drive.modetype
+    return modetype not in (None, 0, "Off") or bool(drive.driveper)
+
+def classify_activity(max_rate, any_drive_active, any_lid_open):
+    """Activity level from the fastest probe rate (degrees/min) and drive state."""
+    if any_lid_open:
+        return ACTIVITY_IDLE
+    if any_drive_active or (max_rate is not None and max_rate >= ACTIVITY_FAST_RATE):
+        return ACTIVITY_ACTIVE
+    if max_rate is None or max_rate < ACTIVITY_FLAT_RATE:
+        return ACTIVITY_IDLE
+    return ACTIVITY_NORMAL
+
+def device_priority(pinned, drive, max_rate):
+    """Priority of one device from the user pin, its drive and its fastest probe rate."""
+    if pinned:
+        return PRIORITY_PINNED
+    if drive_active(drive):
+        return PRIORITY_DRIVE
+    if max_rate is None:
+        return PRIORITY_NORMAL
+    if max_rate >= ACTIVITY_FAST_RATE:
+        return PRIORITY_FAST
+    if max_rate < ACTIVITY_FLAT_RATE:
+        return PRIORITY_IDLE
+    return PRIORITY_NORMAL
+
+class DeviceAllocation:
+    """One device's share of the per-device budget and the credit it has saved up."""
+
+    __slots__ = ("priority", "share", "credit", "demand", "fetches", "deferred")
+
+    def __init__(self):
+        self.priority = PRIORITY_NORMAL
+        self.share = 0.0  # per-device calls per hour
+        self.credit = float(DEVICE_CREDIT_CAP)  # a new device is fetched right away
+        self.demand = 0  # requests its last fetch needed, known after the first fetch
+        self.fetches = 0
+        self.deferred = 0
+
+    def as_dict(self, budget):
+        return {
+            "priority": self.priority,
+            "budget_share": round(100 * self.share / budget) if budget else 0,
+            "calls_per_hour": round(self.share, 1),
+            # Seconds between per-device fetches; None when devices.json has everything
+            "fetch_interval": round(self.demand * 3600 / self.share) if self.demand and self.share else None,
+            "fetches": self.fetches,
+            "deferred": self.deferred,
+        }
+
+class FairShareAllocator:
+    """Split the hourly per-device call budget across devices in proportion to priority.
+
+    Each device earns credit at its share of the budget and spends one credit per
+    temps.json or drivelog.json request, so an idle device is fetched every few
+    refreshes while a device with a running drive is fetched on every one.
+    """
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.allocations = {}  # uuid: DeviceAllocation
+        self.budget = 0.0  # per-device calls per hour being shared
+        self._updated = None
+
+    def update(self, priorities, shared_calls_per_hour, now=None):
+        """Re-split the budget; ``priorities`` maps each polled device to its priority.
+
+        ``shared_calls_per_hour`` is what devices.json costs at the current interval.
+        """
+        now = time.monotonic() if now is None else now
+        hours = (now - self._updated) / 3600 if self._updated is not None else 0.0
+        self._updated = now
+        for uuid in self.allocations.keys() - priorities.keys():
+            del self.allocations[uuid]
+        spendable = self.limiter.limit - BUDGET_RESERVE
+        self.budget = max(spendable - shared_calls_per_hour, spendable * MIN_DEVICE_BUDGET_SHARE)
+        for uuid, priority in priorities.items():
+            allocation = self.allocations.get(uuid)
+            if allocation is None:
+                allocation = self.allocations[uuid] = DeviceAllocation()
+            allocation.priority = priority
+        # Devices served from devices.json alone spend nothing, so they take no share
+        weights = {uuid: PRIORITY_WEIGHTS[a.priority] for uuid, a in self.allocations.items() if a.demand}
+        total = sum(weights.values())
+        for uuid, allocation in self.allocations.items():
+            allocation.share = self.budget * weights[uuid] / total if uuid in weights else 0.0
+            allocation.credit = min(allocation.credit + allocation.share * hours, DEVICE_CREDIT_CAP)
+
+    def admit(self, uuid, calls):
+        """Spend credit for ``calls`` per-device requests; False defers them to a later refresh."""
+        allocation = self.allocations.get(uuid)
+        if allocation is None:
+            return True
+        allocation.demand = calls
+        if not calls:
+            return True
+        if allocation.credit < calls:
+            allocation.deferred += 1
+            return False
+        allocation.credit -= calls
+        allocation.fetches += 1
+        return True
+
+    def allocation(self, uuid):
+        """Attributes describing a device's allocation, empty when it is not polled."""
+        allocation = self.allocations.get(uuid)
+        return allocation.as_dict(self.budget) if allocation is not None else {}
+
+    def as_dict(self):
+        return {
+            "budget_calls_per_hour": round(self.budget, 1),
+            "devices": {uuid: a.as_dict(self.budget) for uuid, a in self.allocations.items()},
+        }
+
+class FireBoardPollScheduler:
+    """Pick the next poll interval from the remaining hourly budget and cook activity."""
+
+    def __init__(self, base_interval, limiter):
+        self.base_interval = base_interval
+        self.limiter = limiter
+        self.calls_per_cycle = 1.0  # smoothed calls spent per refresh
+        self.activity = ACTIVITY_NORMAL
+        self.interval = float(base_interval)
+
+    def record_cycle(self, calls, expected_calls):
+        """Track calls spent by the last refresh; expected_calls covers newly enabled devices."""
+        self.calls_per_cycle = 0.7 * self.calls_per_cycle + 0.3 * max(calls, 1)
+        return max(self.calls_per_cycle, expected_calls)
+
+    def next_interval(self, calls_per_cycle, activity, cadences=(), now=None):
+        """Seconds until the next refresh; ``cadences`` align it just after an expected upload."""
+        self.activity = activity
+        # Never poll faster than the remaining budget can sustain for a full window
+        spendable = self.limiter.remaining() - BUDGET_RESERVE
+        budget_interval = calls_per_cycle * self.limiter.window / max(spendable, calls_per_cycle)
+        interval = max(self.base_interval * ACTIVITY_FACTORS[activity], budget_interval)
+        interval = min(interval, max(MAX_UPDATE_INTERVAL, self.base_interval))
+        delays = [d for d in (c.delay_until_upload(now, interval) for c in cadences) if d is not None]
+        if delays:
+            interval = min(delays)
+        if spendable < calls_per_cycle:
+            # Wait for enough calls to leave the window instead of tripping the block
+            needed = int(calls_per_cycle + 0.999) + BUDGET_RESERVE
+            interval = max(interval, self.limiter.next_token_in(needed) + 1)
+        self.interval = interval
+        return interval
+
+class UploadCadence:
+    """Learn a device's upload cadence from successive ``created`` timestamps."""
+
+    def __init__(self):
+        self.last_created = None
+        self.cadence = None  # smoothed seconds between uploads
+        self.fetches = 0
+        self.new_data = 0
+        self.skipped = 0
+
+    def observe(self, created):
+        """Record the newest reading seen by a fetch; return True if it was new."""
+        self.fetches += 1
+        if created is None or (self.last_created is not None and created <= self.last_created):
+            return False
+        if self.last_created is not None:
+            delta = (created - self.last_created).total_seconds()
+            # A gap longer than the slowest poll is an outage, not the cadence
+            if delta <= MAX_UPDATE_INTERVAL:
+                self.cadence = delta if self.cadence is None else 0.7 * self.cadence + 0.3 * delta
+        self.last_created = created
+        self.new_data += 1
+        return True
+
+    def next_upload(self):
+        if self.last_created is None or not self.cadence:
+            return None
+        return self.last_created + timedelta(seconds=self.cadence)
+
+    def expects_new_data(self, now):
+        """False while a fetch would only return the reading already seen."""
+        expected = self.next_upload()
+        return expected is None or now >= expected
+
+    def delay_until_upload(self, now, earliest):
+        """Seconds from now to just after the first expected upload at least ``earliest`` seconds away."""
+        expected = self.next_upload()
+        if expected is None:
+            return None
+        target = (expected - now).total_seconds() + UPLOAD_LAG
+        if target < earliest:
+            target += math.ceil((earliest - target) / self.cadence) * self.cadence
+        return target
+
+    @property
+    def hit_rate(self):
+        return round(self.new_data / self.fetches, 3) if self.fetches else None
@@ -1,54 +1,79 @@
 from homeassistant.helpers.entity import Entity
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.components.binary_sensor import BinarySensorEntity
-from homeassistant.components.number import NumberEntity
-from .const import DOMAIN
-from .coordinator import FireBoardCoordinator
+from .const import DOMAIN, CONF_DIAGNOSTIC_SENSORS
+from .entity import FireBoardEntity, async_remove_entities
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
-    api = hass.data[DOMAIN][entry.entry_id]
-    update_interval = getattr(api, 'update_interval', 18)
-    coordinator = FireBoardCoordinator(hass, api, update_interval)
-    await coordinator.async_config_entry_first_refresh()
-    entities = []
-    try:
-        for device in coordinator.devices:
-            uuid = device.get("uuid")
-            for channel in device.get("channels", []):
-                entities.append(FireBoardChannelSensor(coordinator, device, channel))
-            entities.append(FireBoardBatterySensor(coordinator, device))
-            # Add drive data sensors if drive data is present
-            drive_data = coordinator.drive_data.get(uuid)
-            if drive_data:
-                entities.append(FireBoardDrivePercentSensor(coordinator, device))
-                entities.append(FireBoardDriveSetpointSensor(coordinator, device))
-                entities.append(FireBoardDriveLidPausedSensor(coordinator, device))
-                entities.append(FireBoardDriveControlChannelSensor(coordinator, device))
-    except Exception as e:
-        _LOGGER.error("FireBoard async_setup_entry failed: %s", e)
-    async_add_entities(entities)
-
-class FireBoardChannelSensor(CoordinatorEntity, Entity):
+    # Shared coordinator created and first refreshed in __init__.async_setup_entry
+    coordinator = hass.data[DOMAIN][f"coordinator_{entry.entry_id}"]
+    tracked = {}  # entity key: entities created for it
+
+    def entities_for(key):
+        kind, uuid = key[0], key[1]
+        device = coordinator.device(uuid)
+        if kind == "channel":
+            channel = coordinator.channel(uuid, key[2])
+            return [
+                FireBoardChannelSensor(coordinator, device, channel),
+                FireBoardChannelEtaSensor(coordinator, device, channel),
+            ]
+        if kind == "drive":
+            return [
+                FireBoardDrivePercentSensor(coordinator, device),
+                FireBoardDriveSetpointSensor(coordinator, device),
+                FireBoardDriveLidPausedSensor(coordinator, device),
+                FireBoardDriveControlChannelSensor(coordinator, device),
+            ]
+        return [FireBoardBatterySensor(coordinator, device)]
+
+    @callback
+    def async_discovered(added, removed):
+        entities = []
+        for key in added:
+            try:
+                tracked[key] = entities_for(key)
+            except Exception as e:
+                _LOGGER.error("FireBoard could not create entities for %s: %s", key, e)
+                continue
+            entities.extend(tracked[key])
+        if entities:
+            async_add_entities(entities)
+        for key in removed:
+            async_remove_entities(hass, tracked.pop(key, ()))
+
+    # Devices, channels and drives that appear later are added without a reload
+    async_discovered(coordinator.entity_keys(), ())
+    entry.async_on_unload(coordinator.register_discovery(async_discovered))
+    if entry.options.get(CONF_DIAGNOSTIC_SENSORS, False):
+        async_add_entities([
+            FireBoardDiagnosticSensor(coordinator, entry, key, name, unit, icon, value)
+            for key, name, unit, icon, value in DIAGNOSTIC_SENSORS
+        ])
+
+class FireBoardChannelSensor(FireBoardEntity, Entity):
     def __init__(self, coordinator, device, channel):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device)
         self.coordinator = coordinator
-        self._device = device
-        self._channel = channel
-        model = device.get("model")
-        channel_label = channel.get("channel_label")
-        channel_num = channel.get("channel")
-        hardware_id = device.get("hardware_id")
-        if model in ("FBX11", "FBX2", "FBX2D") and channel_label:
+        self._channel_id = channel.id
+        self._channel_num = channel.channel
+        self._channel_snapshot = channel
+        channel_label = channel.label
+        channel_num = channel.channel
+        if device.model in ("FBX11", "FBX2", "FBX2D") and channel_label:
             self._attr_name = f"Ch {channel_num}: {channel_label}"
         else:
-            self._attr_name = f"{device['title']} {channel_label or channel_num}"
+            self._attr_name = f"{device.title} {channel_label or channel_num}"
         # entity_id: ch_<channel>_<hardware_id>
-        self.entity_id = f"sensor.ch_{channel_num}_{hardware_id}"
-        self._attr_unique_id = f"{device['uuid']}_ch{channel.get('id')}"
-        self._degreetype = device.get("degreetype", 2)  # 1 = C, 2 = F
+        self.entity_id = f"sensor.ch_{channel_num}_{device.hardware_id}"
+        self._attr_unique_id = f"{device.uuid}_ch{channel.id}"
+        self._change_keys = ((device.uuid, "channel", channel_num),)
+        self._degreetype = device.degreetype  # 1 = C, 2 = F
 
     @property
     def name(self):
@@ -58,33 +83,44 @@ class FireBoardChannelSensor(CoordinatorEntity, Entity):
     def unique_id(self):
         return self._attr_unique_id
 
+    @property
+    def _channel(self):
+        return self.coordinator.channel(self._uuid, self._channel_id) or self._channel_snapshot
+
     @property
     def state(self):
-        temps = self.coordinator.channel_temps.get(self._device["uuid"], {})
-        value = temps.get(self._channel.get("channel"))
+        temps = self.coordinator.channel_temps.get(self._uuid, {})
+        value = temps.get(self._channel_num)
         if value is None:
             return "--"
         return value
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._device["uuid"], self._device.get("hardware_id"))},
-            "name": self._device["title"],
-            "model": self._device["model"],
-            "manufacturer": "FireBoard",
-        }
 
     @property
     def extra_state_attributes(self):
-        return {
-            "channel_label": self._channel.get("channel_label"),
-            "color_hex": self._channel.get("color_hex"),
-            "enabled": self._channel.get("enabled"),
+        channel = self._channel
+        attributes = {
+            "channel_label": channel.label,
+            "color_hex": channel.color_hex,
+            "enabled": channel.enabled,
             "state_class": "measurement",
             "device_class": "temperature",
             "icon": "mdi:thermometer",
         }
+        history = self.coordinator.channel_history(self._uuid, self._channel_num)
+        if history:
+            rate = history.rate
+            eta = self.coordinator.channel_eta(self._uuid, self._channel_num)
+            time_to_target = eta.minutes if eta else None
+            attributes.update({
+                "rate_of_change": round(rate, 2) if rate is not None else "--",
+                "rolling_min": history.minimum,
+                "rolling_max": history.maximum,
+                "rolling_avg": round(history.average, 1),
+                "time_to_target": round(time_to_target, 1) if time_to_target is not None else "--",
+            })
+        attributes.update(self._staleness_attributes())
+        return attributes
 
     @property
     def state_class(self):
@@ -103,15 +139,68 @@ class FireBoardChannelSensor(CoordinatorEntity, Entity):
         return "°C" if self._degreetype == 1 else "°F"
 
     async def async_update(self):
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_coalesced_refresh()
+
+class FireBoardChannelEtaSensor(FireBoardEntity, Entity):
+    def __init__(self, coordinator, device, channel):
+        super().__init__(coordinator, device)
+        self.coordinator = coordinator
+        channel_num = self._channel_num = channel.channel
+        self._attr_name = f"{device.title} {channel.label or channel_num} Done At"
+        self.entity_id = f"sensor.ch_{channel_num}_{device.hardware_id}_eta"
+        self._attr_unique_id = f"{device.uuid}_ch{channel.id}_eta"
+        self._change_keys = ((device.uuid, "eta", channel_num),)
+        self._degreetype = device.degreetype
+
+    @property
+    def name(self):
+        return self._attr_name
+
+    @property
+    def unique_id(self):
+        return self._attr_unique_id
+
+    @property
+    def _eta(self):
+        return self.coordinator.channel_eta(self._uuid, self._channel_num)
+
+    @property
+    def state(self):
+        eta = self._eta
+        if eta is None or eta.done_at is None:
+            return "--"
+        return eta.done_at.replace(second=0, microsecond=0).isoformat()
+
+    @property
+    def device_class(self):
+        return "timestamp"
+
+    @property
+    def icon(self):
+        return "mdi:timer-sand"
+
+    @property
+    def extra_state_attributes(self):
+        eta = self._eta
+        if eta is None:
+            return {"target": "--", "minutes_remaining": "--", "stalled": False, **self._staleness_attributes()}
+        return {
+            "target": eta.target if eta.target is not None else "--",
+            "target_unit": "°C" if self._degreetype == 1 else "°F",
+            "minutes_remaining": round(eta.minutes) if eta.minutes is not None else "--",
+            "stalled": eta.stalled,
+            "rate_of_change": round(eta.rate, 2) if eta.rate is not None else "--",
+            **self._staleness_attributes(),
+        }
+
 
-class FireBoardBatterySensor(CoordinatorEntity, Entity):
+class FireBoardBatterySensor(FireBoardEntity, Entity):
     def __init__(self, coordinator, device):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device)
         self.coordinator = coordinator
-        self._device = device
-        self._attr_name = f"{device['title']} Battery"
-        self._attr_unique_id = f"{device['uuid']}_battery"
+        self._attr_name = f"{device.title} Battery"
+        self._attr_unique_id = f"{device.uuid}_battery"
+        self._change_keys = ((device.uuid, "battery"),)
 
     @property
     def name(self):
@@ -123,7 +212,7 @@ class FireBoardBatterySensor(CoordinatorEntity, Entity):
 
     @property
     def state(self):
-        value = self._device.get("last_battery_reading")
+        value = self._device.battery
         if value is None:
             return None
         try:
@@ -132,14 +221,6 @@ class FireBoardBatterySensor(CoordinatorEntity, Entity):
         except Exception:
             return None
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._device["uuid"], self._device.get("hardware_id"))} ,
-            "name": self._device["title"],
-            "model": self._device["model"],
-            "manufacturer": "FireBoard",
-        }
 
     @property
     def state_class(self):
@@ -185,13 +266,13 @@ class FireBoardBatterySensor(CoordinatorEntity, Entity):
         else:
             return "mdi:battery-outline"
 
-class FireBoardDrivePercentSensor(CoordinatorEntity, Entity):
+class FireBoardDrivePercentSensor(FireBoardEntity, Entity):
     def __init__(self, coordinator, device):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device)
         self.coordinator = coordinator
-        self._device = device
-        self._attr_name = f"{device['title']} Drive %"
-        self._attr_unique_id = f"{device['uuid']}_drive_per"
+        self._attr_name = f"{device.title} Drive %"
+        self._attr_unique_id = f"{device.uuid}_drive_per"
+        self._change_keys = ((device.uuid, "drive", "driveper"),)
 
     @property
     def name(self):
@@ -203,9 +284,7 @@ class FireBoardDrivePercentSensor(CoordinatorEntity, Entity):
 
     @property
     def state(self):
-        uuid = self._device["uuid"]
-        drive_data = self.coordinator.drive_data.get(uuid) or {}
-        value = drive_data.get("driveper")
+        value = self.coordinator.drive_value(self._uuid, "driveper")
         if value is None:
             return "--"
         try:
@@ -220,26 +299,18 @@ class FireBoardDrivePercentSensor(CoordinatorEntity, Entity):
     def unit_of_measurement(self):
         return "%"
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._device["uuid"], self._device.get("hardware_id"))} ,
-            "name": self._device["title"],
-            "model": self._device["model"],
-            "manufacturer": "FireBoard",
-        }
 
     @property
     def icon(self):
         return "mdi:fan"
 
-class FireBoardDriveSetpointSensor(CoordinatorEntity, Entity):
+class FireBoardDriveSetpointSensor(FireBoardEntity, Entity):
     def __init__(self, coordinator, device):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device)
         self.coordinator = coordinator
-        self._device = device
-        self._attr_name = f"{device['title']} Drive Setpoint"
-        self._attr_unique_id = f"{device['uuid']}_drive_setpoint"
+        self._attr_name = f"{device.title} Drive Setpoint"
+        self._attr_unique_id = f"{device.uuid}_drive_setpoint"
+        self._change_keys = ((device.uuid, "drive", "setpoint"),)
 
     @property
     def name(self):
@@ -251,38 +322,27 @@ class FireBoardDriveSetpointSensor(CoordinatorEntity, Entity):
 
     @property
     def state(self):
-        uuid = self._device["uuid"]
-        drive_data = self.coordinator.drive_data.get(uuid) or {}
-        value = drive_data.get("setpoint")
+        value = self.coordinator.drive_value(self._uuid, "setpoint")
         if value is None or value == 0:
             return "--"
         return value
 
     @property
     def unit_of_measurement(self):
-        degreetype = self._device.get("degreetype", 2)
-        return "°C" if degreetype == 1 else "°F"
+        return "°C" if self._device.degreetype == 1 else "°F"
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._device["uuid"], self._device.get("hardware_id"))} ,
-            "name": self._device["title"],
-            "model": self._device["model"],
-            "manufacturer": "FireBoard",
-        }
 
     @property
     def icon(self):
         return "mdi:fan"
 
-class FireBoardDriveLidPausedSensor(CoordinatorEntity, Entity):
+class FireBoardDriveLidPausedSensor(FireBoardEntity, Entity):
     def __init__(self, coordinator, device):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device)
         self.coordinator = coordinator
-        self._device = device
-        self._attr_name = f"{device['title']} Grill Lid"
-        self._attr_unique_id = f"{device['uuid']}_drive_lidpaused"
+        self._attr_name = f"{device.title} Grill Lid"
+        self._attr_unique_id = f"{device.uuid}_drive_lidpaused"
+        self._change_keys = ((device.uuid, "drive", "lidpaused"),)
 
     @property
     def name(self):
@@ -294,38 +354,26 @@ class FireBoardDriveLidPausedSensor(CoordinatorEntity, Entity):
 
     @property
     def state(self):
-        uuid = self._device["uuid"]
-        drive_data = self.coordinator.drive_data.get(uuid) or {}
-        value = drive_data.get("lidpaused")
+        value = self.coordinator.drive_value(self._uuid, "lidpaused")
         if value is None:
             return "--"
         return "Open" if value else "Closed"
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._device["uuid"], self._device.get("hardware_id"))} ,
-            "name": self._device["title"],
-            "model": self._device["model"],
-            "manufacturer": "FireBoard",
-        }
 
     @property
     def icon(self):
-        uuid = self._device["uuid"]
-        drive_data = self.coordinator.drive_data.get(uuid) or {}
-        value = drive_data.get("lidpaused")
+        value = self.coordinator.drive_value(self._uuid, "lidpaused")
         if value is True:
             return "mdi:grill-outline"
         return "mdi:grill"
 
-class FireBoardDriveControlChannelSensor(CoordinatorEntity, Entity):
+class FireBoardDriveControlChannelSensor(FireBoardEntity, Entity):
     def __init__(self, coordinator, device):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device)
         self.coordinator = coordinator
-        self._device = device
-        self._attr_name = f"{device['title']} Control Channel"
-        self._attr_unique_id = f"{device['uuid']}_drive_control_channel"
+        self._attr_name = f"{device.title} Control Channel"
+        self._attr_unique_id = f"{device.uuid}_drive_control_channel"
+        self._change_keys = ((device.uuid, "drive", "tiedchannel"),)
 
     @property
     def name(self):
@@ -337,22 +385,86 @@ class FireBoardDriveControlChannelSensor(CoordinatorEntity, Entity):
 
     @property
     def state(self):
-        uuid = self._device["uuid"]
-        drive_data = self.coordinator.drive_data.get(uuid) or {}
-        value = drive_data.get("tiedchannel")
+        value = self.coordinator.drive_value(self._uuid, "tiedchannel")
         if value is None:
             return "--"
         return f"Ch {value}"
 
+
+    @property
+    def icon(self):
+        return "mdi:link-variant"
+
+def _budget_exhausted_in(coordinator):
+    limiter = coordinator.api.limiter
+    seconds = limiter.exhaustion_in(limiter.consumption_rate())
+    return round(seconds / 60) if seconds is not None else "--"
+
+def _refresh_duration(coordinator):
+    total = coordinator.profile.last.get("total")
+    return round(total * 1000) if total is not None else "--"
+
+def _entity_writes(coordinator):
+    writes = coordinator.profile.last_entity_writes
+    return writes if writes is not None else "--"
+
+# key, name, unit, icon, value from the coordinator
+DIAGNOSTIC_SENSORS = (
+    ("api_calls_per_hour", "API Calls Per Hour", "calls/h", "mdi:api",
+        lambda coordinator: round(coordinator.api.limiter.consumption_rate())),
+    ("api_budget_remaining", "API Budget Remaining", "calls", "mdi:gauge",
+        lambda coordinator: coordinator.api.limiter.remaining()),
+    ("api_budget_exhausted_in", "API Budget Exhausted In", "min", "mdi:timer-alert-outline", _budget_exhausted_in),
+    ("refresh_duration", "Refresh Duration", "ms", "mdi:timer-outline", _refresh_duration),
+    ("entity_writes", "Entity Writes Per Refresh", None, "mdi:pencil", _entity_writes),
+)
+
+class FireBoardDiagnosticSensor(CoordinatorEntity, Entity):
+    """Account-level instrumentation, grouped under a FireBoard Cloud service device."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, entry, key, name, unit, icon, value):
+        super().__init__(coordinator)
+        self._entry_id = entry.entry_id
+        self._attr_name = f"FireBoard {name}"
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
+        self._key = key
+        self._unit = unit
+        self._icon = icon
+        self._value = value
+
+    @property
+    def name(self):
+        return self._attr_name
+
+    @property
+    def unique_id(self):
+        return self._attr_unique_id
+
+    @property
+    def state(self):
+        return self._value(self.coordinator)
+
+    @property
+    def unit_of_measurement(self):
+        return self._unit
+
+    @property
+    def icon(self):
+        return self._icon
+
+    @property
+    def extra_state_attributes(self):
+        if self._key == "refresh_duration":
+            return {f"{phase}_ms": round(seconds * 1000, 1) for phase, seconds in self.coordinator.profile.last.items()}
+        return {}
+
     @property
     def device_info(self):
         return {
-            "identifiers": {(DOMAIN, self._device["uuid"], self._device.get("hardware_id"))} ,
-            "name": self._device["title"],
-            "model": self._device["model"],
+            "identifiers": {(DOMAIN, self._entry_id)},
+            "name": "FireBoard Cloud",
             "manufacturer": "FireBoard",
+            "entry_type": DeviceEntryType.SERVICE,
         }
-
-    @property
-    def icon(self):
-        return "mdi:link-variant"
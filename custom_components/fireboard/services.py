@@ -1,8 +1,67 @@
-def async_setup_services(hass, api):
+import voluptuous as vol
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from .const import DOMAIN, BACKFILL_TARGETS, EXPORT_DIR, TARGET_STATISTICS
+
+PIN_DEVICE_SCHEMA = vol.Schema({
+    vol.Required("hardware_id"): cv.string,
+    vol.Optional("pinned", default=True): cv.boolean,
+})
+
+BACKFILL_SESSION_SCHEMA = vol.Schema({
+    vol.Required("hardware_id"): cv.string,
+    vol.Optional("session_id"): vol.Coerce(int),
+    vol.Optional("target", default=TARGET_STATISTICS): vol.In(BACKFILL_TARGETS),
+    vol.Optional("path"): cv.string,
+})
+
+def _coordinators(hass):
+    return [value for key, value in hass.data.get(DOMAIN, {}).items() if key.startswith("coordinator_")]
+
+def _find_device(hass, hardware_id):
+    """(coordinator, DeviceSnapshot) for a hardware id on any FireBoard account."""
+    for coordinator in _coordinators(hass):
+        device = coordinator.device_by_hardware_id(hardware_id)
+        if device is not None:
+            return coordinator, device
+    raise HomeAssistantError(f"No FireBoard device with hardware id {hardware_id}")
+
+def async_setup_services(hass):
     """Register FireBoard services."""
     async def async_refresh_service(call):
-        await api.async_get_devices()
-        # Optionally refresh all sensors
+        for coordinator in _coordinators(hass):
+            await coordinator.async_request_coalesced_refresh()
+
+    async def async_pin_device_service(call):
+        hardware_id = call.data["hardware_id"]
+        coordinator, _ = _find_device(hass, hardware_id)
+        coordinator.set_pinned(hardware_id, call.data["pinned"])
+        await coordinator.async_request_coalesced_refresh()
+
+    async def async_backfill_session_service(call):
+        coordinator, device = _find_device(hass, call.data["hardware_id"])
+        session_id = call.data.get("session_id", device.session_id)
+        if session_id is None:
+            raise HomeAssistantError(f"FireBoard device {device.hardware_id} has no current session")
+        target = call.data["target"]
+        # Loaded on first use, backfills are rare and startup should not pay for them
+        from .sessions import async_export_session, async_import_session_statistics
+        if target == TARGET_STATISTICS:
+            await async_import_session_statistics(hass, coordinator.api, device, session_id)
+            return
+        # www/ is in allowlist_external_dirs by default, the config directory itself is not
+        path = call.data.get("path") or hass.config.path(EXPORT_DIR, f"fireboard_session_{session_id}.{target}")
+        # is_allowed_path resolves the path on disk
+        if not await hass.async_add_executor_job(hass.config.is_allowed_path, path):
+            raise HomeAssistantError(f"Writing to {path} is not allowed, add it to allowlist_external_dirs")
+        await async_export_session(hass, coordinator.api, session_id, path, target)
+
     hass.services.async_register(
-        "fireboard", "refresh", async_refresh_service
+        DOMAIN, "refresh", async_refresh_service
+    )
+    hass.services.async_register(
+        DOMAIN, "pin_device", async_pin_device_service, schema=PIN_DEVICE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "backfill_session", async_backfill_session_service, schema=BACKFILL_SESSION_SCHEMA
     )
@@ -0,0 +1,123 @@
+import csv
+import json
+import logging
+import os
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+class SessionExporter:
+    """Appends session samples to a CSV or JSONL file; blocking, so run it in the executor."""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self._file = None
+        self._writer = None
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "w", newline="", encoding="utf-8")
+        if self.fmt == "csv":
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(("created", "channel", "temp"))
+
+    def write(self, batch):
+        if self.fmt == "csv":
+            self._writer.writerows((created.isoformat(), channel, temp) for created, channel, temp in batch)
+        else:
+            self._file.writelines(
+                json.dumps({"created": created.isoformat(), "channel": channel, "temp": temp}) + "\n"
+                for created, channel, temp in batch
+            )
+        self.rows += len(batch)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class HourlyStatistics:
+    """Folds samples into hourly mean/min/max rows per channel, holding only the open hours."""
+
+    def __init__(self):
+        self._open = {}  # channel: [hour start, count, total, min, max]
+
+    def add(self, batch):
+        """Add samples; returns {channel: [rows]} for the hours they closed."""
+        finished = {}
+        for created, channel, temp in batch:
+            hour = created.replace(minute=0, second=0, microsecond=0)
+            bucket = self._open.get(channel)
+            if bucket is not None and bucket[0] != hour:
+                finished.setdefault(channel, []).append(self._row(bucket))
+                bucket = None
+            if bucket is None:
+                bucket = self._open[channel] = [hour, 0, 0.0, temp, temp]
+            bucket[1] += 1
+            bucket[2] += temp
+            bucket[3] = min(bucket[3], temp)
+            bucket[4] = max(bucket[4], temp)
+        return finished
+
+    def flush(self):
+        """Rows for the hours still open, which end the log."""
+        finished = {channel: [self._row(bucket)] for channel, bucket in self._open.items()}
+        self._open = {}
+        return finished
+
+    @staticmethod
+    def _row(bucket):
+        hour, count, total, low, high = bucket
+        return {"start": hour, "mean": total / count, "min": low, "max": high}
+
+async def async_import_session_statistics(hass, api, device, session_id):
+    """Import a session's log as hourly long-term statistics of the channel sensors.
+
+    Returns the number of hourly rows imported. Channels without a sensor in the
+    entity registry are skipped.
+    """
+    from homeassistant.components.recorder.statistics import async_import_statistics
+    from homeassistant.helpers import entity_registry as er
+
+    registry = er.async_get(hass)
+    unit = "°C" if device.degreetype == 1 else "°F"
+    statistics = HourlyStatistics()
+    imported = 0
+
+    def import_rows(finished):
+        nonlocal imported
+        for channel, rows in finished.items():
+            reading = device.channel(channel)
+            entity_id = reading and registry.async_get_entity_id("sensor", DOMAIN, f"{device.uuid}_ch{reading.id}")
+            if not entity_id:
+                continue
+            metadata = {
+                "has_mean": True,
+                "has_sum": False,
+                "name": None,
+                "source": "recorder",
+                "statistic_id": entity_id,
+                "unit_of_measurement": unit,
+            }
+            async_import_statistics(hass, metadata, rows)
+            imported += len(rows)
+
+    async for batch in api.async_iter_session_log(session_id):
+        import_rows(statistics.add(batch))
+    import_rows(statistics.flush())
+    _LOGGER.info("FireBoard session %s: imported %d hourly statistics rows", session_id, imported)
+    return imported
+
+async def async_export_session(hass, api, session_id, path, fmt):
+    """Write a session's log to ``path`` as CSV or JSONL, one page at a time; returns the row count."""
+    exporter = SessionExporter(path, fmt)
+    await hass.async_add_executor_job(exporter.open)
+    try:
+        async for batch in api.async_iter_session_log(session_id):
+            await hass.async_add_executor_job(exporter.write, batch)
+    finally:
+        await hass.async_add_executor_job(exporter.close)
+    _LOGGER.info("FireBoard session %s: exported %d samples to %s", session_id, exporter.rows, path)
+    return exporter.rows
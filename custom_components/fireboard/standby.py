@@ -0,0 +1,67 @@
+class StandbyDevice:
+    """A device auto-disabled after empty reads, and the newest upload it had then."""
+
+    __slots__ = ("since", "last_upload")
+
+    def __init__(self, since, last_upload):
+        self.since = since
+        self.last_upload = last_upload
+
+def last_upload(device):
+    """Newest upload time devices.json shows for a device: last_templog or an embedded reading."""
+    times = [t for t in (device.last_templog, device.temps_created) if t is not None]
+    return max(times, default=None)
+
+class StandbyMonitor:
+    """Watch auto-disabled devices through devices.json alone and report when they upload again.
+
+    Standby costs no per-device requests: every refresh already lists each
+    device's last_templog and latest_temps, so a device wakes up as soon as
+    either moves past what it showed when it was disabled.
+    """
+
+    def __init__(self):
+        self.devices = {}  # hardware_id: StandbyDevice
+        self.wakeups = 0
+        self.last_wake_latency = None  # seconds from the waking upload to its detection
+        self._wake_latency_total = 0.0
+        self.idle_calls = 0  # per-device calls that returned no readings
+
+    def enter(self, device, now):
+        self.devices[device.hardware_id] = StandbyDevice(now, last_upload(device))
+
+    def leave(self, hardware_id):
+        self.devices.pop(hardware_id, None)
+
+    def standby_since(self, hardware_id):
+        entry = self.devices.get(hardware_id)
+        return entry.since if entry is not None else None
+
+    def check(self, devices, now):
+        """Hardware ids of standby devices that uploaded since going idle; they leave standby."""
+        woken = []
+        if not self.devices:
+            return woken
+        for device in devices:
+            entry = self.devices.get(device.hardware_id)
+            if entry is None:
+                continue
+            upload = last_upload(device)
+            if upload is None or (entry.last_upload is not None and upload <= entry.last_upload):
+                continue
+            latency = max((now - upload).total_seconds(), 0.0)
+            self.last_wake_latency = latency
+            self._wake_latency_total += latency
+            self.wakeups += 1
+            del self.devices[device.hardware_id]
+            woken.append(device.hardware_id)
+        return woken
+
+    def as_dict(self):
+        return {
+            "devices": {hardware_id: entry.since.isoformat() for hardware_id, entry in self.devices.items()},
+            "wakeups": self.wakeups,
+            "last_wake_latency": round(self.last_wake_latency, 1) if self.last_wake_latency is not None else None,
+            "avg_wake_latency": round(self._wake_latency_total / self.wakeups, 1) if self.wakeups else None,
+            "idle_calls": self.idle_calls,
+        }
@@ -1,26 +1,40 @@
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import callback
 from .const import DOMAIN
+from .entity import FireBoardEntity, async_remove_entities
 
 async def async_setup_entry(hass, entry, async_add_entities):
-    api = hass.data[DOMAIN][entry.entry_id]
     coordinator = hass.data[DOMAIN][f"coordinator_{entry.entry_id}"]
-    entities = []
-    for device in coordinator.devices:
-        hardware_id = device.get("hardware_id")
-        switch = FireBoardPollingSwitch(coordinator, device, hardware_id)
-        coordinator.register_switch_entity(hardware_id, switch)
-        entities.append(switch)
-    async_add_entities(entities)
-
-class FireBoardPollingSwitch(CoordinatorEntity, SwitchEntity):
+    tracked = {}  # uuid: switch
+
+    @callback
+    def async_discovered(added, removed):
+        entities = []
+        for key in added:
+            if key[0] != "device":
+                continue
+            device = coordinator.device(key[1])
+            switch = tracked[key[1]] = FireBoardPollingSwitch(coordinator, device, device.hardware_id)
+            coordinator.register_switch_entity(device.hardware_id, switch)
+            entities.append(switch)
+        if entities:
+            async_add_entities(entities)
+        for key in removed:
+            switch = tracked.pop(key[1], None) if key[0] == "device" else None
+            if switch is not None:
+                async_remove_entities(hass, [switch])
+
+    async_discovered(coordinator.entity_keys(), ())
+    entry.async_on_unload(coordinator.register_discovery(async_discovered))
+
+class FireBoardPollingSwitch(FireBoardEntity, SwitchEntity):
     def __init__(self, coordinator, device, hardware_id):
-        super().__init__(coordinator)
-        self._device = device
+        super().__init__(coordinator, device)
         self._hardware_id = hardware_id
         self._attr_name = "FireBoard Cloud Polling"
         self.entity_id = f"switch.fireboard_updates_{hardware_id}"
-        self._attr_unique_id = f"{device['uuid']}_polling_switch"
+        self._attr_unique_id = f"{device.uuid}_polling_switch"
+        self._change_keys = ((device.uuid, "allocation"),)
         # Default to polling disabled
         self._is_on = False
         self.coordinator.set_polling(self._hardware_id, False)
@@ -29,10 +43,23 @@ class FireBoardPollingSwitch(CoordinatorEntity, SwitchEntity):
     def is_on(self):
         return self._is_on
 
+    @property
+    def extra_state_attributes(self):
+        # The device's share of the hourly API budget while polling
+        attributes = self.coordinator.allocator.allocation(self._uuid)
+        if attributes:
+            attributes["pinned"] = self.coordinator.is_pinned(self._hardware_id)
+        since = self.coordinator.standby.standby_since(self._hardware_id)
+        if since is not None:
+            # Turned off after empty reads; turns back on when the device uploads again
+            attributes["standby_since"] = since.isoformat()
+        attributes.update(self._staleness_attributes())
+        return attributes
+
     async def async_turn_on(self, **kwargs):
         self._is_on = True
         self.coordinator.set_polling(self._hardware_id, True)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_coalesced_refresh()
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs):
@@ -44,11 +71,6 @@ class FireBoardPollingSwitch(CoordinatorEntity, SwitchEntity):
         self._is_on = False
         self.async_write_ha_state()
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._device["uuid"], self._hardware_id)},
-            "name": self._device["title"],
-            "model": self._device["model"],
-            "manufacturer": "FireBoard",
-        }
+    def auto_turn_on(self):
+        self._is_on = True
+        self.async_write_ha_state()
@@ -0,0 +1,109 @@
+# conftest.py
+import copy
+import json
+from unittest.mock import MagicMock, patch
+import aiohttp
+import pytest
+import pytest_asyncio
+from custom_components.fireboard.limiter import _LIMITERS
+from fake_cloud import FakeCloud, load_jsonc
+
+class FakeResponse:
+    def __init__(self, data, status=200, headers=None):
+        self._data = data
+        self.status = status
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(MagicMock(), (), status=self.status)
+
+    async def json(self):
+        return self._data
+
+    async def read(self):
+        return json.dumps(self._data).encode()
+
+class FakeSession:
+    """Stand-in for aiohttp.ClientSession serving the json/ samples and counting calls."""
+
+    def __init__(self):
+        self.calls = []
+        self.logins = 0
+        self.rejected_tokens = set()  # GETs with these tokens get a 401
+        self.outage = False  # when set, every GET gets a 503
+        self.etags = False  # when set, responses carry an ETag and honour If-None-Match
+        self.not_modified = 0
+        self.devices = load_jsonc("list-all-devices.jsonc")
+        self.temps = load_jsonc("device-real-time-temperature-data.jsonc")
+        self.drive = load_jsonc("device-real-time-drive-data.jsonc")
+
+    def post(self, url, json=None, headers=None):
+        self.calls.append(url)
+        self.logins += 1
+        return FakeResponse({"key": "dummy_token" if self.logins == 1 else f"dummy_token_{self.logins}"})
+
+    def get(self, url, headers=None):
+        self.calls.append(url)
+        if self.outage:
+            return FakeResponse(None, 503)
+        if headers and headers.get("Authorization", "")[len("Token "):] in self.rejected_tokens:
+            return FakeResponse({"detail": "Invalid token."}, 401)
+        if url.endswith("/devices.json"):
+            data = self.devices
+        elif url.endswith("/temps.json"):
+            data = self.temps
+        elif url.endswith("/drivelog.json"):
+            data = self.drive
+        else:
+            return FakeResponse(None, 404)
+        if not self.etags:
+            return FakeResponse(data)
+        etag = '"%x"' % hash(json.dumps(data))
+        if headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return FakeResponse(None, 304, {"ETag": etag})
+        return FakeResponse(data, headers={"ETag": etag})
+
+@pytest.fixture
+def fake_session():
+    return FakeSession()
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiters():
+    """Rate limiters are process-wide; give every test a fresh budget."""
+    _LIMITERS.clear()
+    yield
+    _LIMITERS.clear()
+
+class FakeStore:
+    """In-memory stand-in for homeassistant.helpers.storage.Store."""
+
+    def __init__(self, saved, key):
+        self._saved = saved
+        self.key = key
+
+    async def async_load(self):
+        return copy.deepcopy(self._saved.get(self.key))
+
+    def async_delay_save(self, data_func, delay=0):
+        self._saved[self.key] = copy.deepcopy(data_func())
+
+@pytest.fixture
+def fake_store():
+    """Patch the integration's Store; returns the dict of saved data by key."""
+    saved = {}
+    with patch("custom_components.fireboard.Store", lambda hass, version, key: FakeStore(saved, key)):
+        yield saved
+
+@pytest_asyncio.fixture
+async def fake_cloud():
+    """FakeCloud on localhost serving the json/ samples."""
+    async with FakeCloud() as cloud:
+        yield cloud
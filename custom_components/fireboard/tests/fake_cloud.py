@@ -0,0 +1,194 @@
+"""Local aiohttp server standing in for FireBoard Cloud.
+
+Serves the login, devices, temps, drivelog and session chart endpoints over real HTTP on
+127.0.0.1, seeded from the json/ samples or from N synthetic devices with M
+channels. Latency, error rate and token expiry are configurable so tests and
+benchmarks can exercise FireBoardApiClient and FireBoardCoordinator offline.
+"""
+import asyncio
+import copy
+from collections import Counter
+from datetime import datetime, timezone
+import json
+import pathlib
+import random
+from aiohttp import web
+
+JSON_DIR = pathlib.Path(__file__).parents[3] / "json"
+CLOUD_ORIGIN = "https://fireboard.io"
+
+def load_jsonc(name):
+    lines = (JSON_DIR / name).read_text().splitlines()
+    return json.loads("\n".join(l for l in lines if not l.lstrip().startswith("//")))
+
+def _timestamp(when):
+    return when.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def synthetic_devices(count, channels):
+    """``count`` FBX2 devices with ``channels`` channels each, built from the sample device."""
+    template = load_jsonc("list-all-devices.jsonc")[0]
+    channel_template = template["channels"][0]
+    devices = []
+    for index in range(count):
+        device = copy.deepcopy(template)
+        device["uuid"] = f"00000000-0000-4000-8000-{index:012d}"
+        device["id"] = 1000 + index
+        device["hardware_id"] = f"SYN{index:06d}"
+        device["title"] = f"Synthetic {index}"
+        device["channels"] = [
+            dict(copy.deepcopy(channel_template), id=index * 100 + number, channel=number,
+                 channel_label=f"Probe {number}", last_templog=None)
+            for number in range(1, channels + 1)
+        ]
+        device["channel_count"] = channels
+        device["latest_temps"] = [
+            {"created": template["latest_temps"][0]["created"], "temp": 70.0 + number, "channel": number, "degreetype": 2}
+            for number in range(1, channels + 1)
+        ]
+        device["last_drivelog"] = dict(template["last_drivelog"], tieddevice=device["uuid"])
+        devices.append(device)
+    return devices
+
+class FakeCloud:
+    """FireBoard Cloud on localhost; use ``session()`` to point a client at it."""
+
+    def __init__(self, devices=None, channels=6, latency=0.0, error_rate=0.0, seed=0,
+                 session_samples=0, session_page_size=None):
+        self.devices = load_jsonc("list-all-devices.jsonc") if devices is None else synthetic_devices(devices, channels)
+        self.drive = load_jsonc("device-real-time-drive-data.jsonc")
+        self.latency = latency  # seconds added to every response
+        self.error_rate = error_rate  # fraction of GETs answered with a 503
+        self.session_samples = session_samples  # readings per channel in every session log
+        self.session_page_size = session_page_size  # readings per channel per page, None for one document
+        self.tokens = set()
+        self.requests = Counter()  # endpoint: requests served
+        self._random = random.Random(seed)
+        self._runner = None
+        self.base_url = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/api/rest-auth/login/", self._login)
+        app.router.add_get("/api/v1/devices.json", self._devices)
+        app.router.add_get("/api/v1/devices/{uuid}/temps.json", self._temps)
+        app.router.add_get("/api/v1/devices/{uuid}/drivelog.json", self._drivelog)
+        app.router.add_get("/api/v1/sessions/{session_id}/chart.json", self._session_chart)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def session(self, client_session):
+        return FakeCloudSession(client_session, self.base_url)
+
+    @property
+    def total_requests(self):
+        return sum(self.requests.values())
+
+    def expire_tokens(self):
+        """Every issued token is rejected with a 401 from now on."""
+        self.tokens.clear()
+
+    def advance(self, step=0.5, when=None):
+        """Simulate an upload from every device: new readings stamped ``when`` (default now)."""
+        created = _timestamp(when or datetime.now(timezone.utc))
+        for device in self.devices:
+            device["last_templog"] = created
+            for reading in device.get("latest_temps") or []:
+                reading["created"] = created
+                reading["temp"] = round(reading["temp"] + self._random.uniform(-step, 2 * step), 1)
+            if device.get("last_drivelog"):
+                device["last_drivelog"]["created"] = created
+
+    def _device(self, uuid):
+        for device in self.devices:
+            if device["uuid"] == uuid:
+                return device
+        raise web.HTTPNotFound()
+
+    async def _respond(self, request, endpoint, payload):
+        self.requests[endpoint] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if endpoint != "login":
+            token = request.headers.get("Authorization", "")[len("Token "):]
+            if token not in self.tokens:
+                return web.json_response({"detail": "Invalid token."}, status=401)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return web.json_response({"detail": "Service unavailable."}, status=503)
+        return web.json_response(payload() if callable(payload) else payload)
+
+    async def _login(self, request):
+        token = f"token-{self.requests['login'] + 1}"
+        self.tokens.add(token)
+        return await self._respond(request, "login", {"key": token})
+
+    async def _devices(self, request):
+        return await self._respond(request, "devices", self.devices)
+
+    async def _temps(self, request):
+        device = self._device(request.match_info["uuid"])
+        readings = [dict(reading) for reading in device.get("latest_temps") or []]
+        return await self._respond(request, "temps", readings)
+
+    async def _drivelog(self, request):
+        device = self._device(request.match_info["uuid"])
+        drive = dict(self.drive, device_uuid=device["uuid"]) if device.get("last_drivelog") else {}
+        return await self._respond(request, "drivelog", drive)
+
+    def _chart_page(self, start, stop):
+        """Chart series for readings [start, stop) of a 6-channel log sampled every 10 s."""
+        origin = 1751120000  # 2025-06-28T14:13:20Z
+        return [
+            {
+                "channel": channel,
+                "label": f"Channel {channel}",
+                "x": [origin + 10 * index for index in range(start, stop)],
+                "y": [round(70.0 + channel + index * 0.05, 2) for index in range(start, stop)],
+            }
+            for channel in range(1, 7)
+        ]
+
+    async def _session_chart(self, request):
+        samples = self.session_samples
+        size = self.session_page_size
+        if size is None:
+            return await self._respond(request, "sessions", lambda: self._chart_page(0, samples))
+        page = int(request.query.get("page", 1))
+        start, stop = (page - 1) * size, min(page * size, samples)
+        next_url = None
+        if stop < samples:
+            next_url = f"{CLOUD_ORIGIN}{request.path}?page={page + 1}"
+        return await self._respond(request, "sessions", lambda: {
+            "count": samples, "next": next_url, "results": self._chart_page(start, stop),
+        })
+
+class FakeCloudSession:
+    """aiohttp session wrapper that sends fireboard.io requests to the local server."""
+
+    def __init__(self, session, base_url):
+        self._session = session
+        self._base_url = base_url
+
+    def _url(self, url):
+        return url.replace(CLOUD_ORIGIN, self._base_url, 1)
+
+    def get(self, url, **kwargs):
+        return self._session.get(self._url(url), **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._session.post(self._url(url), **kwargs)
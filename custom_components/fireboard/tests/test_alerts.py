@@ -0,0 +1,50 @@
+# test_alerts.py
+from custom_components.fireboard.alerts import AlertEngine, ChannelAlerts
+from custom_components.fireboard.models import parse_devices
+from conftest import load_jsonc
+
+def test_interval_index_states_per_region():
+    index = ChannelAlerts(((200.0, 260.0), (None, 225.0)))
+    assert index.bounds == [200.0, 225.0, 260.0]
+    assert index.states == [
+        ("low", "ok"),
+        ("ok", "ok"),
+        ("ok", "high"),
+        ("high", "high"),
+    ]
+
+def test_crossings_need_hysteresis():
+    index = ChannelAlerts(((200.0, 260.0),))
+    # The first reading is the baseline
+    assert index.evaluate(150.0, 2) == []
+    assert index.evaluate(201.0, 2) == []  # within 2 degrees of temp_min
+    assert index.evaluate(202.5, 2) == [(0, "low", "ok")]
+    assert index.evaluate(199.0, 2) == []
+    assert index.evaluate(197.5, 2) == [(0, "ok", "low")]
+    # One reading can jump across both boundaries
+    assert index.evaluate(270.0, 2) == [(0, "low", "high")]
+
+def test_engine_reports_crossings_as_event_data():
+    fbx2 = parse_devices(load_jsonc("list-all-devices.jsonc"))[0]
+    engine = AlertEngine()
+    engine.compile([fbx2])
+    # Only channel 5 has an enabled alert (200-260 °F)
+    assert list(engine.channels) == [(fbx2.uuid, 5)]
+    assert engine.evaluate(fbx2, {5: 190.0, 1: 300.0}) == []
+    events = engine.evaluate(fbx2, {5: 205.0})
+    assert events == [{
+        "device_uuid": fbx2.uuid,
+        "hardware_id": "GHKK33R97",
+        "device_name": fbx2.title,
+        "channel": 5,
+        "channel_label": fbx2.channel(5).label,
+        "temp": 205.0,
+        "temp_min": 200.0,
+        "temp_max": 260.0,
+        "previous_state": "low",
+        "state": "ok",
+    }]
+    # Recompiling unchanged alerts keeps the channel's state
+    engine.compile([fbx2])
+    assert engine.evaluate(fbx2, {5: 206.0}) == []
+    assert engine.as_dict() == {"indexed_channels": 1, "fired": 1}
@@ -1,18 +1,134 @@
 # test_api.py
 import pytest
 import asyncio
-from custom_components.fireboard.api import FireBoardApiClient
-
-@pytest.mark.asyncio
-async def test_login(monkeypatch):
-    class DummySession:
-        async def post(self, url, json, headers):
-            class Resp:
-                async def json(self):
-                    return {"key": "dummy_token"}
-                def raise_for_status(self):
-                    pass
-            return Resp()
-    api = FireBoardApiClient("user", "pass", DummySession())
+import time
+import aiohttp
+from custom_components.fireboard.api import FireBoardApiClient, FireBoardAuthError
+from custom_components.fireboard.breaker import FireBoardCircuitOpen
+from custom_components.fireboard.const import API_BASE, LOGIN_URL
+from custom_components.fireboard.limiter import FireBoardRateLimitError
+from conftest import FakeResponse
+
+@pytest.mark.asyncio
+async def test_login(fake_session):
+    api = FireBoardApiClient("user", "pass", fake_session)
     await api.async_login()
     assert api._token == "dummy_token"
+
+@pytest.mark.asyncio
+async def test_expired_token_relogs_in_once_and_retries(fake_session):
+    saved = []
+    api = FireBoardApiClient("user", "pass", fake_session, token="expired", on_token=saved.append)
+    fake_session.rejected_tokens = {"expired"}
+    results = await asyncio.gather(
+        api.async_get_devices(),
+        api.async_get_channel_temps("fdff7eb8-c93f-4256-bf0c-e588392cbe37"),
+        api.async_get_drive_data("fdff7eb8-c93f-4256-bf0c-e588392cbe37"),
+    )
+    assert fake_session.calls.count(LOGIN_URL) == 1
+    assert saved == ["dummy_token"]
+    assert [device.uuid for device in results[0]] == [device["uuid"] for device in fake_session.devices]
+    assert results[1][1] == 71.9
+    assert results[2].setpoint == 100.0
+
+@pytest.mark.asyncio
+async def test_rejected_new_token_raises(fake_session):
+    api = FireBoardApiClient("user", "pass", fake_session, token="expired")
+    # The fresh token from the re-login is rejected too
+    fake_session.rejected_tokens = {"expired", "dummy_token"}
+    with pytest.raises(FireBoardAuthError):
+        await api.async_get_devices()
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_stops_spending_budget(fake_session):
+    api = FireBoardApiClient("user", "pass", fake_session, token="dummy_token")
+    fake_session.outage = True
+    for _ in range(3):
+        with pytest.raises(aiohttp.ClientResponseError):
+            await api.async_get_devices()
+    spent = api.limiter.total_calls
+    with pytest.raises(FireBoardCircuitOpen):
+        await api.async_get_devices()
+    assert api.limiter.total_calls == spent
+    assert api.breakers["devices"].state == "open"
+    assert api.breakers["devices"].rejected == 1
+
+@pytest.mark.asyncio
+async def test_unchanged_body_returns_cached_object(fake_session):
+    api = FireBoardApiClient("user", "pass", fake_session, token="dummy_token")
+    first = await api.async_get_devices()
+    assert await api.async_get_devices() is first
+    fake_session.etags = True
+    await api.async_get_devices()
+    assert await api.async_get_devices() is first
+    assert fake_session.not_modified == 1
+    assert api.cache_stats["devices"] == {"hits": 3, "misses": 1, "not_modified": 1}
+    fake_session.devices = fake_session.devices[:1]
+    assert len(await api.async_get_devices()) == 1
+
+@pytest.mark.asyncio
+async def test_not_modified_without_cached_response_raises(fake_session, monkeypatch):
+    api = FireBoardApiClient("user", "pass", fake_session, token="dummy_token")
+    monkeypatch.setattr(fake_session, "get", lambda url, headers=None: FakeResponse(None, 304))
+    with pytest.raises(aiohttp.ClientPayloadError):
+        await api.async_get_devices()
+    # The cloud answered, so this is not an outage
+    assert api.breakers["devices"].state == "closed"
+    assert api.response_cache == {}
+
+@pytest.mark.asyncio
+async def test_breaker_reopens_when_probe_is_rate_limited(fake_session):
+    api = FireBoardApiClient("user", "pass", fake_session, token="dummy_token")
+    await open_breaker(api, fake_session, api.async_get_devices)
+    breaker = api.breakers["devices"]
+    breaker.retry_at = 0
+    api.limiter._blocked_until = time.time() + 3600
+    with pytest.raises(FireBoardRateLimitError):
+        await api.async_get_devices()
+    # The probe never went out, so the next call may probe once budget is back
+    assert breaker.state == "open" and breaker.allow()
+
+class HangingResponse:
+    async def __aenter__(self):
+        await asyncio.sleep(3600)
+
+    async def __aexit__(self, *exc):
+        return False
+
+async def open_breaker(api, fake_session, endpoint_call):
+    fake_session.outage = True
+    for _ in range(3):
+        with pytest.raises(aiohttp.ClientResponseError):
+            await endpoint_call()
+    fake_session.outage = False
+
+@pytest.mark.asyncio
+async def test_breaker_closes_when_probe_gets_a_client_error(fake_session):
+    api = FireBoardApiClient("user", "pass", fake_session, token="dummy_token")
+    await open_breaker(api, fake_session, lambda: api._async_get_json(f"{API_BASE}/devices.json", "devices"))
+    breaker = api.breakers["devices"]
+    breaker.retry_at = 0
+    # The probe gets a 404: the endpoint is up, so the circuit closes
+    with pytest.raises(aiohttp.ClientResponseError):
+        await api._async_get_json(f"{API_BASE}/missing.json", "devices")
+    assert breaker.state == "closed"
+    assert await api.async_get_devices()
+
+@pytest.mark.asyncio
+async def test_breaker_reopens_when_probe_is_cancelled(fake_session, monkeypatch):
+    api = FireBoardApiClient("user", "pass", fake_session, token="dummy_token")
+    await open_breaker(api, fake_session, lambda: api._async_get_json(f"{API_BASE}/devices.json", "devices"))
+    breaker = api.breakers["devices"]
+    breaker.retry_at = 0
+    get = fake_session.get
+    monkeypatch.setattr(fake_session, "get", lambda url, headers=None: HangingResponse())
+    probe = asyncio.ensure_future(api.async_get_devices())
+    await asyncio.sleep(0)
+    probe.cancel()
+    await asyncio.gather(probe, return_exceptions=True)
+    # Counted like a timeout: open again with a backoff, not stuck half-open
+    assert breaker.state == "open" and breaker.retry_at > 0
+    monkeypatch.setattr(fake_session, "get", get)
+    breaker.retry_at = 0
+    assert await api.async_get_devices()
+    assert breaker.state == "closed"
@@ -0,0 +1,70 @@
+# test_cloud.py
+from unittest.mock import MagicMock
+import aiohttp
+import pytest
+from custom_components.fireboard.api import FireBoardApiClient
+from custom_components.fireboard.breaker import FireBoardCircuitOpen
+from custom_components.fireboard.const import DOMAIN, POLLING_MODE_DEVICES, POLLING_MODE_FULL
+from custom_components.fireboard.coordinator import FireBoardCoordinator
+from custom_components.fireboard.diagnostics import async_get_config_entry_diagnostics
+from fake_cloud import FakeCloud
+
+@pytest.mark.asyncio
+async def test_refresh_over_http(fake_cloud):
+    async with aiohttp.ClientSession() as session:
+        api = FireBoardApiClient("user", "pass", fake_cloud.session(session))
+        coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+        await coordinator._async_update_data()
+    assert fake_cloud.requests == {"login": 1, "devices": 1, "temps": 1}
+    assert coordinator.channel_temps["fdff7eb8-c93f-4256-bf0c-e588392cbe37"][1] == 71.1
+
+@pytest.mark.asyncio
+async def test_synthetic_devices_in_full_mode():
+    async with FakeCloud(devices=5, channels=4) as cloud, aiohttp.ClientSession() as session:
+        api = FireBoardApiClient("user", "pass", cloud.session(session))
+        coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_FULL)
+        await coordinator._async_update_data()
+    assert cloud.requests["temps"] == cloud.requests["drivelog"] == 5
+    assert len(coordinator.entity_keys()) == 5 * (1 + 4 + 1)
+
+@pytest.mark.asyncio
+async def test_expired_token_over_http(fake_cloud):
+    async with aiohttp.ClientSession() as session:
+        api = FireBoardApiClient("user", "pass", fake_cloud.session(session))
+        await api.async_get_devices()
+        fake_cloud.expire_tokens()
+        await api.async_get_devices()
+    assert fake_cloud.requests["login"] == 2
+    assert api._token == "token-2"
+
+@pytest.mark.asyncio
+async def test_failing_cloud_opens_the_breaker():
+    async with FakeCloud(error_rate=1.0) as cloud, aiohttp.ClientSession() as session:
+        api = FireBoardApiClient("user", "pass", cloud.session(session))
+        for _ in range(3):
+            with pytest.raises(aiohttp.ClientResponseError):
+                await api.async_get_devices()
+        with pytest.raises(FireBoardCircuitOpen):
+            await api.async_get_devices()
+    assert cloud.requests["devices"] == 3
+
+@pytest.mark.asyncio
+async def test_instrumentation_in_diagnostics(fake_cloud):
+    async with aiohttp.ClientSession() as session:
+        api = FireBoardApiClient("user", "pass", fake_cloud.session(session))
+        coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+        await coordinator._async_update_data()
+        await coordinator._async_update_data()
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"coordinator_entry1": coordinator}}
+    diagnostics = await async_get_config_entry_diagnostics(hass, MagicMock(entry_id="entry1"))
+    devices = diagnostics["endpoints"]["devices"]
+    assert devices["requests"] == 2
+    assert devices["bytes_received"] > 1000
+    # The second body was identical, so it was not decoded again
+    assert devices["decodes"] == 1
+    assert sum(devices["latency_histogram"].values()) == 2
+    profile = diagnostics["refresh_profile"]
+    assert profile["refreshes"] == 2
+    assert set(profile["last_ms"]) == {"devices", "per_device", "process", "total"}
+    assert diagnostics["rate_limit"]["calls_per_hour"] > 0
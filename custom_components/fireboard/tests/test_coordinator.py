@@ -0,0 +1,429 @@
+# test_coordinator.py
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock
+import pytest
+from homeassistant.util import dt as dt_util
+from custom_components.fireboard.api import FireBoardApiClient
+from custom_components.fireboard.const import POLLING_MODE_DEVICES, POLLING_MODE_FULL
+from custom_components.fireboard.breaker import FireBoardCircuitOpen
+from custom_components.fireboard.coordinator import FireBoardCoordinator
+from custom_components.fireboard.limiter import FireBoardRateLimiter
+from custom_components.fireboard.models import parse_devices, parse_drive
+from conftest import FakeResponse, load_jsonc
+
+class CountingApi:
+    def __init__(self):
+        self.calls = []
+        self.raw_devices = load_jsonc("list-all-devices.jsonc")
+        self.devices = parse_devices(self.raw_devices)
+        self.limiter = FireBoardRateLimiter(200)
+        self.temps_created = {}
+
+    async def async_get_devices(self):
+        self.calls.append("devices")
+        return self.devices
+
+    async def async_get_channel_temps(self, device_uuid):
+        self.calls.append(("temps", device_uuid))
+        return {1: 70.0}
+
+    async def async_get_drive_data(self, device_uuid):
+        self.calls.append(("drivelog", device_uuid))
+        return parse_drive({"driveper": 0.5})
+
+    def set_update_interval(self, update_interval):
+        return max(update_interval, 18)
+
+@pytest.mark.asyncio
+async def test_single_call_mode_uses_embedded_data():
+    api = CountingApi()
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    coordinator.set_polling("GHKK33R97", True)
+    coordinator.set_polling("G9K49836D", False)
+    await coordinator._async_update_data()
+    assert api.calls == ["devices"]
+    uuid = "fdff7eb8-c93f-4256-bf0c-e588392cbe37"
+    assert coordinator.channel_temps[uuid][1] == 71.1
+    assert coordinator.drive_data[uuid].tiedchannel == 6
+    assert coordinator.drive_data[uuid].lidpaused is False
+
+@pytest.mark.asyncio
+async def test_single_call_mode_falls_back_when_embedded_missing():
+    api = CountingApi()
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    await coordinator._async_update_data()
+    # The Spark has no embedded temps but also no drive
+    assert api.calls == ["devices", ("temps", "3ba0da49-2e78-45c6-bbe0-547d98a8ffe8")]
+
+@pytest.mark.asyncio
+async def test_full_mode_fetches_per_device():
+    api = CountingApi()
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_FULL)
+    # The next refresh uses full polling
+    await coordinator._async_update_data()
+    assert ("drivelog", "fdff7eb8-c93f-4256-bf0c-e588392cbe37") in api.calls
+
+class SlowApi(CountingApi):
+    def __init__(self, slow_uuid, delay):
+        super().__init__()
+        self.slow_uuid = slow_uuid
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def async_get_channel_temps(self, device_uuid):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay if device_uuid == self.slow_uuid else 0.01)
+            return {1: 70.0}
+        finally:
+            self.in_flight -= 1
+
+@pytest.mark.asyncio
+async def test_slow_device_keeps_last_known_values():
+    api = SlowApi("3ba0da49-2e78-45c6-bbe0-547d98a8ffe8", 5)
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_FULL, refresh_deadline=0.2)
+    coordinator.channel_temps = {"3ba0da49-2e78-45c6-bbe0-547d98a8ffe8": {1: 55.0}}
+    await coordinator._async_update_data()
+    assert coordinator.channel_temps["3ba0da49-2e78-45c6-bbe0-547d98a8ffe8"] == {1: 55.0}
+    assert coordinator.channel_temps["fdff7eb8-c93f-4256-bf0c-e588392cbe37"] == {1: 70.0}
+
+@pytest.mark.asyncio
+async def test_concurrency_cap():
+    api = SlowApi(None, 0)
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_FULL, max_concurrency=1)
+    await coordinator._async_update_data()
+    assert api.max_in_flight == 1
+
+@pytest.mark.asyncio
+async def test_refresh_requests_are_coalesced(monkeypatch):
+    monkeypatch.setattr("custom_components.fireboard.coordinator.REFRESH_COALESCE_WINDOW", 0.05)
+    api = CountingApi()
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    await asyncio.gather(*(coordinator.async_request_coalesced_refresh() for _ in range(10)))
+    assert api.calls.count("devices") == 1
+    assert coordinator.refresh_stats == {"requested": 10, "coalesced": 9, "executed": 1}
+
+class SlowDevicesApi(CountingApi):
+    async def async_get_devices(self):
+        await asyncio.sleep(0.05)
+        return await super().async_get_devices()
+
+@pytest.mark.asyncio
+async def test_coalesced_refresh_joins_scheduled_refresh(monkeypatch):
+    monkeypatch.setattr("custom_components.fireboard.coordinator.REFRESH_COALESCE_WINDOW", 0.02)
+    api = SlowDevicesApi()
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    requested = asyncio.ensure_future(coordinator.async_request_coalesced_refresh())
+    await asyncio.sleep(0.01)
+    # The scheduled refresh starts inside the coalesce window
+    await asyncio.gather(requested, coordinator.async_refresh())
+    assert api.calls.count("devices") == 1
+    assert coordinator.last_update_success
+    assert coordinator.refresh_stats == {"requested": 1, "coalesced": 1, "executed": 0}
+    # Overlapping updates each settle their own in-flight future
+    await asyncio.gather(coordinator._async_update_data(), coordinator._async_update_data())
+    assert coordinator._in_flight is None
+
+@pytest.mark.asyncio
+async def test_per_device_requests_respect_budget_reserve():
+    api = CountingApi()
+    for _ in range(api.limiter.limit - 3):
+        api.limiter.acquire()
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_FULL)
+    coordinator.channel_temps = {"fdff7eb8-c93f-4256-bf0c-e588392cbe37": {1: 55.0}}
+    await coordinator._async_update_data()
+    assert api.calls == ["devices"]
+    assert coordinator.channel_temps == {"fdff7eb8-c93f-4256-bf0c-e588392cbe37": {1: 55.0}}
+
+@pytest.mark.asyncio
+async def test_fetches_skipped_until_next_expected_upload():
+    api = CountingApi()
+    spark = "3ba0da49-2e78-45c6-bbe0-547d98a8ffe8"
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    coordinator.set_polling("GHKK33R97", False)
+    now = dt_util.utcnow()
+    for created in (now - timedelta(seconds=25), now - timedelta(seconds=5)):
+        api.temps_created[spark] = created.isoformat()
+        await coordinator._async_update_data()
+    assert coordinator.cadence[spark].cadence == 20
+    assert coordinator.cadence[spark].hit_rate == 1.0
+    # Next upload is due in ~15 s: temps.json would repeat the same reading
+    api.calls.clear()
+    await coordinator._async_update_data()
+    assert api.calls == ["devices"]
+    assert coordinator.cadence[spark].skipped == 1
+    # Flat readings double the interval to 36 s, then it is pushed to just after an upload
+    assert coordinator.update_interval.total_seconds() == pytest.approx(15 + 20 + 3, abs=1)
+
+@pytest.mark.asyncio
+async def test_changed_keys_only_cover_changed_values():
+    api = CountingApi()
+    uuid = "fdff7eb8-c93f-4256-bf0c-e588392cbe37"
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    coordinator.set_polling("G9K49836D", False)
+    await coordinator._async_update_data()
+    assert (uuid, "channel", 1) in coordinator.changed_keys
+    await coordinator._async_update_data()
+    assert coordinator.changed_keys == set()
+    # A changed body is decoded into new objects
+    api.raw_devices[0]["latest_temps"][0]["temp"] = 72.0
+    api.devices = parse_devices(api.raw_devices)
+    await coordinator._async_update_data()
+    assert coordinator.changed_keys == {(uuid, "channel", 1)}
+    assert coordinator.has_changed([(uuid, "channel", 1)])
+    assert not coordinator.has_changed([(uuid, "battery")])
+
+@pytest.mark.asyncio
+async def test_outage_serves_last_known_values_marked_stale():
+    api = CountingApi()
+    uuid = "fdff7eb8-c93f-4256-bf0c-e588392cbe37"
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    coordinator.data = await coordinator._async_update_data()
+
+    async def circuit_open():
+        raise FireBoardCircuitOpen("devices endpoint paused")
+    api.async_get_devices = circuit_open
+    data = await coordinator._async_update_data()
+    assert data["channel_temps"][uuid][1] == 71.1
+    assert coordinator.stale_since_for(uuid) is not None
+    assert (uuid, "stale") in coordinator.changed_keys
+
+    del api.async_get_devices
+    await coordinator._async_update_data()
+    assert coordinator.stale_since_for(uuid) is None
+
+@pytest.mark.asyncio
+async def test_unchanged_devices_skip_diffing():
+    api = CountingApi()
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    coordinator.set_polling("G9K49836D", False)
+    await coordinator._async_update_data()
+    coordinator._diff_values = MagicMock()
+    await coordinator._async_update_data()
+    assert coordinator.unchanged_refreshes == 1
+    coordinator._diff_values.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_discovery_reports_only_changed_devices_and_channels():
+    api = CountingApi()
+    fbx2, spark = "fdff7eb8-c93f-4256-bf0c-e588392cbe37", "3ba0da49-2e78-45c6-bbe0-547d98a8ffe8"
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    events = []
+    coordinator.register_discovery(lambda added, removed: events.append((added, removed)))
+    await coordinator._async_update_data()
+    added, removed = events.pop()
+    assert sorted(added) == sorted(coordinator.entity_keys())
+    assert ("drive", fbx2) in added and ("drive", spark) not in added
+
+    # Same listing: nothing to report
+    api.devices = parse_devices(api.raw_devices)
+    await coordinator._async_update_data()
+    assert events == []
+
+    # A new probe channel on the FBX2 and the Spark leaving the account
+    new_channel = dict(api.raw_devices[0]["channels"][0], id=1, channel=7)
+    api.raw_devices[0]["channels"].append(new_channel)
+    api.devices = parse_devices(api.raw_devices[:1])
+    api.calls.clear()
+    await coordinator._async_update_data()
+    # The Spark is kept, marked stale and not polled, until it misses three listings
+    assert events.pop() == ([("channel", fbx2, 1)], [])
+    assert coordinator.stale_since_for(spark) is not None
+    assert coordinator.channel_temps[spark]
+    assert api.calls == ["devices"]
+    await coordinator._async_update_data()
+    assert events == []
+    await coordinator._async_update_data()
+    assert events == [([], [("device", spark), ("channel", spark, 44479780), ("channel", spark, 44479781)])]
+    assert coordinator.channel(fbx2, 1).channel == 7
+    assert coordinator.device_by_hardware_id("G9K49836D") is None
+    assert spark not in coordinator.cadence
+
+@pytest.mark.asyncio
+async def test_empty_device_listing_is_not_a_removal():
+    api = CountingApi()
+    uuid = "fdff7eb8-c93f-4256-bf0c-e588392cbe37"
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    events = []
+    coordinator.register_discovery(lambda added, removed: events.append((added, removed)))
+    coordinator.data = await coordinator._async_update_data()
+    events.clear()
+    api.devices = []
+    for _ in range(3):
+        await coordinator._async_update_data()
+    # Served as last-known data, like a failed devices.json
+    assert events == []
+    assert len(coordinator.devices) == 2
+    assert coordinator.stale_since_for(uuid) is not None
+
+class NoDriveApi(CountingApi):
+    async def async_get_drive_data(self, device_uuid):
+        self.calls.append(("drivelog", device_uuid))
+        return None
+
+@pytest.mark.asyncio
+async def test_pinned_device_gets_most_of_the_per_device_budget():
+    api = NoDriveApi()
+    fbx2, spark = "fdff7eb8-c93f-4256-bf0c-e588392cbe37", "3ba0da49-2e78-45c6-bbe0-547d98a8ffe8"
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_FULL)
+    coordinator.set_pinned("GHKK33R97", True)
+    await coordinator._async_update_data()
+    api.calls.clear()
+    for _ in range(60):
+        coordinator.allocator._updated -= 60  # a minute between refreshes
+        await coordinator._async_update_data()
+    fetched = {uuid: api.calls.count(("temps", uuid)) for uuid in (fbx2, spark)}
+    assert fetched[fbx2] > 5 * fetched[spark] > 0
+    assert coordinator.allocator.allocation(fbx2)["priority"] == "pinned"
+    assert coordinator.allocator.allocation(spark)["deferred"] > 0
+    # Deferred refreshes keep the last-known values and do not count as empty reads
+    assert coordinator.channel_temps[spark] == {1: 70.0}
+    assert coordinator.is_polling("G9K49836D")
+
+@pytest.mark.asyncio
+async def test_alert_crossings_fire_events_during_refresh():
+    api = CountingApi()
+    fbx2 = "fdff7eb8-c93f-4256-bf0c-e588392cbe37"
+    readings = iter([190.0, 205.0, 204.0])
+
+    async def get_channel_temps(device_uuid):
+        return {5: next(readings)}
+    api.async_get_channel_temps = get_channel_temps
+    hass = MagicMock()
+    coordinator = FireBoardCoordinator(hass, api, 18, POLLING_MODE_FULL)
+    coordinator.set_polling("G9K49836D", False)
+    started = dt_util.utcnow() - timedelta(minutes=5)
+    for step in range(3):
+        api.temps_created[fbx2] = (started + timedelta(seconds=20 * step)).isoformat()
+        await coordinator._async_update_data()
+        coordinator.allocator._updated -= 600  # enough budget credit for the next fetch
+    fired = [c.args for c in hass.bus.async_fire.call_args_list]
+    assert [(event, data["channel"], data["previous_state"], data["state"]) for event, data in fired] == [
+        ("fireboard_alert", 5, "low", "ok"),
+    ]
+
+@pytest.mark.asyncio
+async def test_standby_device_wakes_on_new_upload_without_extra_calls():
+    api = CountingApi()
+    spark = "3ba0da49-2e78-45c6-bbe0-547d98a8ffe8"
+    empty = True
+
+    async def get_channel_temps(device_uuid):
+        api.calls.append(("temps", device_uuid))
+        return {} if empty else {1: 70.0}
+    api.async_get_channel_temps = get_channel_temps
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    coordinator.set_polling("GHKK33R97", False)
+    switch = MagicMock()
+    coordinator.register_switch_entity("G9K49836D", switch)
+    for _ in range(3):
+        await coordinator._async_update_data()
+        coordinator.allocator._updated -= 600  # enough budget credit for the next fetch
+    assert not coordinator.is_polling("G9K49836D")
+    switch.auto_turn_off.assert_called_once()
+    assert coordinator.standby.standby_since("G9K49836D") is not None
+    assert coordinator.standby.idle_calls == 3
+
+    # Standby costs only the devices.json call every refresh already makes
+    api.calls.clear()
+    await coordinator._async_update_data()
+    assert api.calls == ["devices"]
+
+    # The Spark uploads again: devices.json shows a newer last_templog
+    empty = False
+    api.raw_devices[1]["last_templog"] = (dt_util.utcnow() - timedelta(seconds=5)).isoformat()
+    api.devices = parse_devices(api.raw_devices)
+    api.calls.clear()
+    await coordinator._async_update_data()
+    assert api.calls == ["devices", ("temps", spark)]
+    assert coordinator.is_polling("G9K49836D")
+    switch.auto_turn_on.assert_called_once()
+    assert coordinator.channel_temps[spark] == {1: 70.0}
+    standby = coordinator.standby.as_dict()
+    assert standby["devices"] == {} and standby["wakeups"] == 1
+    assert 5 <= standby["last_wake_latency"] < 10
+
+@pytest.mark.asyncio
+async def test_options_apply_without_refetching():
+    api = CountingApi()
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_DEVICES)
+    await coordinator._async_update_data()
+    history = next(iter(coordinator.history.values()))
+    coordinator.async_add_listener(lambda: None)
+    coordinator._schedule_refresh = MagicMock()
+    api.calls.clear()
+    changed = coordinator.apply_options(60, POLLING_MODE_FULL, 2, 30, 10)
+    assert changed == ["update_interval", "polling_mode", "max_concurrency", "refresh_deadline", "history_window"]
+    assert api.calls == []
+    assert coordinator.update_interval == timedelta(seconds=60)
+    assert coordinator.scheduler.base_interval == 60
+    coordinator._schedule_refresh.assert_called_once()
+    # Existing history is kept, with the new window
+    assert len(history) and history.window == 600
+    # Applying the same options again is a no-op
+    coordinator._schedule_refresh.reset_mock()
+    assert coordinator.apply_options(60, POLLING_MODE_FULL, 2, 30, 10) == []
+    coordinator._schedule_refresh.assert_not_called()
+    # The interval is still clamped to the API minimum
+    assert coordinator.apply_options(5, POLLING_MODE_FULL, 2, 30, 10) == ["update_interval"]
+    assert coordinator.scheduler.base_interval == 18
+    # The next refresh uses full polling
+    await coordinator._async_update_data()
+    assert ("drivelog", "fdff7eb8-c93f-4256-bf0c-e588392cbe37") in api.calls
+
+def fail_temps(fake_session, monkeypatch, response, uuids=None):
+    """Answer the temps.json requests of ``uuids`` (all devices by default) with ``response()``."""
+    get = fake_session.get
+
+    def failing_get(url, headers=None):
+        if url.endswith("/temps.json") and (uuids is None or url.split("/")[-2] in uuids):
+            fake_session.calls.append(url)
+            return response()
+        return get(url, headers)
+    monkeypatch.setattr(fake_session, "get", failing_get)
+
+@pytest.mark.asyncio
+async def test_per_device_outage_keeps_last_known_values(fake_session, monkeypatch):
+    api = FireBoardApiClient("user", "pass", fake_session, token="dummy_token")
+    api.limiter = FireBoardRateLimiter(10**9)
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_FULL)
+    await coordinator._async_update_data()
+    before = dict(coordinator.channel_temps)
+    fail_temps(fake_session, monkeypatch, lambda: FakeResponse(None, 503))
+    for _ in range(4):
+        coordinator.allocator._updated -= 600  # enough budget credit for the next fetch
+        await coordinator._async_update_data()
+    # Neither the 503s nor the open circuit after them replace readings or count as empty
+    assert api.breakers["temps"].state == "open"
+    assert coordinator.channel_temps == before
+    assert all(coordinator.stale_since_for(uuid) is not None for uuid in before)
+    assert coordinator.is_polling("GHKK33R97") and coordinator.is_polling("G9K49836D")
+
+class HangingResponse:
+    async def __aenter__(self):
+        await asyncio.sleep(3600)
+
+    async def __aexit__(self, *exc):
+        return False
+
+@pytest.mark.asyncio
+async def test_request_timeout_keeps_that_devices_last_known_values(fake_session, monkeypatch):
+    api = FireBoardApiClient("user", "pass", fake_session, token="dummy_token")
+    api.limiter = FireBoardRateLimiter(10**9)
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_FULL)
+    await coordinator._async_update_data()
+    spark, fbx2 = "3ba0da49-2e78-45c6-bbe0-547d98a8ffe8", "fdff7eb8-c93f-4256-bf0c-e588392cbe37"
+    before = coordinator.channel_temps[spark]
+    # The Spark's temps.json times out well inside the refresh deadline
+    monkeypatch.setattr(api.latency["temps"], "timeout", lambda: 0.05)
+    fail_temps(fake_session, monkeypatch, HangingResponse, {spark})
+    fake_session.temps = [dict(channel, temp=90.0) for channel in fake_session.temps]
+    coordinator.allocator._updated -= 600  # enough budget credit for the next fetch
+    await coordinator._async_update_data()
+    assert coordinator.channel_temps[spark] == before
+    assert coordinator.stale_since_for(spark) is not None
+    assert set(coordinator.channel_temps[fbx2].values()) == {90.0}
+    assert coordinator.stale_since_for(fbx2) is None
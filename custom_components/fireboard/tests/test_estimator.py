@@ -0,0 +1,53 @@
+# test_estimator.py
+from datetime import datetime, timezone
+import pytest
+from custom_components.fireboard.estimator import alert_target, channel_target, estimate_etas
+from custom_components.fireboard.history import ChannelHistory
+from custom_components.fireboard.models import ChannelReading, parse_drive
+
+NOW = datetime(2025, 6, 28, 20, 0, tzinfo=timezone.utc)
+
+def make_history(start, per_minute, minutes=20):
+    history = ChannelHistory(window=3600, capacity=100)
+    for minute in range(minutes):
+        history.append(minute * 60, start + per_minute * minute)
+    return history
+
+def test_batch_estimates_every_channel():
+    rows = [
+        (("a", 1), make_history(100, 2), 203, 2),
+        (("a", 2), make_history(160, 0.01), 203, 2),
+        (("b", 1), make_history(100, 2), None, 2),
+    ]
+    etas = estimate_etas(rows, NOW)
+    assert etas[("a", 1)].minutes == pytest.approx(32.5)
+    assert etas[("a", 1)].done_at > NOW
+    # Flat inside the stall band: stalled, no ETA
+    assert etas[("a", 2)].stalled
+    assert etas[("a", 2)].minutes is None
+    # No target, no estimate
+    assert ("b", 1) not in etas
+
+def test_channel_target_prefers_alert_then_setpoint():
+    drive = parse_drive({"tiedchannel": 6, "setpoint": 225.0})
+    alerted = ChannelReading(6, 1, None, None, True, ((200.0, 260.0),))
+    assert channel_target(alerted, 150, drive) == 200.0
+    assert channel_target(ChannelReading(6, 1, None, None, True, ()), 150, drive) == 225.0
+    assert channel_target(ChannelReading(5, 2, None, None, True, ()), 150, drive) is None
+
+def test_alert_target_direction():
+    channel = ChannelReading(1, 1, None, None, True, ((200.0, 260.0),))
+    assert alert_target(channel, 150) == 200.0
+    assert alert_target(channel, 270) == 260.0
+    assert alert_target(channel, 220) is None
+    assert alert_target(channel, 220, rate=1.5) == 260.0
+    assert alert_target(channel, 220, rate=-1.5) is None
+
+def test_rising_probe_targets_done_alert():
+    # A meat probe with only a "done" alert at 203
+    probe = ChannelReading(2, 1, None, None, True, ((None, 203.0),))
+    assert channel_target(probe, 150.0, None, rate=0.8) == 203.0
+    assert channel_target(probe, 150.0, None, rate=-0.8) is None
+    etas = estimate_etas([(("a", 2), make_history(134, 1), channel_target(probe, 153.0, None, 1.0), 2)], NOW)
+    assert etas[("a", 2)].target == 203.0
+    assert etas[("a", 2)].minutes == pytest.approx(50.0)
@@ -0,0 +1,28 @@
+# test_history.py
+import pytest
+from custom_components.fireboard.history import ChannelHistory
+
+def test_rolling_stats_follow_the_window():
+    history = ChannelHistory(window=50, capacity=100)
+    for i, value in enumerate([100, 90, 120, 110]):
+        assert history.append(1000 + i * 20, value)
+    # The first sample is more than 50 s older than the newest and was evicted
+    assert len(history) == 3
+    assert history.minimum == 90
+    assert history.maximum == 120
+    assert history.average == pytest.approx(320 / 3)
+    assert not history.append(1000, 50)
+
+def test_capacity_bounds_memory():
+    history = ChannelHistory(window=10**6, capacity=4)
+    for i in range(10):
+        history.append(i, float(i))
+    assert len(history) == 4
+    assert history.minimum == 6
+    assert history.maximum == 9
+
+def test_rate_of_change():
+    history = ChannelHistory(window=3600, capacity=100)
+    for minute in range(10):
+        history.append(minute * 60, 150 + minute * 2)
+    assert history.rate == pytest.approx(2.0)
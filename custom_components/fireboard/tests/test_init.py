@@ -0,0 +1,221 @@
+# test_init.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+from custom_components.fireboard import (
+    async_remove_config_entry_device,
+    async_setup,
+    async_setup_entry,
+    async_unload_entry,
+)
+from custom_components.fireboard import sensor, switch
+from custom_components.fireboard.const import DOMAIN, LOGIN_URL
+from custom_components.fireboard.limiter import _LIMITERS
+from custom_components.fireboard.transport import load_recording
+from conftest import load_jsonc
+
+def make_hass():
+    hass = MagicMock()
+    hass.data = {DOMAIN: {}}
+    hass.config_entries.async_forward_entry_setups = AsyncMock()
+    return hass
+
+def make_entry():
+    entry = MagicMock()
+    entry.entry_id = "entry1"
+    entry.data = {"username": "user", "password": "pass"}
+    entry.options = {}
+    return entry
+
+async def setup_entry(hass, entry, session, first_refresh=True):
+    """Set up the entry, then run the first refresh it leaves in the background."""
+    with patch("custom_components.fireboard.async_get_clientsession", return_value=session):
+        await async_setup_entry(hass, entry)
+    refresh = entry.async_create_background_task.call_args.args[1]
+    if first_refresh:
+        await refresh
+    else:
+        refresh.close()
+
+@pytest.mark.asyncio
+async def test_setup_does_not_wait_for_the_cloud(fake_session, fake_store):
+    hass, entry = make_hass(), make_entry()
+    sensors = []
+
+    async def forward(entry, platforms):
+        assert platforms == ["sensor", "switch"]
+        await sensor.async_setup_entry(hass, entry, sensors.extend)
+    hass.config_entries.async_forward_entry_setups = forward
+    with patch("custom_components.fireboard.async_get_clientsession", return_value=fake_session):
+        await async_setup_entry(hass, entry)
+    # Platforms are set up before any request, with no devices yet
+    assert fake_session.calls == [] and sensors == []
+    # The first refresh adds the devices through discovery
+    await entry.async_create_background_task.call_args.args[1]
+    assert fake_session.calls.count(LOGIN_URL) == 1
+    assert {s.unique_id for s in sensors} >= {"fdff7eb8-c93f-4256-bf0c-e588392cbe37_battery"}
+
+@pytest.mark.asyncio
+async def test_platforms_share_one_coordinator(fake_session, fake_store):
+    hass, entry = make_hass(), make_entry()
+    await setup_entry(hass, entry, fake_session)
+    coordinator = hass.data[DOMAIN][f"coordinator_{entry.entry_id}"]
+    setup_calls = list(fake_session.calls)
+    # One login and one devices.json call (plus the Spark's temps.json fallback)
+    assert setup_calls.count(LOGIN_URL) == 1
+    assert sum(url.endswith("/devices.json") for url in setup_calls) == 1
+
+    sensors, switches = [], []
+    await sensor.async_setup_entry(hass, entry, sensors.extend)
+    await switch.async_setup_entry(hass, entry, switches.extend)
+    # Platform setup must not create or refresh another coordinator
+    assert fake_session.calls == setup_calls
+    assert {e.coordinator for e in sensors + switches} == {coordinator}
+
+    # One refresh cycle with every device polling disabled by the switches
+    fake_session.calls.clear()
+    await coordinator._async_update_data()
+    assert len(fake_session.calls) == 1
+
+    # Enabling one device adds no per-device calls when devices.json has its data
+    coordinator.set_polling("GHKK33R97", True)
+    fake_session.calls.clear()
+    await coordinator._async_update_data()
+    assert len(fake_session.calls) == 1
+    # The polling switch shows the device's share of the budget
+    polling = next(s for s in switches if s._hardware_id == "GHKK33R97")
+    assert {"priority", "budget_share", "fetch_interval", "pinned"} <= polling.extra_state_attributes.keys()
+
+@pytest.mark.asyncio
+async def test_pin_device_service(fake_session, fake_store):
+    hass, entry = make_hass(), make_entry()
+    await async_setup(hass, {})
+    handlers = {c.args[1]: c.args[2] for c in hass.services.async_register.call_args_list}
+    await setup_entry(hass, entry, fake_session)
+    coordinator = hass.data[DOMAIN][f"coordinator_{entry.entry_id}"]
+    coordinator.async_request_coalesced_refresh = AsyncMock()
+    await handlers["pin_device"](MagicMock(data={"hardware_id": "GHKK33R97", "pinned": True}))
+    assert coordinator.is_pinned("GHKK33R97")
+    coordinator.async_request_coalesced_refresh.assert_awaited_once()
+    with pytest.raises(HomeAssistantError):
+        await handlers["pin_device"](MagicMock(data={"hardware_id": "UNKNOWN", "pinned": True}))
+
+@pytest.mark.asyncio
+async def test_warm_start_from_cache(fake_session, fake_store):
+    hass, entry = make_hass(), make_entry()
+    await setup_entry(hass, entry, fake_session)
+    assert "fireboard.entry1" in fake_store
+    # The token is persisted with the config entry
+    saved_data = hass.config_entries.async_update_entry.call_args.kwargs["data"]
+    assert saved_data["token"] == "dummy_token"
+
+    # Restart: entities are created from the cache before any HTTP call is made
+    _LIMITERS.clear()
+    fake_session.calls.clear()
+    hass, entry = make_hass(), make_entry()
+    entry.data = saved_data
+    await setup_entry(hass, entry, fake_session, first_refresh=False)
+    coordinator = hass.data[DOMAIN][f"coordinator_{entry.entry_id}"]
+    sensors = []
+    await sensor.async_setup_entry(hass, entry, sensors.extend)
+    assert fake_session.calls == []
+    assert sensors
+    assert coordinator.channel_temps["fdff7eb8-c93f-4256-bf0c-e588392cbe37"][1] == 71.1
+    assert coordinator.api._token == "dummy_token"
+    assert coordinator.api.limiter.remaining() < coordinator.api.limiter.limit
+
+@pytest.mark.asyncio
+async def test_platforms_follow_discovered_devices(fake_session, fake_store):
+    hass, entry = make_hass(), make_entry()
+    await setup_entry(hass, entry, fake_session)
+    coordinator = hass.data[DOMAIN][f"coordinator_{entry.entry_id}"]
+    sensors, switches = [], []
+    await sensor.async_setup_entry(hass, entry, sensors.extend)
+    await switch.async_setup_entry(hass, entry, switches.extend)
+    initial = len(sensors)
+    for entity in sensors + switches:
+        entity.entity_id = f"fireboard.{entity.unique_id}"
+        entity.registry_entry = MagicMock()
+
+    # The Spark leaves the account: after three listings without it, its entities and device leave the registries
+    spark = "3ba0da49-2e78-45c6-bbe0-547d98a8ffe8"
+    device_entries = [
+        MagicMock(id="spark", identifiers={(DOMAIN, spark, "FBX2")}),
+        MagicMock(id="yoder", identifiers={(DOMAIN, "fdff7eb8-c93f-4256-bf0c-e588392cbe37", "GHKK33R97")}),
+    ]
+    fake_session.devices = fake_session.devices[:1]
+    with patch("custom_components.fireboard.entity.er") as er, patch("custom_components.fireboard.dr") as dr:
+        dr.async_entries_for_config_entry.return_value = device_entries
+        # One listing without it could be a glitch: user renames and areas must survive
+        await coordinator._async_update_data()
+        er.async_get.return_value.async_remove.assert_not_called()
+        for _ in range(2):
+            await coordinator._async_update_data()
+    assert len(sensors) == initial
+    assert {c.args[0] for c in er.async_get.return_value.async_remove.call_args_list} == {
+        f"fireboard.{spark}_battery",
+        f"fireboard.{spark}_ch44479780",
+        f"fireboard.{spark}_ch44479780_eta",
+        f"fireboard.{spark}_ch44479781",
+        f"fireboard.{spark}_ch44479781_eta",
+        f"fireboard.{spark}_polling_switch",
+    }
+    dr.async_get.return_value.async_update_device.assert_called_once_with("spark", remove_config_entry_id="entry1")
+    # Only devices no longer on the account can be deleted from the UI
+    assert await async_remove_config_entry_device(hass, entry, device_entries[0])
+    assert not await async_remove_config_entry_device(hass, entry, device_entries[1])
+
+    # It comes back: its entities are added again without a reload
+    fake_session.devices = load_jsonc("list-all-devices.jsonc")
+    await coordinator._async_update_data()
+    assert len(sensors) == initial + 5
+    assert len(switches) == 3
+
+@pytest.mark.asyncio
+async def test_options_apply_live(fake_session, fake_store):
+    hass, entry = make_hass(), make_entry()
+    entry.data["update_interval"] = 45
+    await setup_entry(hass, entry, fake_session)
+    coordinator = hass.data[DOMAIN][f"coordinator_{entry.entry_id}"]
+    # The interval entered in the config flow is used
+    assert coordinator.scheduler.base_interval == 45
+    options_updated = entry.add_update_listener.call_args.args[0]
+    setup_calls = list(fake_session.calls)
+
+    entry.options = {"update_interval": 90, "history_window": 10}
+    await options_updated(hass, entry)
+    assert coordinator.update_interval.total_seconds() == 90
+    assert coordinator.history_window == 10
+    # No reload, login or refresh
+    assert fake_session.calls == setup_calls
+    hass.config_entries.async_reload.assert_not_called()
+    assert hass.data[DOMAIN][f"coordinator_{entry.entry_id}"] is coordinator
+
+    # A token save also notifies the listener and changes nothing
+    entry.data = {**entry.data, "token": "new"}
+    await options_updated(hass, entry)
+    assert coordinator.update_interval.total_seconds() == 90
+
+    # Diagnostic sensors change the entity set, which needs a reload
+    entry.options = {**entry.options, "diagnostic_sensors": True}
+    await options_updated(hass, entry)
+    hass.config_entries.async_reload.assert_called_once_with(entry.entry_id)
+
+@pytest.mark.asyncio
+async def test_unload_closes_the_traffic_recording(fake_session, fake_store, tmp_path):
+    hass, entry = make_hass(), make_entry()
+    entry.options = {"record_traffic": True}
+    entry.add_update_listener = lambda listener: lambda: None
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    hass.async_add_executor_job = lambda func, *args: asyncio.get_running_loop().run_in_executor(None, func, *args)
+    hass.config_entries.async_forward_entry_unload = AsyncMock(return_value=True)
+    await setup_entry(hass, entry, fake_session)
+    assert await async_unload_entry(hass, entry)
+    # Run the unload callbacks the way Home Assistant does: anything returned must be a coroutine
+    for call in reversed(entry.async_on_unload.call_args_list):
+        job = call.args[0]()
+        if job is not None:
+            assert asyncio.iscoroutine(job)
+            await job
+    assert len(load_recording(tmp_path / "fireboard_entry1.jsonl.gz")) == len(fake_session.calls)
@@ -0,0 +1,51 @@
+# test_limiter.py
+import pytest
+from custom_components.fireboard.api import FireBoardApiClient
+from custom_components.fireboard.limiter import FireBoardRateLimiter
+
+def test_sliding_window_admission():
+    limiter = FireBoardRateLimiter(3, window=100, block_seconds=50)
+    for t in (0, 10, 20):
+        limiter.acquire(now=t)
+    assert limiter.remaining(now=30) == 0
+    assert limiter.next_token_in(now=30) == 70
+    # Oldest call has left the window
+    limiter.acquire(now=100)
+    assert limiter.remaining(now=100) == 0
+    assert limiter.remaining(now=111) == 1
+
+def test_exhausted_budget_blocks():
+    limiter = FireBoardRateLimiter(2, window=100, block_seconds=50)
+    limiter.acquire(now=0)
+    limiter.acquire(now=1)
+    with pytest.raises(RuntimeError):
+        limiter.acquire(now=2)
+    assert limiter.next_token_in(now=2) == 50
+    # Still blocked, then admitted once the block and window have passed
+    with pytest.raises(RuntimeError):
+        limiter.acquire(now=51)
+    limiter.acquire(now=101)
+
+def test_budget_is_shared_per_account(fake_session):
+    first = FireBoardApiClient("User@example.com", "pass", fake_session)
+    second = FireBoardApiClient("user@example.com ", "pass", fake_session)
+    other = FireBoardApiClient("other@example.com", "pass", fake_session)
+    assert first.limiter is second.limiter
+    assert first.limiter is not other.limiter
+
+def test_consumption_rate_and_projected_exhaustion():
+    limiter = FireBoardRateLimiter(50, window=3600)
+    # Five calls in the last ten minutes: 30 calls/hour, well inside the budget
+    for t in range(3000, 3600, 120):
+        limiter.acquire(now=t)
+    assert limiter.consumption_rate(now=3600) == 30
+    assert limiter.exhaustion_in(30, now=3600) is None
+    # At 60 calls/hour the 45 free calls last 45 minutes
+    assert limiter.exhaustion_in(60, now=3600) == 2700
+
+def test_projected_exhaustion_counts_calls_leaving_the_window():
+    limiter = FireBoardRateLimiter(10, window=3600)
+    for _ in range(5):
+        limiter.acquire(now=0)
+    # 5 free calls at 180/hour last 100 s, when the old calls free 5 more
+    assert limiter.exhaustion_in(180, now=3500) == 200
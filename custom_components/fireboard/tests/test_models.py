@@ -0,0 +1,28 @@
+# test_models.py
+import json
+from custom_components.fireboard.models import loads, parse_device, parse_devices
+from conftest import load_jsonc
+
+def test_snapshot_keeps_used_fields_only():
+    raw = load_jsonc("list-all-devices.jsonc")
+    fbx2, spark = parse_devices(raw)
+    assert fbx2.hardware_id == "GHKK33R97"
+    assert fbx2.temps[1] == 71.1
+    assert fbx2.channel(1).temp == 71.1
+    assert fbx2.channel(6).alerts == ()
+    # Lid state comes from the raw drive payload
+    assert fbx2.drive.lidpaused is False
+    assert fbx2.drive.tiedchannel == 6
+    assert spark.temps is None
+    assert (fbx2.session_id, spark.session_id) == (9255604, 9206360)
+    assert not hasattr(fbx2, "__dict__")
+
+def test_snapshot_round_trips_through_cache_dict():
+    raw = load_jsonc("list-all-devices.jsonc")[0]
+    device = parse_device(raw)
+    restored = parse_device(loads(json.dumps(device.as_dict())))
+    assert restored.temps == device.temps
+    assert restored.temps_created == device.temps_created
+    assert restored.drive == device.drive
+    assert restored.session_id == device.session_id
+    assert [c.label for c in restored.channels] == [c.label for c in device.channels]
@@ -0,0 +1,76 @@
+# test_scheduler.py
+import pytest
+from custom_components.fireboard.limiter import FireBoardRateLimiter
+from custom_components.fireboard.models import parse_drive
+from custom_components.fireboard.scheduler import (
+    ACTIVITY_ACTIVE,
+    ACTIVITY_IDLE,
+    ACTIVITY_NORMAL,
+    PRIORITY_DRIVE,
+    PRIORITY_FAST,
+    PRIORITY_IDLE,
+    PRIORITY_NORMAL,
+    PRIORITY_PINNED,
+    FairShareAllocator,
+    FireBoardPollScheduler,
+    classify_activity,
+    device_priority,
+)
+
+def test_classify_activity():
+    assert classify_activity(5.0, False, False) == ACTIVITY_ACTIVE
+    assert classify_activity(0.5, True, False) == ACTIVITY_ACTIVE
+    assert classify_activity(0.5, False, False) == ACTIVITY_NORMAL
+    assert classify_activity(0.05, False, False) == ACTIVITY_IDLE
+    assert classify_activity(5.0, True, True) == ACTIVITY_IDLE
+
+def test_activity_scales_configured_interval():
+    scheduler = FireBoardPollScheduler(60, FireBoardRateLimiter(200))
+    assert scheduler.next_interval(1, ACTIVITY_ACTIVE) == 30
+    assert scheduler.next_interval(1, ACTIVITY_IDLE) == 120
+
+def test_budget_floor_and_exhaustion():
+    limiter = FireBoardRateLimiter(200)
+    scheduler = FireBoardPollScheduler(18, limiter)
+    # Seven calls per cycle cannot be sustained every 9 seconds
+    assert scheduler.next_interval(7, ACTIVITY_ACTIVE) >= 7 * 3600 / 200
+    for _ in range(198):
+        limiter.acquire()
+    # Budget nearly gone: wait for calls to leave the window rather than hit the block
+    assert scheduler.next_interval(1, ACTIVITY_ACTIVE) > 3000
+
+def test_device_priority():
+    drive = parse_drive({"modetype": 1})
+    assert device_priority(True, None, 0.0) == PRIORITY_PINNED
+    assert device_priority(False, drive, 0.0) == PRIORITY_DRIVE
+    assert device_priority(False, None, 3.0) == PRIORITY_FAST
+    assert device_priority(False, None, None) == PRIORITY_NORMAL
+    assert device_priority(False, None, 0.05) == PRIORITY_IDLE
+
+def test_fair_share_splits_budget_by_priority():
+    allocator = FairShareAllocator(FireBoardRateLimiter(200))
+    priorities = {"busy": PRIORITY_DRIVE, "idle": PRIORITY_IDLE, "embedded": PRIORITY_NORMAL}
+    allocator.update(priorities, 100, now=0)
+    # New devices are fetched right away; the first fetch shows what each one needs
+    assert allocator.admit("busy", 2) and allocator.admit("idle", 2) and allocator.admit("embedded", 0)
+    allocator.update(priorities, 100, now=0)
+    assert allocator.budget == 95
+    assert allocator.allocations["busy"].share == pytest.approx(95 * 4 / 4.25)
+    assert allocator.allocations["idle"].share == pytest.approx(95 * 0.25 / 4.25)
+    assert allocator.allocations["embedded"].share == 0
+    # Over an hour of 20 s refreshes the devices spend the budget in proportion to their shares
+    fetched = {"busy": 0, "idle": 0}
+    for step in range(1, 181):
+        allocator.update(priorities, 100, now=20 * step)
+        for uuid in fetched:
+            fetched[uuid] += allocator.admit(uuid, 1)
+    assert fetched["busy"] == pytest.approx(95 * 4 / 4.25, abs=1)
+    assert fetched["idle"] == pytest.approx(95 * 0.25 / 4.25, abs=1)
+    assert allocator.allocation("idle")["deferred"] == 180 - fetched["idle"]
+    assert allocator.allocation("idle")["fetch_interval"] == round(3600 * 4.25 / (95 * 0.25))
+
+def test_fair_share_keeps_a_floor_for_devices():
+    allocator = FairShareAllocator(FireBoardRateLimiter(200))
+    # devices.json alone would use the whole budget at this interval
+    allocator.update({"a": PRIORITY_NORMAL}, 400, now=0)
+    assert allocator.budget == pytest.approx(195 * 0.25)
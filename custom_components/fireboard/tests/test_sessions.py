@@ -0,0 +1,126 @@
+# test_sessions.py
+import asyncio
+import csv
+import json
+from unittest.mock import MagicMock
+import aiohttp
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+from custom_components.fireboard.api import FireBoardApiClient
+from custom_components.fireboard.const import DOMAIN
+from custom_components.fireboard.models import parse_chart
+from custom_components.fireboard.services import async_setup_services
+from custom_components.fireboard.sessions import HourlyStatistics, async_export_session
+from fake_cloud import FakeCloud
+
+def make_hass():
+    hass = MagicMock()
+
+    async def run(func, *args):
+        return func(*args)
+    hass.async_add_executor_job = run
+    return hass
+
+def test_parse_chart_accepts_both_series_shapes():
+    samples = list(parse_chart([
+        {"channel": 1, "x": [1751120000, 1751120010], "y": [70.0, None]},
+        {"channel": 2, "data": [{"x": 1751120000000, "y": 80.5}]},
+    ]))
+    assert [(created.isoformat(), channel, temp) for created, channel, temp in samples] == [
+        ("2025-06-28T14:13:20+00:00", 1, 70.0),
+        ("2025-06-28T14:13:20+00:00", 2, 80.5),
+    ]
+
+@pytest.mark.asyncio
+async def test_session_log_streams_pages_in_bounded_batches():
+    async with FakeCloud(session_samples=1000, session_page_size=300) as cloud, aiohttp.ClientSession() as session:
+        api = FireBoardApiClient("user", "pass", cloud.session(session))
+        sizes = []
+        async for batch in api.async_iter_session_log(9255604, batch_size=500):
+            sizes.append(len(batch))
+            # Pages are requested as the batches are consumed, not all up front
+            assert cloud.requests["sessions"] <= len(sizes) * 500 // (300 * 6) + 1
+    assert sum(sizes) == 6000 and max(sizes) == 500
+    assert cloud.requests["sessions"] == 4
+    assert not api.response_cache
+
+@pytest.mark.asyncio
+async def test_session_log_waits_for_budget(monkeypatch):
+    async with FakeCloud(session_samples=10) as cloud, aiohttp.ClientSession() as session:
+        api = FireBoardApiClient("user", "pass", cloud.session(session))
+        await api.async_login()
+        for _ in range(api.limiter.remaining() - 5):
+            api.limiter.acquire()
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+            api.limiter._calls.clear()
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+        batches = [batch async for batch in api.async_iter_session_log(1)]
+    assert len(delays) == 1 and delays[0] > 3000
+    assert sum(len(batch) for batch in batches) == 60
+
+def test_hourly_statistics_keep_only_open_hours():
+    statistics = HourlyStatistics()
+    samples = [
+        (created, 1, temp)
+        for created, _, temp in parse_chart([{"x": [1751120000 + 600 * i for i in range(12)], "y": [100.0 + i for i in range(12)]}])
+    ]
+    finished = statistics.add(samples)
+    # 14:13 to 16:03: the 14:00 and 15:00 hours are closed, 16:00 stays open until the log ends
+    assert [(row["start"].hour, row["min"], row["max"], row["mean"]) for row in finished[1]] == [
+        (14, 100.0, 104.0, 102.0),
+        (15, 105.0, 110.0, 107.5),
+    ]
+    assert [(row["start"].hour, row["min"], row["max"]) for row in statistics.flush()[1]] == [(16, 111.0, 111.0)]
+    assert statistics.flush() == {}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+async def test_export_session(tmp_path, fmt):
+    path = tmp_path / f"session.{fmt}"
+    async with FakeCloud(session_samples=50, session_page_size=20) as cloud, aiohttp.ClientSession() as session:
+        api = FireBoardApiClient("user", "pass", cloud.session(session))
+        rows = await async_export_session(make_hass(), api, 9255604, str(path), fmt)
+    assert rows == 300
+    with open(path, newline="") as file:
+        if fmt == "csv":
+            records = list(csv.DictReader(file))
+        else:
+            records = [json.loads(line) for line in file]
+    assert len(records) == 300
+    first = records[0]
+    assert (first["created"], str(first["channel"]), str(first["temp"])) == ("2025-06-28T14:13:20+00:00", "1", "71.0")
+
+@pytest.mark.asyncio
+async def test_backfill_service_exports_to_allowed_default_path(tmp_path):
+    hass = make_hass()
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    checked = []
+
+    def is_allowed_path(path):
+        checked.append(path)
+        return path.startswith(str(tmp_path / "www"))
+    hass.config.is_allowed_path = is_allowed_path
+    executor_jobs = []
+    run = hass.async_add_executor_job
+
+    async def executor_job(func, *args):
+        executor_jobs.append(func)
+        return await run(func, *args)
+    hass.async_add_executor_job = executor_job
+    async_setup_services(hass)
+    handlers = {c.args[1]: c.args[2] for c in hass.services.async_register.call_args_list}
+    async with FakeCloud(session_samples=10) as cloud, aiohttp.ClientSession() as session:
+        coordinator = MagicMock(api=FireBoardApiClient("user", "pass", cloud.session(session)))
+        coordinator.device_by_hardware_id.return_value = MagicMock(hardware_id="FB1", session_id=9255604)
+        hass.data = {DOMAIN: {"coordinator_entry1": coordinator}}
+        await handlers["backfill_session"](MagicMock(data={"hardware_id": "FB1", "target": "csv"}))
+        with pytest.raises(HomeAssistantError):
+            await handlers["backfill_session"](MagicMock(data={"hardware_id": "FB1", "target": "csv", "path": "/etc/x.csv"}))
+    exported = tmp_path / "www" / "fireboard" / "fireboard_session_9255604.csv"
+    assert len(exported.read_text().splitlines()) == 61
+    # The allowlist check runs in the executor, not on the event loop
+    assert checked == [str(exported), "/etc/x.csv"]
+    assert executor_jobs.count(is_allowed_path) == 2
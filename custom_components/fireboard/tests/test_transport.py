@@ -0,0 +1,87 @@
+# test_transport.py
+import asyncio
+import gzip
+import time
+from unittest.mock import MagicMock
+import aiohttp
+import pytest
+from custom_components.fireboard.api import FireBoardApiClient
+from custom_components.fireboard.const import POLLING_MODE_FULL
+from custom_components.fireboard.coordinator import FireBoardCoordinator
+from custom_components.fireboard.limiter import FireBoardRateLimiter
+from custom_components.fireboard.transport import RecordingSession, ReplayExhausted, ReplaySession, load_recording
+from fake_cloud import FakeCloud
+
+async def refresh(api, cycles, advance=None):
+    # Replay only works with an unlimited limiter: the limiter and the allocator
+    # run on the wall clock, so a budget would defer requests that were recorded
+    api.limiter = FireBoardRateLimiter(10**9)
+    coordinator = FireBoardCoordinator(MagicMock(), api, 18, POLLING_MODE_FULL)
+    snapshots = []
+    for _ in range(cycles):
+        if advance:
+            advance()
+        await coordinator._async_update_data()
+        snapshots.append(dict(coordinator.channel_temps))
+    return snapshots
+
+@pytest.mark.asyncio
+async def test_record_then_replay_without_network(tmp_path):
+    path = tmp_path / "traffic.jsonl.gz"
+    async with FakeCloud(devices=2, channels=3) as cloud, aiohttp.ClientSession() as session:
+        recorder = RecordingSession(cloud.session(session), path)
+        api = FireBoardApiClient("secret-user", "secret-pass", recorder)
+        recorded = await refresh(api, 3, cloud.advance)
+        recorder.close()
+        served = cloud.total_requests
+    records = load_recording(path)
+    assert len(records) == served == recorder.records == 1 + 3 * (1 + 2 * 2)
+    raw = gzip.open(path, "rt").read()
+    # Neither the password nor the issued token is written
+    assert "secret-pass" not in raw and "token-1" not in raw
+
+    replay = ReplaySession.from_file(path)
+    api = FireBoardApiClient("replay", "replay", replay)
+    assert await refresh(api, 3) == recorded
+    assert replay.remaining() == 0
+    with pytest.raises(ReplayExhausted):
+        await api.async_get_devices()
+
+@pytest.mark.asyncio
+async def test_replay_speed_and_errors():
+    url = "https://fireboard.io/api/v1/devices.json"
+    replay = ReplaySession([
+        {"t": 0.0, "duration": 0.0, "method": "GET", "url": url, "status": 200, "headers": {}, "body": "[]"},
+        {"t": 2.0, "duration": 0.0, "method": "GET", "url": url, "error": "TimeoutError", "message": "request timed out"},
+        {"t": 3.0, "duration": 0.0, "method": "GET", "url": url, "status": 503, "headers": {}, "body": ""},
+    ], speed=20)
+    started = time.monotonic()
+    async with replay.get(url) as resp:
+        assert await resp.json() == []
+    with pytest.raises(asyncio.TimeoutError):
+        async with replay.get(url):
+            pass
+    # Two recorded seconds at 20x speed
+    assert 0.09 <= time.monotonic() - started < 0.5
+    async with replay.get(url) as resp:
+        with pytest.raises(aiohttp.ClientResponseError):
+            resp.raise_for_status()
+
+@pytest.mark.asyncio
+async def test_recording_flushes_and_rotates(tmp_path):
+    path = tmp_path / "traffic.jsonl.gz"
+    async with FakeCloud(devices=1, channels=2) as cloud, aiohttp.ClientSession() as session:
+        recorder = RecordingSession(cloud.session(session), path, flush_interval=0.01)
+        await refresh(FireBoardApiClient("user", "pass", recorder), 2, cloud.advance)
+        await asyncio.sleep(0.2)
+        # The writer thread has flushed everything while the file is still open
+        assert len(load_recording(path)) == recorder.records
+        recorder.close()
+
+        # Past max_bytes every flush moves the file to <path>.1 and starts a new one
+        rotating = RecordingSession(cloud.session(session), tmp_path / "small.jsonl.gz", max_bytes=1, flush_interval=0)
+        await refresh(FireBoardApiClient("user", "pass", rotating), 1)
+        rotating.close()
+    assert rotating.rotations == rotating.records
+    assert len(load_recording(tmp_path / "small.jsonl.gz.1")) == 1
+    assert load_recording(tmp_path / "small.jsonl.gz") == []
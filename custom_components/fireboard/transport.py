@@ -0,0 +1,266 @@
+"""Record-and-replay transports for FireBoardApiClient.
+
+FireBoardApiClient only needs ``get``/``post`` returning an async context
+manager around a response, so these wrap or replace the aiohttp session.
+RecordingSession passes requests through and appends each exchange to a gzip
+JSONL file from a writer thread; ReplaySession serves such a file back, in real time, accelerated
+or as fast as the caller asks.
+
+Credentials never reach the file: the login payload and the Authorization
+header are not recorded, and the token in the login response is replaced.
+"""
+from collections import deque
+import asyncio
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+import aiohttp
+from yarl import URL
+from .const import RECORDING_FLUSH_INTERVAL, RECORDING_MAX_BYTES
+
+# Response headers the client reads
+RECORDED_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+REDACTED_TOKEN = "recorded-token"
+_FLUSH = object()  # writer thread wake-up when no record arrived within the flush interval
+
+def _redact(url, body):
+    if urlsplit(url).path.endswith("/rest-auth/login/"):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return body
+        if isinstance(data, dict) and "key" in data:
+            return json.dumps(dict(data, key=REDACTED_TOKEN)).encode()
+    return body
+
+class RecordedResponse:
+    """Response served from, or captured for, a recording."""
+
+    def __init__(self, method, url, status, headers, body):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            info = aiohttp.RequestInfo(URL(self.url), self.method, {}, URL(self.url))
+            raise aiohttp.ClientResponseError(info, (), status=self.status, message=f"HTTP {self.status}")
+
+    async def read(self):
+        return self._body
+
+    async def json(self):
+        return json.loads(self._body)
+
+class _RecordingRequest:
+    def __init__(self, recorder, method, url, request):
+        self._recorder = recorder
+        self._method = method
+        self._url = url
+        self._request = request
+
+    async def __aenter__(self):
+        started = self._recorder.clock()
+        try:
+            async with self._request as resp:
+                body = await resp.read()
+                status = resp.status
+                headers = {name: resp.headers[name] for name in RECORDED_HEADERS if name in resp.headers}
+        except asyncio.CancelledError:
+            # The client's request timeout cancels the request from outside
+            self._recorder.write(self._method, self._url, started, error=asyncio.TimeoutError("request timed out"))
+            raise
+        except Exception as err:
+            self._recorder.write(self._method, self._url, started, error=err)
+            raise
+        self._recorder.write(self._method, self._url, started, status, headers, _redact(self._url, body))
+        return RecordedResponse(self._method, self._url, status, headers, body)
+
+    async def __aexit__(self, *exc):
+        return False
+
+class RecordingSession:
+    """Session wrapper that appends every request and response, with timing, to ``path``.
+
+    Records are handed to a writer thread, so the event loop never compresses
+    or touches the file. The thread flushes every ``flush_interval`` seconds and,
+    once the file reaches ``max_bytes``, moves it to ``<path>.1`` (replacing an
+    older one) and starts a new file. ``close`` writes what is left and blocks
+    until the thread is done. ``clock`` returns seconds for the timings, so a
+    synthetic recording can run on a virtual timeline.
+    """
+
+    def __init__(self, session, path, clock=time.monotonic, max_bytes=RECORDING_MAX_BYTES,
+                 flush_interval=RECORDING_FLUSH_INTERVAL):
+        self._session = session
+        self.path = os.fspath(path)
+        self._clock = clock
+        self._max_bytes = max_bytes
+        self._flush_interval = flush_interval
+        self._file = gzip.open(self.path, "at", encoding="utf-8")
+        self._queue = queue.SimpleQueue()
+        self._started = clock()
+        self.records = 0
+        self.rotations = 0
+        self._writer = threading.Thread(target=self._run, name="fireboard-recorder", daemon=True)
+        self._writer.start()
+
+    def get(self, url, **kwargs):
+        return _RecordingRequest(self, "GET", url, self._session.get(url, **kwargs))
+
+    def post(self, url, **kwargs):
+        return _RecordingRequest(self, "POST", url, self._session.post(url, **kwargs))
+
+    def clock(self):
+        return self._clock()
+
+    def write(self, method, url, started, status=None, headers=None, body=b"", error=None):
+        record = {
+            "t": round(started - self._started, 3),
+            "duration": round(self._clock() - started, 3),
+            "method": method,
+            "url": url,
+        }
+        if error is not None:
+            record["error"] = type(error).__name__
+            record["message"] = str(error)
+        else:
+            record.update(status=status, headers=headers, body=body.decode("utf-8", "surrogateescape"))
+        self._queue.put(record)
+        self.records += 1
+
+    def close(self):
+        """Write the remaining records and close the file. Blocks, so call it from an executor."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _run(self):
+        flushed = time.monotonic()
+        pending = False
+        while True:
+            try:
+                record = self._queue.get(timeout=self._flush_interval or None)
+            except queue.Empty:
+                record = _FLUSH
+            if record is None:
+                break
+            if record is not _FLUSH:
+                self._file.write(json.dumps(record) + "\n")
+                pending = True
+            if pending and (record is _FLUSH or time.monotonic() - flushed >= self._flush_interval):
+                self._flush()
+                flushed = time.monotonic()
+                pending = False
+        self._file.close()
+
+    def _flush(self):
+        self._file.flush()
+        if os.path.getsize(self.path) < self._max_bytes:
+            return
+        self._file.close()
+        os.replace(self.path, f"{self.path}.1")
+        self._file = gzip.open(self.path, "at", encoding="utf-8")
+        self.rotations += 1
+
+def load_recording(path):
+    """Records of a gzip JSONL recording, in order.
+
+    A recording that was never closed (Home Assistant stopped without unloading
+    the entry) yields the records flushed before it stopped.
+    """
+    records = []
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            for line in file:
+                if line.strip():
+                    records.append(json.loads(line))
+        except EOFError:
+            pass
+    return records
+
+class ReplayExhausted(aiohttp.ClientError):
+    """Raised when a request has no recorded response left."""
+
+class _ReplayRequest:
+    def __init__(self, replay, method, url):
+        self._replay = replay
+        self._method = method
+        self._url = url
+
+    async def __aenter__(self):
+        return await self._replay.respond(self._method, self._url)
+
+    async def __aexit__(self, *exc):
+        return False
+
+class ReplaySession:
+    """Serves a recording back to FireBoardApiClient without touching the network.
+
+    Each URL gets its recorded responses in order. With ``speed`` set, a
+    response is held until its recorded time divided by ``speed`` has passed
+    since the first request (1 = real time, 720 = a 12-hour cook in a minute);
+    without it responses are immediate. Recorded errors are raised again.
+
+    Only the responses are replayed, not time. The rate limiter, fair-share
+    allocator, poll scheduler and ETA estimates still read the wall clock, so
+    an accelerated replay looks to them like a burst of refreshes. Give the
+    client an unlimited limiter (``FireBoardRateLimiter(10**9)``) when replaying,
+    or requests are deferred that were made in the recording, and the per-URL
+    queues drift apart. The interval the coordinator schedules and its ETAs are
+    not meaningful under replay.
+    """
+
+    def __init__(self, records, speed=None):
+        self._queues = {}  # (method, url): deque of records
+        for record in records:
+            self._queues.setdefault((record["method"], record["url"]), deque()).append(record)
+        self.speed = speed
+        self.served = 0
+        self._started = None
+
+    @classmethod
+    def from_file(cls, path, speed=None):
+        return cls(load_recording(path), speed)
+
+    def remaining(self, url=None):
+        """Recorded responses not yet served, for one URL or all of them."""
+        return sum(len(queue) for (_, queued), queue in self._queues.items() if url is None or queued == url)
+
+    def get(self, url, **kwargs):
+        return _ReplayRequest(self, "GET", url)
+
+    def post(self, url, **kwargs):
+        return _ReplayRequest(self, "POST", url)
+
+    async def respond(self, method, url):
+        queue = self._queues.get((method, url))
+        if not queue:
+            raise ReplayExhausted(f"No recorded response left for {method} {url}")
+        record = queue.popleft()
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now - (record["t"] / self.speed if self.speed else 0)
+        if self.speed:
+            delay = self._started + (record["t"] + record["duration"]) / self.speed - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self.served += 1
+        if "error" in record:
+            if record["error"] == "TimeoutError":
+                raise asyncio.TimeoutError(record["message"])
+            raise aiohttp.ClientError(f"{record['error']}: {record['message']}")
+        body = record["body"].encode("utf-8", "surrogateescape")
+        return RecordedResponse(method, url, record["status"], record["headers"], body)